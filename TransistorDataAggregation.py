@@ -0,0 +1,178 @@
+import numpy as np
+from TransistorDataVisualizer import DataSet, DataBank
+
+################################################
+# Repeat run aggregation. Groups the repeat
+#   exports of a test (e.g. Rb7pre_n1/_n2/_n3) and
+#   keeps their per-point mean, std, min/max and
+#   median, updated in place (Welford) as repeats
+#   are added, as a DataSet with error bands
+################################################
+
+STATS = ['mean', 'std', 'min', 'max', 'median']
+BANDS = ['std', 'minmax']
+
+
+def group_key(S: DataSet) -> tuple:
+    """The device, test and condition of S: (transistor number, gate, graph type, misc)"""
+    return (S.Info.trans_num, S.Info.gate, S.Info.graph_type, S.misc)
+
+
+class RepeatGroup:
+    def __init__(self, Sets: list[DataSet] = None, band: str = 'std'):
+        """Per-point statistics of repeat runs of the same test on the same grid.
+
+        Input:
+            Sets: the repeat DataSets, added in one vectorized pass over their stacked data (see add_many())
+            band: error band of get_dataset(), 'std' for mean +/- std or 'minmax' for min to max
+
+        Every dependent column (header index 2 and up) is aggregated. mean, std, min and max are kept as running
+        values, so add() folds in another repeat without going over the earlier ones again. The median needs every
+        repeat, so it's computed from them when it's asked for."""
+        if band not in BANDS:
+            raise ValueError(f"band '{band}' is not one of {BANDS}")
+        self.band: str = band
+        self.key: tuple = None
+        self.count: int = 0
+        self.Sets: list[DataSet] = []
+        self.m_headers: list = [] # the aggregated (dependent) headers
+        self.m_mean: dict = {} # header -> array
+        self.m_M2: dict = {} # header -> sum of squared differences from the mean
+        self.m_min: dict = {}
+        self.m_max: dict = {}
+        self.m_median: dict = {} # header -> array, cleared when a repeat is added
+        self.m_DataSet: DataSet = None # see get_dataset()
+        if Sets:
+            self.add_many(Sets)
+
+    def print(self):
+        print(f"Group: {self.key}  Repeats: {self.count}  Band: {self.band}")
+        for S in self.Sets:
+            print(f"   {S.file_path}")
+
+    def add(self, S: DataSet):
+        """Folds one more repeat into the statistics (a Welford update)"""
+        self.add_many([S])
+
+    def add_many(self, Sets: list[DataSet]):
+        """Adds repeats: their statistics are computed in one pass over the stacked data and merged with the
+        group's running ones (Chan et al.'s parallel form of Welford's update), so the group isn't recomputed.
+        Raises a ValueError if a DataSet doesn't have the group's grid or headers."""
+        if len(Sets) == 0:
+            return
+        if self.count == 0:
+            self.key = group_key(Sets[0])
+            self.m_headers = Sets[0].get_headers()[2:]
+        Ref = self.Sets[0] if self.Sets else Sets[0]
+        for S in Sets:
+            if not self.matches(S, Ref):
+                raise ValueError(f"'{S.file_path}' doesn't have the grid and headers {self.m_headers} of the group")
+
+        n_b = len(Sets)
+        for header in self.m_headers:
+            stack = np.stack([S.get_data(S.get_header_index(header)) for S in Sets])
+            mean_b = stack.mean(axis = 0)
+            M2_b = ((stack - mean_b) ** 2).sum(axis = 0)
+            if self.count == 0:
+                self.m_mean[header], self.m_M2[header] = mean_b, M2_b
+                self.m_min[header], self.m_max[header] = stack.min(axis = 0), stack.max(axis = 0)
+                continue
+            n_a, n = self.count, self.count + n_b
+            delta = mean_b - self.m_mean[header]
+            self.m_mean[header] = self.m_mean[header] + delta * (n_b / n)
+            self.m_M2[header] = self.m_M2[header] + M2_b + delta ** 2 * (n_a * n_b / n)
+            self.m_min[header] = np.minimum(self.m_min[header], stack.min(axis = 0))
+            self.m_max[header] = np.maximum(self.m_max[header], stack.max(axis = 0))
+        self.count += n_b
+        self.Sets += list(Sets)
+        self.m_median = {}
+        if self.m_DataSet is not None:
+            self.__fill_dataset(self.m_DataSet)
+
+    def matches(self, S: DataSet, Ref: DataSet = None) -> bool:
+        """Whether S has the grid of the group (or of Ref) and all of the aggregated headers"""
+        Ref = Ref or self.Sets[0]
+        return S.has_same_grid(Ref) and all(header in S.get_headers() for header in self.m_headers)
+
+    def get_stat(self, stat: str, index = -1) -> np.ndarray:
+        """Returns the per-point statistic ('mean', 'std', 'min', 'max' or 'median') of the data at index
+        (a header index of the repeats, or a header name). std is the sample standard deviation (0 for one repeat)."""
+        header = index if isinstance(index, str) else self.Sets[0].get_data_name(index)
+        if header not in self.m_headers:
+            raise ValueError(f"'{header}' is not one of the aggregated headers {self.m_headers}")
+        match stat:
+            case 'mean':
+                return self.m_mean[header]
+            case 'std':
+                if self.count < 2:
+                    return np.zeros_like(self.m_mean[header])
+                return np.sqrt(self.m_M2[header] / (self.count - 1))
+            case 'min':
+                return self.m_min[header]
+            case 'max':
+                return self.m_max[header]
+            case 'median':
+                if header not in self.m_median:
+                    self.m_median[header] = np.median(np.stack([S.get_data(S.get_header_index(header)) for S in self.Sets]), axis = 0)
+                return self.m_median[header]
+        raise ValueError(f"stat '{stat}' is not one of {STATS}")
+
+    def get_band(self, header: str) -> tuple[np.ndarray, np.ndarray]:
+        """(low, high) error band of header: mean -/+ std or min and max, depending on band"""
+        if self.band == 'minmax':
+            return self.m_min[header], self.m_max[header]
+        std = self.get_stat('std', header)
+        return self.m_mean[header] - std, self.m_mean[header] + std
+
+    def get_dataset(self) -> DataSet:
+        """Returns a DataSet of the group's mean, with the error band of every aggregated column in its bands,
+        so quick_plot2d() shades it. The same DataSet is kept up to date as repeats are added."""
+        if self.count == 0:
+            return None
+        if self.m_DataSet is None:
+            First = self.Sets[0]
+            self.m_DataSet = DataSet.derived(First, f"{First.file_path} (mean of repeats)", First.misc)
+        self.__fill_dataset(self.m_DataSet)
+        return self.m_DataSet
+
+    def __fill_dataset(self, S: DataSet):
+        for header in self.m_headers:
+            S.m_datadict[header] = self.m_mean[header]
+            S.bands[header] = self.get_band(header)
+        S.file_path = f"{self.Sets[0].file_path} (mean of {self.count} repeats)"
+        S.mark_changed() # (also drops the zero-drop masks of the previous mean)
+
+
+def group_repeats(Sets: list[DataSet], band: str = 'std', key = group_key) -> dict:
+    """Groups DataSets (or the DataSets of a DataBank) into RepeatGroups by key(S), which defaults to the device,
+    test and condition of group_key(). A DataSet that doesn't match its group's grid or headers is printed and left out.
+    Returns {key: RepeatGroup}"""
+    if isinstance(Sets, DataBank):
+        Sets = Sets.m_DataSets
+    members = {}
+    for S in Sets:
+        members.setdefault(key(S), []).append(S)
+    groups = {}
+    for k, group_sets in members.items():
+        group = RepeatGroup(band = band)
+        group.m_headers = group_sets[0].get_headers()[2:]
+        matching = []
+        for S in group_sets:
+            if group.matches(S, group_sets[0]):
+                matching.append(S)
+            else:
+                print(f"Error: '{S.file_path}' doesn't have the grid and headers of group {k}, left out.")
+        group.add_many(matching)
+        groups[k] = group
+    return groups
+
+
+def aggregate_bank(Sets: list[DataSet], band: str = 'std', key = group_key, override: bool = False) -> DataBank:
+    """Returns a new DataBank with the mean DataSet (with error bands) of every repeat group of Sets
+    (a list of DataSets or a DataBank), in the order the groups first appear"""
+    B = DataBank()
+    B.override = override
+    for group in group_repeats(Sets, band, key).values():
+        if group.count:
+            B.append(group.get_dataset())
+    return B
@@ -0,0 +1,258 @@
+import os
+import json
+import mmap
+import zlib
+import struct
+import numpy as np
+from TransistorDataVisualizer import DataFile, DataSet, DataBank
+from TransistorDataCatalog import DataCatalog, misc_tags
+
+################################################
+# Single file archive of a project's sweeps.
+#   An index of the DataSets' metadata and block
+#   offsets, and one contiguous binary block per
+#   column. Opening it only reads the index, a
+#   column is a view of the memory-mapped file,
+#   and new sweeps are appended in place.
+################################################
+
+MAGIC = b'TDVARCH1'
+HEADER = struct.Struct('<8sQQ') # magic, index offset, index length
+ALIGNMENT = 64 # blocks start on 64 byte boundaries, so the mapped arrays are aligned
+CODECS = [None, 'zlib']
+CRITERIA = ['name', 'file_path', 'misc', 'gate', 'graph_type', 'trans_num', 'title'] # find() keywords
+
+
+class DataArchive:
+    def __init__(self, path: str = 'tdv_archive.tdva', codec: str = None):
+        """Archive of DataSets in the single file at path (created if it doesn't exist).
+
+        Layout: a fixed header (magic, offset and length of the last index segment), then per append() the column
+        blocks and an index segment, zlib compressed JSON with the location of the previous segment, the earlier
+        entries it supersedes and, for each DataSet appended, its DataFile, DataInfo, headers, intervals and the
+        offset, size, dtype and shape of each of its column blocks. Opening an archive only reads the header and the
+        index segments. Superseded entries stay in the file but aren't listed.
+
+        codec: compression of the blocks that append() writes, None or 'zlib'. Uncompressed blocks are read as
+            zero-copy views of the memory-mapped file, compressed ones with a seek, a read and a decompress."""
+        if codec not in CODECS:
+            raise ValueError(f"codec '{codec}' is not one of {CODECS}")
+        self.path: str = path
+        self.codec: str = codec
+        self.m_entries: list = [] # index entry of each DataSet, without the superseded ones
+        self.m_positions: list = [] # position of each of m_entries among all the entries ever appended
+        self.m_superseded: int = 0 # number of superseded entries
+        self.m_last_segment: tuple = (0, 0) # offset and length of the last index segment, (0, 0) if empty
+        self.m_map: mmap.mmap = None
+        self.append_errors: list = [] # (index, DataFile/DataSet, error) for each one the last append() couldn't write
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            folder = os.path.dirname(path)
+            if folder:
+                os.makedirs(folder, exist_ok = True)
+            with open(path, 'wb') as f:
+                f.write(HEADER.pack(MAGIC, 0, 0))
+        self.__read_index()
+
+    def __len__(self):
+        return len(self.m_entries)
+
+    def print(self):
+        """Prints the archive's location, size and DataSets"""
+        print(f"Archive: {self.path}")
+        print(f"DataSets: {len(self.m_entries)} ({self.m_superseded} superseded)")
+        print(f"Size: {os.path.getsize(self.path)} bytes")
+        for i, entry in enumerate(self.m_entries):
+            print(f"  {i}: {entry['file_name']} {entry['misc']}  {entry['file_path']}")
+
+    def append(self, Sets, codec = 'default', supersede: bool = False) -> list[int]:
+        """Appends DataSets (a DataSet, a DataBank, or a list of DataSets/DataFiles) to the end of the archive without
+        rewriting what's already in it. DataFiles are parsed, written and let go one at a time.
+        If supersede is True, the DataSets already in the archive with the same file_path as an appended one (e.g.
+        the earlier version of a csv that changed) are marked as superseded and no longer listed.
+        The new blocks and index segment are written after everything else and flushed before the header is pointed
+        at them, so an interrupted append leaves the archive as it was. Returns the indices of the appended DataSets.
+        Indices of the DataSets after a superseded one shift down.
+        A DataFile that can't be parsed (or a DataSet that can't be written) is reported and skipped
+        (see append_errors), and the others are still appended."""
+        codec = self.codec if codec == 'default' else codec
+        if codec not in CODECS:
+            raise ValueError(f"codec '{codec}' is not one of {CODECS}")
+        if isinstance(Sets, DataBank):
+            Sets = Sets.m_DataSets
+        elif isinstance(Sets, (DataSet, DataFile)):
+            Sets = [Sets]
+        entries = []
+        self.append_errors = []
+        with open(self.path, 'r+b') as f:
+            f.seek(0, os.SEEK_END)
+            for i, Set in enumerate(Sets):
+                try:
+                    S = DataSet(Set) if isinstance(Set, DataFile) else Set
+                    entries.append(self.__write_dataset(f, S, codec))
+                except Exception as e: # blocks written before the error aren't in the index, so they're never read
+                    self.append_errors.append((i, Set, e))
+            if entries:
+                superseded = []
+                if supersede:
+                    paths = {os.path.abspath(entry['file_path']) for entry in entries}
+                    superseded = [position for position, entry in zip(self.m_positions, self.m_entries)
+                                  if os.path.abspath(entry['file_path']) in paths]
+                self.__write_segment(f, entries, superseded)
+        self.__read_index()
+        for i, Set, error in self.append_errors:
+            print(f"Could not append #{i} ({Set.file_path}): {error}")
+        return list(range(len(self.m_entries) - len(entries), len(self.m_entries)))
+
+    def get_column(self, i: int, index = -1) -> np.ndarray:
+        """Returns the data at index (a header index or name) of the i-th DataSet, a read-only view of the
+        mapped file (or, for a compressed block, the decompressed array)"""
+        entry = self.m_entries[i]
+        headers = entry['state']['headers']
+        if isinstance(index, str):
+            if index not in headers:
+                raise ValueError(f"'{index}' is not one of the headers {headers} of DataSet {i}")
+            index = headers.index(index)
+        return self.__read_block(entry['blocks'][f"data_{index % len(headers)}"])
+
+    def get_dataset(self, i: int) -> DataSet:
+        """Rebuilds the i-th DataSet with its DataFile name, path and misc, DataInfo, headers and intervals.
+        Its columns are read-only views of the mapped file, read from disk once they're used."""
+        entry = self.m_entries[i]
+        arrays = {name: self.__read_block(block) for name, block in entry['blocks'].items()}
+        S = DataSet(DataFile(entry['file_name'], entry['file_path'], entry['misc']), state = (entry['state'], arrays))
+        for key, value in entry['info'].items():
+            setattr(S.Info, key, value)
+        return S
+
+    def find(self, **criteria) -> list[int]:
+        """Returns the indices of the DataSets matching every criteria (name, file_path, misc, gate, graph_type,
+        trans_num or title = value), e.g. find(gate='top', misc='post-epoxy'). As in DataIndex.query(), misc matches any
+        of a DataSet's comma separated condition tags (misc='post-epoxy' matches 'cryo,post-epoxy'), and can be a
+        list of tags to match any of them. Only the index is looked at."""
+        for key in criteria:
+            if key not in CRITERIA:
+                raise ValueError(f"'{key}' is not an archive criteria. Pick from {CRITERIA}")
+        return [i for i, entry in enumerate(self.m_entries)
+                if all(self.__matches(entry, key, value) for key, value in criteria.items())]
+
+    def contains(self, file_path: str) -> bool:
+        """Whether the csv at file_path is in the archive with the same modification time and size"""
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return False
+        source = [stat.st_mtime_ns, stat.st_size]
+        path = os.path.abspath(file_path)
+        return any(entry['source'] == source and os.path.abspath(entry['file_path']) == path for entry in self.m_entries)
+
+    def bank(self, ids: list[int] = None, override: bool = False, **criteria) -> DataBank:
+        """Puts the DataSets at ids (or the ones matching find(**criteria), or all of them) in a new DataBank"""
+        if ids is None:
+            ids = self.find(**criteria)
+        B = DataBank()
+        B.override = override
+        for i in ids:
+            B.append(self.get_dataset(i))
+        return B
+
+    def close(self):
+        """Lets go of the mapped file (it stays mapped while arrays read from it are still in use)"""
+        self.m_map = None
+
+    def __matches(self, entry: dict, key: str, value) -> bool:
+        if key == 'misc':
+            tags = value if isinstance(value, (list, tuple, set)) else [value]
+            entry_tags = misc_tags(entry['misc'])
+            return any(tag in entry_tags for v in tags for tag in misc_tags(v))
+        return self.__field(entry, key) == value
+
+    def __field(self, entry: dict, key: str):
+        if key in ['name', 'file_path', 'misc']:
+            return entry['file_name' if key == 'name' else key]
+        if key == 'title':
+            return entry['state']['title']
+        return entry['info'][key]
+
+    def __write_dataset(self, f, S: DataSet, codec: str) -> dict:
+        """Writes the blocks of S at the file position and returns its index entry"""
+        meta, arrays = S.export_state()
+        blocks = {}
+        for name, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            if array.dtype.byteorder == '>':
+                array = array.astype(array.dtype.newbyteorder('<'))
+            offset = -f.tell() % ALIGNMENT
+            f.write(b'\0' * offset)
+            data = array.tobytes() if codec is None else zlib.compress(array.tobytes(), 1)
+            blocks[name] = {'offset': f.tell(), 'nbytes': len(data), 'dtype': array.dtype.str,
+                            'shape': list(array.shape), 'codec': codec}
+            f.write(data)
+        try:
+            stat = os.stat(S.file_path)
+            source = [stat.st_mtime_ns, stat.st_size]
+        except OSError: # e.g. a DataSet made from other DataSets
+            source = None
+        info = S.Info
+        return {'file_name': info.data_name, 'file_path': S.file_path, 'misc': S.misc, 'source': source,
+                'info': {'graph_type': info.graph_type, 'trans_num': info.trans_num, 'trans_model': info.trans_model,
+                         'units': info.units, 'chan_dims': info.chan_dims, 'gate': info.gate},
+                'state': meta, 'blocks': blocks}
+
+    def __write_segment(self, f, entries: list, superseded: list):
+        """Writes an index segment with entries and the positions of the entries they supersede at the file
+        position, then points the header at it"""
+        segment = {'previous': self.m_last_segment, 'entries': entries, 'superseded': superseded}
+        segment = zlib.compress(json.dumps(segment, default = str).encode())
+        offset = f.tell()
+        f.write(segment)
+        f.flush()
+        os.fsync(f.fileno())
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, offset, len(segment)))
+        f.flush()
+
+    def __read_index(self):
+        """Reads the index segments, from the last one back to the first"""
+        with open(self.path, 'rb') as f:
+            magic, offset, length = HEADER.unpack(f.read(HEADER.size))
+            if magic != MAGIC:
+                raise ValueError(f"'{self.path}' is not a DataArchive file")
+            self.m_last_segment = (offset, length)
+            segments = []
+            superseded = set()
+            while length:
+                f.seek(offset)
+                segment = json.loads(zlib.decompress(f.read(length)))
+                segments.append(segment['entries'])
+                superseded.update(segment.get('superseded', []))
+                offset, length = segment['previous']
+            entries = [entry for entries in reversed(segments) for entry in entries]
+            self.m_positions = [i for i in range(len(entries)) if i not in superseded]
+            self.m_entries = [entries[i] for i in self.m_positions]
+            self.m_superseded = len(entries) - len(self.m_entries)
+            # arrays read from the previous map keep it open until they're gone
+            self.m_map = mmap.mmap(f.fileno(), 0, access = mmap.ACCESS_READ)
+
+    def __read_block(self, block: dict) -> np.ndarray:
+        dtype, shape = np.dtype(block['dtype']), tuple(block['shape'])
+        if block['codec'] is None:
+            count = block['nbytes'] // dtype.itemsize
+            return np.frombuffer(self.m_map, dtype, count, block['offset']).reshape(shape)
+        data = zlib.decompress(self.m_map[block['offset']:block['offset'] + block['nbytes']])
+        return np.frombuffer(data, dtype).reshape(shape)
+
+
+def convert_folder(root: str, path: str, codec: str = None) -> DataArchive:
+    """Converts the easyEXPERT csvs in the folder tree under root into the archive at path. The DataFile names,
+    device numbers and conditions come from the folder and file names, as in DataCatalog.crawl().
+    If the archive already exists, only csvs that aren't in it yet (or changed since) are appended, so it can be
+    run again as new sweeps come in. A changed csv supersedes its earlier version. A csv that can't be read (e.g. a
+    half-written export) is reported and skipped, so the rest are still converted; it's in the returned
+    DataArchive's append_errors and is tried again on the next run. Returns the DataArchive."""
+    Catalog = DataCatalog(':memory:')
+    Catalog.crawl(root)
+    Archive = DataArchive(path, codec)
+    DataFiles = [DF for DF in Catalog.datafiles() if not Archive.contains(DF.file_path)]
+    Catalog.close()
+    Archive.append(DataFiles, supersede = True)
+    return Archive
@@ -0,0 +1,235 @@
+import os
+import json
+import atexit
+import shutil
+import time
+import hashlib
+import weakref
+import functools
+import numpy as np
+
+################################################
+# On-disk cache of parsed easyEXPERT CSVs so that
+#   File/DataSet objects don't have to re-parse
+#   CSVs that haven't changed since last time
+################################################
+
+class DataCache:
+    def __init__(self, directory: str = '.tdv_cache', max_bytes: int = 512 * 2**20, mmap: bool = False):
+        """Cache of parsed File data stored as .npz files in directory.
+        Entries are keyed by the CSV's absolute path and validated with its mtime, size and content hash.
+        When the cache grows past max_bytes, the least recently used entries are evicted.
+        Cache hits only update the last used times in memory. index.json is written when entries are stored,
+        evicted or removed, and by close() (called at exit, or when the DataCache is garbage collected) so the
+        times carry over to the next session.
+
+        If mmap is True, each array is instead written once to its own .npy file and loaded back as a
+        read-only np.memmap, so the data of a loaded File lives in the OS page cache instead of the heap."""
+        self.directory: str = directory
+        self.max_bytes: int = max_bytes
+        self.mmap: bool = mmap
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        os.makedirs(self.directory, exist_ok = True)
+        self.m_index: dict = self.__read_index() # key -> {path, mtime, size, hash, format, nbytes, last_used}
+        self.m_dirty: bool = False # whether m_index has changes that aren't in index.json yet
+        # registered through a weakref, so the exit hook doesn't keep every DataCache ever made alive
+        self.m_exit_hook = functools.partial(_close_at_exit, weakref.ref(self))
+        atexit.register(self.m_exit_hook)
+
+    def __del__(self):
+        if hasattr(self, 'm_exit_hook'):
+            atexit.unregister(self.m_exit_hook)
+            self.close()
+
+    def print(self):
+        """Prints the cache location, size and hit/miss counters"""
+        print(f"Cache directory: {self.directory}")
+        print(f"Entries: {len(self.m_index)}")
+        print(f"Size: {self.size_bytes()} / {self.max_bytes} bytes")
+        print(f"Hits: {self.hits}  Misses: {self.misses}  Evictions: {self.evictions}")
+
+    def stats(self) -> dict:
+        """Returns the hit/miss/eviction counters and the current cache size"""
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                'entries': len(self.m_index), 'bytes': self.size_bytes()}
+
+    def size_bytes(self) -> int:
+        return sum(entry['nbytes'] for entry in self.m_index.values())
+
+    def load(self, path: str):
+        """Returns the (meta, arrays) stored for the CSV at path, or None if there is no valid entry.
+        A changed mtime alone does not invalidate an entry if the content hash still matches."""
+        key = self.make_key(path)
+        entry = self.m_index.get(key)
+        if entry is None or not os.path.exists(self.__entry_path(key, entry.get('format', 'npz'))):
+            self.misses += 1
+            return None
+
+        stat = os.stat(path)
+        if stat.st_size != entry['size']:
+            self.invalidate(path)
+            self.misses += 1
+            return None
+        if stat.st_mtime_ns != entry['mtime']:
+            # the file was touched or copied, so only the content can tell if it changed
+            if self.hash_file(path) != entry['hash']:
+                self.invalidate(path)
+                self.misses += 1
+                return None
+            entry['mtime'] = stat.st_mtime_ns
+
+        meta, arrays = self.__read_entry(key, entry.get('format', 'npz'))
+        entry['last_used'] = time.time()
+        self.m_dirty = True
+        self.hits += 1
+        return meta, arrays
+
+    def store(self, path: str, meta: dict, arrays: dict, stat: os.stat_result = None) -> tuple[dict, dict]:
+        """Saves the parsed meta (JSON-able dict) and arrays (name -> np.array) of the CSV at path.
+        Returns (meta, arrays) with the arrays swapped for their read-only memmaps when mmap is True.
+
+        stat is the os.stat() of the CSV taken before it was parsed. If its mtime or size changed since, the CSV
+        was rewritten while it was being parsed and nothing is stored, since the data may not match the file."""
+        key = self.make_key(path)
+        before = stat
+        stat = os.stat(path)
+        if before is not None and (before.st_mtime_ns, before.st_size) != (stat.st_mtime_ns, stat.st_size):
+            return meta, arrays
+        entry_format = 'npy' if self.mmap else 'npz'
+        if key in self.m_index:
+            self.__remove_entry_files(key)
+        nbytes = self.__write_entry(key, entry_format, meta, arrays)
+
+        self.m_index[key] = {'path': os.path.abspath(path),
+                             'mtime': stat.st_mtime_ns,
+                             'size': stat.st_size,
+                             'hash': self.hash_file(path),
+                             'format': entry_format,
+                             'nbytes': nbytes,
+                             'last_used': time.time()}
+        self.__evict()
+        self.__write_index()
+        if self.mmap and key in self.m_index: # (it could have been evicted right away if it's bigger than max_bytes)
+            return self.__read_entry(key, entry_format)
+        return meta, arrays
+
+    def invalidate(self, path: str):
+        """Removes the entry of the CSV at path, if there is one"""
+        key = self.make_key(path)
+        if key in self.m_index:
+            self.__remove_entry_files(key)
+            del self.m_index[key]
+            self.__write_index()
+
+    def clear(self):
+        """Removes every entry and resets the counters"""
+        for key in list(self.m_index.keys()):
+            self.__remove_entry_files(key)
+        self.m_index = {}
+        self.hits, self.misses, self.evictions = 0, 0, 0
+        self.__write_index()
+
+    def close(self):
+        """Writes index.json if cache hits changed the last used times since it was last written"""
+        if self.m_dirty and os.path.isdir(self.directory):
+            self.__write_index()
+
+    def make_key(self, path: str) -> str:
+        return hashlib.sha1(os.path.abspath(path).encode()).hexdigest()
+
+    def hash_file(self, path: str) -> str:
+        """Returns the sha1 hex digest of the file's contents"""
+        digest = hashlib.sha1()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(2**20), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def __evict(self):
+        """Removes least recently used entries until the cache fits in max_bytes"""
+        total = self.size_bytes()
+        for key in sorted(self.m_index, key = lambda k: self.m_index[k]['last_used']):
+            if total <= self.max_bytes:
+                break
+            total -= self.m_index[key]['nbytes']
+            self.__remove_entry_files(key)
+            del self.m_index[key]
+            self.evictions += 1
+
+    def __entry_path(self, key: str, entry_format: str) -> str:
+        """npz entries are a single file, npy entries are a folder with meta.json and one .npy per array"""
+        if entry_format == 'npy':
+            return os.path.join(self.directory, key)
+        return os.path.join(self.directory, key + '.npz')
+
+    def __write_entry(self, key: str, entry_format: str, meta: dict, arrays: dict) -> int:
+        """Writes the entry and returns its size in bytes. Entries are written under a temporary
+        name first so a half-written entry is never read back. A temporary entry left by a crash, and an entry
+        that isn't in the index (e.g. index.json was lost), are removed first so none of their files are kept."""
+        entry_path = self.__entry_path(key, entry_format)
+        temp_path = entry_path + '.tmp'
+        self.__remove_path(temp_path)
+        if entry_format == 'npy':
+            os.makedirs(temp_path)
+            with open(os.path.join(temp_path, 'meta.json'), 'w') as f:
+                json.dump(meta, f)
+            for name, array in arrays.items():
+                np.save(os.path.join(temp_path, name + '.npy'), np.ascontiguousarray(array))
+            nbytes = sum(os.path.getsize(os.path.join(temp_path, f)) for f in os.listdir(temp_path))
+        else:
+            with open(temp_path, 'wb') as f:
+                np.savez(f, meta = np.array(json.dumps(meta)), **arrays)
+            nbytes = os.path.getsize(temp_path)
+        self.__remove_path(entry_path) # (os.replace() can't replace a folder)
+        os.replace(temp_path, entry_path)
+        return nbytes
+
+    def __read_entry(self, key: str, entry_format: str) -> tuple[dict, dict]:
+        entry_path = self.__entry_path(key, entry_format)
+        if entry_format == 'npy':
+            with open(os.path.join(entry_path, 'meta.json'), 'r') as f:
+                meta = json.load(f)
+            arrays = {}
+            for file_name in os.listdir(entry_path):
+                if file_name.endswith('.npy'):
+                    arrays[file_name[:-4]] = np.load(os.path.join(entry_path, file_name), mmap_mode = 'r')
+            return meta, arrays
+        with np.load(entry_path) as npz:
+            meta = json.loads(str(npz['meta']))
+            arrays = {name: npz[name] for name in npz.files if name != 'meta'}
+        return meta, arrays
+
+    def __remove_entry_files(self, key: str):
+        self.__remove_path(self.__entry_path(key, self.m_index[key].get('format', 'npz')))
+
+    def __remove_path(self, path: str):
+        """Removes the entry file or folder at path, if there is one"""
+        try:
+            if os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors = True)
+            elif os.path.exists(path):
+                os.remove(path)
+        except OSError:
+            pass # on Windows, files that are still memory-mapped by a File can't be removed yet
+
+    def __read_index(self) -> dict:
+        index_path = os.path.join(self.directory, 'index.json')
+        if not os.path.exists(index_path):
+            return {}
+        with open(index_path, 'r') as f:
+            return json.load(f)
+
+    def __write_index(self):
+        index_path = os.path.join(self.directory, 'index.json')
+        with open(index_path + '.tmp', 'w') as f:
+            json.dump(self.m_index, f)
+        os.replace(index_path + '.tmp', index_path)
+        self.m_dirty = False
+
+
+def _close_at_exit(ref: weakref.ref):
+    Cache = ref()
+    if Cache is not None:
+        Cache.close()
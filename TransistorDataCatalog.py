@@ -0,0 +1,320 @@
+import os
+import re
+import json
+import sqlite3
+import numpy as np
+from TransistorDataVisualizer import DataFile, File, DataSet, DataBank
+
+################################################
+# Catalog of a folder tree of easyEXPERT CSVs.
+#   The header metadata of every CSV is stored in
+#   a SQLite file so tests can be looked up without
+#   opening the CSVs (or writing DataFiles by hand).
+#   DataIndex keeps the same kind of metadata in
+#   memory for fast predicate queries.
+################################################
+
+COLUMNS = ['path', 'mtime', 'size', 'name', 'test_type', 'gate', 'trans_num', 'chan_len', 'chan_wid', 'misc', 'run',
+           'title', 'sweep_type', 'headers',
+           'v1_name', 'v1_start', 'v1_stop', 'v1_step', 'v1_count',
+           'v2_name', 'v2_start', 'v2_stop', 'v2_step', 'v2_count']
+
+
+class DataCatalog:
+    def __init__(self, db_path: str = 'tdv_catalog.sqlite'):
+        """Catalog of easyEXPERT CSVs stored in the SQLite file db_path. Fill it with crawl(), then use find()."""
+        self.db_path: str = db_path
+        self.m_db = sqlite3.connect(db_path)
+        self.m_db.row_factory = sqlite3.Row
+        self.m_db.execute(f"CREATE TABLE IF NOT EXISTS files ({', '.join(COLUMNS)}, PRIMARY KEY (path))")
+        for column in ['test_type', 'gate', 'trans_num', 'misc']:
+            self.m_db.execute(f"CREATE INDEX IF NOT EXISTS idx_{column} ON files ({column})")
+        self.m_db.commit()
+
+    def print(self):
+        """Prints how many files are in the catalog, per test type and gate"""
+        rows = self.m_db.execute("SELECT test_type, gate, COUNT(*) AS n FROM files GROUP BY test_type, gate").fetchall()
+        print(f"Catalog: {self.db_path}")
+        print(f"Files: {sum(row['n'] for row in rows)}")
+        for row in rows:
+            print(f"  {row['test_type']}{row['gate']}: {row['n']}")
+
+    def crawl(self, root: str) -> dict:
+        """Scans the folder tree under root for CSVs and records their header metadata.
+        Files whose modification time and size haven't changed since the last crawl are skipped, and files
+        that were removed are dropped from the catalog. Returns counts of added, updated, unchanged, removed
+        and failed files."""
+        counts = {'added': 0, 'updated': 0, 'unchanged': 0, 'removed': 0, 'failed': 0}
+        prefix = os.path.join(os.path.abspath(root), '')
+        known = {row['path']: (row['mtime'], row['size'])
+                 for row in self.m_db.execute("SELECT path, mtime, size FROM files WHERE substr(path, 1, ?) = ?",
+                                              (len(prefix), prefix))}
+        seen = set()
+        for folder, _, file_names in os.walk(root):
+            for file_name in file_names:
+                if not file_name.lower().endswith('.csv'):
+                    continue
+                path = os.path.abspath(os.path.join(folder, file_name))
+                seen.add(path)
+                stat = os.stat(path)
+                if known.get(path) == (stat.st_mtime_ns, stat.st_size):
+                    counts['unchanged'] += 1
+                    continue
+                try:
+                    record = self.__read_record(path, stat)
+                except Exception as e:
+                    print(f"Could not read '{path}': {e}")
+                    counts['failed'] += 1
+                    continue
+                self.m_db.execute(f"INSERT OR REPLACE INTO files VALUES ({', '.join('?' * len(COLUMNS))})",
+                                  [record[column] for column in COLUMNS])
+                counts['updated' if path in known else 'added'] += 1
+
+        for path in set(known) - seen:
+            self.m_db.execute("DELETE FROM files WHERE path = ?", (path,))
+            counts['removed'] += 1
+        self.m_db.commit()
+        return counts
+
+    def find(self, where: str = '', params: tuple = (), **criteria) -> list[dict]:
+        """Returns the catalog records matching every criteria (column = value), e.g.
+        find(test_type='I', gate='t', trans_num=7, misc='post-epoxy'). misc matches any of a file's condition tags.
+        A SQL condition can be added with where (and its ? parameters), e.g. where='v1_stop - v1_start >= ?', params=(10,)"""
+        conditions, values = [], []
+        for column, value in criteria.items():
+            if column not in COLUMNS:
+                raise Exception(f"Error: '{column}' is not a catalog column. Pick from {COLUMNS}")
+            if value is None:
+                conditions.append(f"{column} IS NULL")
+            elif column == 'misc': # comma separated tags, e.g. 'cryo,post-epoxy'
+                conditions.append("instr(',' || misc || ',', ?) > 0")
+                values.append(f",{value},")
+            else:
+                conditions.append(f"{column} = ?")
+                values.append(value)
+        if where:
+            conditions.append(f"({where})")
+            values.extend(params)
+        query = "SELECT * FROM files"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY path"
+        records = []
+        for row in self.m_db.execute(query, values):
+            record = dict(row)
+            record['headers'] = json.loads(record['headers'])
+            records.append(record)
+        return records
+
+    def datafiles(self, where: str = '', params: tuple = (), **criteria) -> list[DataFile]:
+        """Same as find(), but returns the matching tests as DataFiles"""
+        return [DataFile(record['name'], record['path'], record['misc'])
+                for record in self.find(where, params, **criteria)]
+
+    def datasets(self, where: str = '', params: tuple = (), **criteria) -> list[DataSet]:
+        """Same as find(), but returns the matching tests as DataSets"""
+        return [DataSet(DF) for DF in self.datafiles(where, params, **criteria)]
+
+    def bank(self, where: str = '', params: tuple = (), override: bool = False, **criteria) -> DataBank:
+        """Same as find(), but loads the matching tests into a DataBank (see DataBank.from_files())"""
+        return DataBank.from_files(self.datafiles(where, params, **criteria), override = override)
+
+    def close(self):
+        self.m_db.close()
+
+    def __read_record(self, path: str, stat) -> dict:
+        """Reads the header rows of the CSV at path and makes its catalog record"""
+        F = File(DataFile('', path), metadata_only = True, cache = False)
+        record = parse_path_info(path)
+        if 'R' in F.m_headers or F.get_title().startswith('R'):
+            record['test_type'] = 'R'
+        else:
+            record['test_type'] = 'I'
+        interval_names = list(F.m_intervals_info.keys())
+        if 'Vbgs' in interval_names:
+            record['gate'] = 'b'
+        elif 'Vtgs' in interval_names:
+            record['gate'] = 't'
+        else:
+            record['gate'] = None
+        trans_num = record['trans_num'] if record['trans_num'] is not None else 0 # DataSets need a number
+        record['name'] = f"{record['test_type']}{record['gate'] or 't'}{trans_num}"
+        record.update({'path': path,
+                       'mtime': stat.st_mtime_ns,
+                       'size': stat.st_size,
+                       'title': F.get_title(),
+                       'sweep_type': F.m_sweep_type,
+                       'headers': json.dumps(F.get_headers())})
+        for i, (v_name, info) in enumerate(F.get_sweep_info().items()): # v1 is the primary sweep (x), v2 the secondary
+            record[f"v{i+1}_name"] = v_name
+            for key in ['start', 'stop', 'step', 'count']:
+                record[f"v{i+1}_{key}"] = info[key]
+        return record
+
+
+def parse_path_info(path: str) -> dict:
+    """Gets the device number, channel dimensions, condition tags and repeat run number from the folder/file names
+    used in TransistorDataFiles.py, e.g. 'S31_#7_50x50_P25243_post_epoxy\\Id-Vds var const Vtgs_n2.csv'"""
+    info = {'trans_num': None, 'chan_len': None, 'chan_wid': None, 'misc': None, 'run': None}
+    device = re.findall(r'#(\d+)', path)
+    if device:
+        info['trans_num'] = int(device[-1])
+    dims = re.findall(r'(\d+)x(\d+)', path)
+    if dims:
+        info['chan_len'], info['chan_wid'] = int(dims[-1][0]), int(dims[-1][1])
+    run = re.findall(r'_n(\d+)', os.path.basename(path))
+    if run:
+        info['run'] = int(run[-1])
+
+    lowered = path.lower()
+    tags = []
+    if 'cryo' in lowered:
+        tags.append('cryo')
+    if 'pre_epoxy' in lowered or 'pre-epoxy' in lowered:
+        tags.append('pre-epoxy')
+    if 'post_epoxy' in lowered or 'post-epoxy' in lowered:
+        tags.append('post-epoxy')
+    if tags:
+        info['misc'] = ','.join(tags)
+    return info
+
+
+def misc_tags(misc) -> list:
+    """The condition tags of a DataFile.misc, e.g. 'cryo,post-epoxy' -> ['cryo', 'post-epoxy'] and 1 -> ['1'].
+    misc can be anything (TransistorDataFiles.py uses ints too), so it's split as a string. No misc -> [None]"""
+    return [None] if misc is None else str(misc).split(',')
+
+
+class DataIndex:
+    def __init__(self):
+        """In-memory index of test metadata (DataInfo fields, sweep intervals and DataFile.misc) for fast queries.
+        Each field is kept as one numpy column, so a query is a few vectorized comparisons no matter how many
+        tests are indexed. No sweep data is loaded to build or query the index."""
+        self.m_DataFiles: list = []
+        self.m_DataSets: list = [] # the DataSet of each entry, if it was indexed from one
+        self.m_records: list = []
+        self.m_columns: dict = None # built on the first query after entries are added
+        self.m_tags: dict = None # misc tag (or None) -> boolean column of the entries that have it, built with m_columns
+
+    def __len__(self):
+        return len(self.m_records)
+
+    @classmethod
+    def from_datafiles(cls, DataFiles: list[DataFile]):
+        """Indexes DataFiles by reading only the header rows of their CSVs"""
+        Index = cls()
+        for DF in DataFiles:
+            try:
+                Index.add_DataSet(DataSet(DF, metadata_only = True), DF)
+            except Exception as e:
+                print(f"Could not index '{DF.file_name}' ({DF.file_path}): {e}")
+        return Index
+
+    @classmethod
+    def from_catalog(cls, Catalog: DataCatalog, where: str = '', params: tuple = (), **criteria):
+        """Indexes the (matching) tests of a DataCatalog without opening any CSV"""
+        Index = cls()
+        for record in Catalog.find(where, params, **criteria):
+            intervals_info = {}
+            for v in ['v1', 'v2']:
+                if record[f"{v}_name"] is not None:
+                    intervals_info[record[f"{v}_name"]] = {key: record[f"{v}_{key}"] for key in ['start', 'stop', 'step', 'count']}
+            chan_len, chan_wid = record['chan_len'], record['chan_wid']
+            Index.add_record(DataFile(record['name'], record['path'], record['misc']),
+                             {'name': record['name'],
+                              'gate': {'t': 'top', 'b': 'bottom'}.get(record['gate'], ''),
+                              'graph_type': {'R': 0, 'I': 1}.get(record['test_type'], -1),
+                              'trans_num': record['trans_num'] if record['trans_num'] is not None else -1,
+                              'chan_len': chan_len, 'chan_wid': chan_wid,
+                              'chan_area': chan_len * chan_wid if chan_len and chan_wid else None,
+                              'misc': record['misc'], 'title': record['title'],
+                              'intervals_info': intervals_info})
+        return Index
+
+    def add_DataSet(self, Set: DataSet, DF: DataFile = None):
+        """Adds a DataSet (which can be a metadata_only/lazy one) to the index"""
+        if DF is None:
+            DF = DataFile(Set.Info.data_name, Set.file_path, Set.misc)
+        dims = Set.Info.chan_dims
+        number = lambda v: v if isinstance(v, (int, float)) else None # chan_dims can be "unknown"
+        self.add_record(DF, {'name': Set.Info.data_name,
+                             'gate': Set.Info.gate,
+                             'graph_type': Set.Info.graph_type,
+                             'trans_num': int(Set.Info.trans_num),
+                             'chan_len': number(dims['len']), 'chan_wid': number(dims['wid']),
+                             'chan_area': number(dims['area']),
+                             'misc': Set.misc, 'title': Set.get_title(),
+                             'intervals_info': Set.get_sweep_info()}, Set)
+
+    def add_record(self, DF: DataFile, record: dict, Set: DataSet = None):
+        """Adds a test from its metadata record (see add_DataSet() for the keys)"""
+        self.m_DataFiles.append(DF)
+        self.m_DataSets.append(Set)
+        self.m_records.append(record)
+        self.m_columns = None
+
+    def columns(self) -> dict:
+        """Returns the index as numpy columns. Besides the record fields, every sweep variable gets
+        <name>_start, <name>_stop, <name>_step, <name>_count and <name>_span columns (NaN if a test doesn't have it)."""
+        if self.m_columns is None:
+            columns = {}
+            for key in ['name', 'gate', 'title']:
+                columns[key] = np.array([str(r[key]) for r in self.m_records])
+            for key in ['graph_type', 'trans_num']:
+                columns[key] = np.array([r[key] for r in self.m_records], dtype = int)
+            for key in ['chan_len', 'chan_wid', 'chan_area']:
+                columns[key] = np.array([np.nan if r[key] is None else r[key] for r in self.m_records], dtype = float)
+            columns['misc'] = np.array([r['misc'] for r in self.m_records], dtype = object)
+            tags = [misc_tags(r['misc']) for r in self.m_records]
+            self.m_tags = {}
+            for i, entry_tags in enumerate(tags):
+                for tag in entry_tags:
+                    self.m_tags.setdefault(tag, np.zeros(len(self.m_records), dtype = bool))[i] = True
+
+            v_names = sorted({v_name for r in self.m_records for v_name in r['intervals_info']})
+            for v_name in v_names:
+                for key in ['start', 'stop', 'step', 'count']:
+                    columns[f"{v_name}_{key}"] = np.array([r['intervals_info'].get(v_name, {}).get(key, np.nan)
+                                                           for r in self.m_records], dtype = float)
+                columns[f"{v_name}_span"] = np.abs(columns[f"{v_name}_stop"] - columns[f"{v_name}_start"])
+            self.m_columns = columns
+        return self.m_columns
+
+    def query(self, where = None, **criteria) -> np.ndarray:
+        """Returns the indices of the entries matching every criteria and the where predicate.
+        A criteria is column = value, or column = [values] to match any of them. misc matches any of an entry's
+        comma separated condition tags, e.g. misc='post-epoxy' matches 'cryo,post-epoxy'.
+        where is a function taking the dict of columns and returning a boolean array, e.g.
+            query(gate='top', graph_type=1, chan_len=50, misc='post-epoxy', where=lambda c: c['Vds_span'] >= 10)"""
+        columns = self.columns()
+        mask = np.ones(len(self.m_records), dtype = bool)
+        for column, value in criteria.items():
+            if column not in columns:
+                raise Exception(f"Error: '{column}' is not an index column. Pick from {list(columns.keys())}")
+            if column == 'misc':
+                tags = [tag for v in (value if isinstance(value, (list, tuple, set)) else [value]) for tag in misc_tags(v)]
+                mask &= np.any([self.m_tags.get(tag, np.zeros(len(mask), dtype = bool)) for tag in tags], axis = 0)
+            elif isinstance(value, (list, tuple, set)):
+                mask &= np.isin(columns[column], list(value))
+            else:
+                mask &= columns[column] == value
+        if where is not None:
+            with np.errstate(invalid = 'ignore'): # NaN columns just don't match
+                mask &= np.asarray(where(columns), dtype = bool)
+        return np.nonzero(mask)[0]
+
+    def datafiles(self, where = None, **criteria) -> list[DataFile]:
+        """Same as query(), but returns the matching DataFiles"""
+        return [self.m_DataFiles[i] for i in self.query(where, **criteria)]
+
+    def bank(self, where = None, override: bool = False, **criteria) -> DataBank:
+        """Same as query(), but puts the matches in a new DataBank. Entries indexed from a DataSet reuse it
+        (its data is only read once it's plotted); the others are loaded with DataBank.from_files()."""
+        hits = self.query(where, **criteria)
+        if all(self.m_DataSets[i] is not None for i in hits):
+            Bank = DataBank()
+            Bank.override = override
+            for i in hits:
+                Bank.append(self.m_DataSets[i])
+            return Bank
+        return DataBank.from_files([self.m_DataFiles[i] for i in hits], override = override)
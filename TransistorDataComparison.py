@@ -0,0 +1,155 @@
+import numpy as np
+from TransistorDataVisualizer import DataSet, DataBank, GridResampler
+import TransistorDataExtraction as tde
+
+################################################
+# Before/after comparison. Pairs the DataSets of
+#   two conditions (e.g. pre/post epoxy or room
+#   temperature/cryo) by device and test, puts
+#   them on the same grid and computes the deltas
+#   and parameter shifts of all pairs in batches
+################################################
+
+DELTAS = ['delta', 'rel', 'log_ratio']
+SHIFTS = ['Vd', 'dVth', 'dIon', 'Ion_ratio', 'on_off_ratio', 'dgm_max', 'dSS_min'] # one value per curve
+
+
+def pair_key(S: DataSet) -> tuple:
+    """The device and test of S: (transistor number, gate, graph type, independent variables)"""
+    return (S.Info.trans_num, S.Info.gate, S.Info.graph_type, tuple(S.get_headers()[:2]))
+
+
+def pair_sets(Before: list[DataSet], After: list[DataSet], key = pair_key) -> list[tuple[DataSet, DataSet]]:
+    """Pairs every DataSet of Before with a DataSet of After that has the same key(S). Repeats are paired in order
+    (the 1st Before of a device and test with the 1st After of it, and so on). Before and After can be DataBanks.
+    DataSets without a match are printed and left out. Returns [(Before DataSet, After DataSet), ...]"""
+    if isinstance(Before, DataBank):
+        Before = Before.m_DataSets
+    if isinstance(After, DataBank):
+        After = After.m_DataSets
+    waiting = {}
+    for S in After:
+        waiting.setdefault(key(S), []).append(S)
+    pairs = []
+    for S in Before:
+        matches = waiting.get(key(S))
+        if matches:
+            pairs.append((S, matches.pop(0)))
+        else:
+            print(f"No match for '{S.file_path}' ({S.Info.data_name}, {S.misc}), left out.")
+    return pairs
+
+
+def compare(Before: list[DataSet], After: list[DataSet], index = 'Id', key = pair_key, method: str = 'linear',
+            metrics: bool = True) -> list[dict]:
+    """Compares every pair of pair_sets(Before, After, key) over their whole (x, y) surface.
+    The After data is resampled onto the Before grid where the grids differ (GridResampler, NaN outside the
+    After sweep). Pairs on the same grid are compared together: one stacked numpy pass computes the deltas of all
+    of them and one TransistorDataExtraction pass per condition their parameter shifts.
+
+    Input:
+        Before, After: lists of DataSets (or DataBanks) of the two conditions
+        index: header index (of the Before DataSets) or name of the data to compare
+        key: pairing key, see pair_key()
+        method: 'linear' or 'nearest' resampling
+        metrics: if True, the SHIFTS parameter shifts are computed (needs gate/drain voltage and drain current headers)
+
+    Output: list with a dict per pair:
+        'name', 'misc' ("<After misc> vs. <Before misc>"), 'Before', 'After'
+        'DataSet': a DataSet on the Before grid with the columns d<name> (After - Before), <name>_rel
+            ((After - Before) / |Before|) and <name>_log (log10 |After| / |Before|), ready for a DataBank
+        the SHIFTS arrays, one value per curve (per drain voltage) of the Before grid, if metrics is True"""
+    pairs = pair_sets(Before, After, key)
+    resampler = GridResampler(method)
+    groups = {} # pairs whose Before DataSets share a grid and independent variables
+    for j, (S_b, S_a) in enumerate(pairs):
+        groups.setdefault((resampler.grid_key(S_b), tuple(S_b.get_headers()[:2])), []).append(j)
+
+    results = [None] * len(pairs)
+    for members in groups.values():
+        group_pairs = [pairs[j] for j in members]
+        Ref = group_pairs[0][0]
+        name = index if isinstance(index, str) else Ref.get_data_name(index)
+        before = np.stack([_column(S_b, name) for S_b, S_a in group_pairs])
+        after = _stack_on_grid(resampler, group_pairs, name)
+        with np.errstate(divide = 'ignore', invalid = 'ignore'):
+            delta = after - before
+            rel = delta / np.abs(before)
+            log_ratio = np.log10(np.abs(after) / np.abs(before))
+        rel[~np.isfinite(rel)] = np.nan
+        log_ratio[~np.isfinite(log_ratio)] = np.nan
+        shifts = get_shifts(group_pairs, resampler, before, after, name) if metrics else None
+
+        for k, (j, (S_b, S_a)) in enumerate(zip(members, group_pairs)):
+            columns = {f"d{name}": delta[k], f"{name}_rel": rel[k], f"{name}_log": log_ratio[k]}
+            result = {'name': S_b.Info.data_name, 'misc': f"{S_a.misc} vs. {S_b.misc}", 'Before': S_b, 'After': S_a,
+                      'DataSet': _result_dataset(S_b, S_a, columns)}
+            if shifts is not None:
+                result.update({shift: values[k] for shift, values in shifts.items()})
+            results[j] = result
+    return results
+
+
+def get_shifts(pairs: list[tuple], resampler: GridResampler, before: np.ndarray = None, after: np.ndarray = None,
+               name: str = None) -> dict:
+    """SHIFTS of pairs on the same Before grid, from one extract_arrays() pass over the stacked drain currents of
+    each condition. before/after are the stacked data of name if already at hand (reused if name is the drain current).
+    Returns a dict of (n_pairs, n_curves) arrays, or None if the DataSets aren't drain current sweeps."""
+    Ref = pairs[0][0]
+    try:
+        gate, drain, current = tde.get_roles(Ref)
+    except ValueError:
+        return None
+    current_name = Ref.get_data_name(current)
+    if current_name != name:
+        before = np.stack([_column(S_b, current_name) for S_b, S_a in pairs])
+        after = _stack_on_grid(resampler, pairs, current_name)
+    vg, vd, gate_axis = tde.get_axis_values(Ref, gate), tde.get_axis_values(Ref, drain), -1 if gate == 0 else -2
+    _, b = tde.extract_arrays(vg, vd, before, gate_axis, [tde.get_w_over_l(S_b) for S_b, S_a in pairs])
+    _, a = tde.extract_arrays(vg, vd, after, gate_axis, [tde.get_w_over_l(S_a) for S_b, S_a in pairs])
+    with np.errstate(divide = 'ignore', invalid = 'ignore'):
+        return {'Vd': b['Vd'],
+                'dVth': a['Vth'] - b['Vth'],
+                'dIon': a['Ion'] - b['Ion'],
+                'Ion_ratio': a['Ion'] / b['Ion'],
+                'on_off_ratio': a['on_off'] / b['on_off'],
+                'dgm_max': a['gm_max'] - b['gm_max'],
+                'dSS_min': a['SS_min'] - b['SS_min']}
+
+
+def compare_bank(Before: list[DataSet], After: list[DataSet], index = 'Id', key = pair_key, method: str = 'linear',
+                 override: bool = False) -> DataBank:
+    """Returns a DataBank of the comparison DataSets of compare() (without the parameter shifts), one per pair"""
+    B = DataBank()
+    B.override = override
+    for result in compare(Before, After, index, key, method, metrics = False):
+        B.append(result['DataSet'])
+    return B
+
+
+def _column(S: DataSet, name: str) -> np.ndarray:
+    if name not in S.get_headers():
+        raise ValueError(f"'{S.file_path}' has no '{name}' data, only {S.get_headers()}")
+    return S.get_data(S.get_header_index(name))
+
+
+def _stack_on_grid(resampler: GridResampler, pairs: list[tuple], name: str) -> np.ndarray:
+    """The After data named name of pairs whose Before DataSets share a grid, stacked on that grid.
+    After DataSets on another grid are resampled, all of those sharing a grid in one resample_array() call."""
+    Ref = pairs[0][0]
+    stack = np.empty((len(pairs),) + Ref.m_shape)
+    to_resample = {} # After grid -> positions in stack
+    for k, (S_b, S_a) in enumerate(pairs):
+        if S_a.has_same_grid(S_b):
+            stack[k] = _column(S_a, name)
+        else:
+            to_resample.setdefault(resampler.grid_key(S_a), []).append(k)
+    for positions in to_resample.values():
+        Source = pairs[positions[0]][1]
+        stack[positions] = resampler.resample_array(np.stack([_column(pairs[k][1], name) for k in positions]), Source, Ref)
+    return stack
+
+
+def _result_dataset(Before: DataSet, After: DataSet, columns: dict) -> DataSet:
+    """A DataSet on Before's grid holding the comparison columns"""
+    return DataSet.derived(Before, f"{After.file_path} vs. {Before.file_path}", f"{After.misc} vs. {Before.misc}", columns)
@@ -0,0 +1,172 @@
+import os
+import sys
+import json
+from concurrent.futures import ProcessPoolExecutor
+import matplotlib.pyplot as plt
+from TransistorDataVisualizer import DataFile, DataSet, DataBank
+
+################################################
+# Unattended figure export. Renders a list of
+#   PlotJobs with the non-interactive Agg backend
+#   across worker processes and saves every figure
+#   as a PNG/SVG/PDF without calling plt.show()
+################################################
+
+FORMATS = ['png', 'svg', 'pdf']
+PLOTS = ['3d', '2d', 'div']
+
+
+class PlotJob:
+    def __init__(self, Bank, output: str, plot: str = '3d', Zindex = -1, domain: dict = None, x_idx = 'x',
+                 DivSet = None, divIdx = -1, dpi: int = 150):
+        """One figure to export:
+            plot = '3d' -> Bank.quick_plot3d(Zindex)
+            plot = '2d' -> Bank.quick_plot2d(x_idx, Zindex)
+            plot = 'div' -> Bank.quick_div_plot3d(DivSet, divIdx, Zindex=Zindex)
+        restricted to domain (e.g. {'x': [0, 5], 'y': [-2, 2]}) and saved to output. The file format comes
+        from output's extension (.png, .svg or .pdf).
+
+        Bank can be a DataBank or a list of DataFiles. A list is loaded by the worker that renders the job,
+        which saves sending the parsed data to the worker. DivSet can likewise be a DataSet or a DataFile."""
+        self.Bank = Bank
+        self.output: str = output
+        self.plot: str = plot
+        self.Zindex = Zindex
+        self.domain: dict = domain or {}
+        self.x_idx = x_idx
+        self.DivSet = DivSet
+        self.divIdx = divIdx
+        self.dpi: int = dpi
+
+    def print(self):
+        print(f"Plot: {self.plot}  Zindex: {self.Zindex}  Domain: {self.domain}")
+        print(f"Output: {self.output}")
+
+    def get_bank(self) -> DataBank:
+        """Returns the job's DataBank, loading it if Bank is a list of DataFiles.
+        Raises a ValueError if a DataFile couldn't be loaded or there's nothing to plot."""
+        Bank = self.Bank
+        if not isinstance(Bank, DataBank):
+            Bank = DataBank.from_files(self.Bank, workers = 1)
+            if Bank.load_errors:
+                i, DF, error = Bank.load_errors[0]
+                raise ValueError(f"could not load '{DF.file_name}' ({DF.file_path}): {error}")
+        if len(Bank.m_DataSets) == 0:
+            raise ValueError("the DataBank is empty")
+        return Bank
+
+    def get_divset(self) -> DataSet:
+        if isinstance(self.DivSet, DataFile):
+            return DataSet(self.DivSet)
+        return self.DivSet
+
+    def check(self):
+        """Raises a ValueError if the job can't be rendered, so bad jobs fail before any work is done"""
+        if self.plot not in PLOTS:
+            raise ValueError(f"plot '{self.plot}' is not one of {PLOTS}")
+        extension = os.path.splitext(self.output)[1][1:].lower()
+        if extension not in FORMATS:
+            raise ValueError(f"output '{self.output}' doesn't end in one of {['.' + f for f in FORMATS]}")
+        if self.plot == 'div' and self.DivSet is None:
+            raise ValueError("a 'div' plot needs a DivSet")
+
+
+def render_job(job: PlotJob) -> str:
+    """Renders the job without showing it, saves it to job.output and closes the figure right away so
+    memory stays flat over long batches, also if the job fails part way. The DataBank's domain is restored
+    afterwards. Returns job.output."""
+    job.check()
+    Bank = job.get_bank()
+    saved_domain = dict(Bank.domain)
+    fig = plt.figure(figsize = (6, 4)) if job.plot == '2d' else plt.figure()
+    try:
+        for axis, domain in job.domain.items():
+            Bank.set_domain(axis, domain)
+        if job.plot == '3d':
+            Bank.quick_plot3d(job.Zindex, ax = fig.add_subplot(projection = '3d'))
+        elif job.plot == '2d':
+            Bank.quick_plot2d(job.x_idx, job.Zindex, ax = fig.add_subplot())
+        else:
+            Bank.quick_div_plot3d(job.get_divset(), job.divIdx, Zindex = job.Zindex, ax = fig.add_subplot(projection = '3d'))
+        folder = os.path.dirname(job.output)
+        if folder:
+            os.makedirs(folder, exist_ok = True)
+        fig.savefig(job.output, dpi = job.dpi)
+    finally:
+        Bank.domain = saved_domain
+        plt.close(fig)
+    return job.output
+
+
+def _init_worker():
+    """Process pool initializer: workers never need a window, so they use Agg whatever the default backend is"""
+    plt.switch_backend('Agg')
+
+
+def export_figures(jobs: list[PlotJob], workers: int = None) -> list[tuple]:
+    """Renders and saves every PlotJob, in parallel across worker processes.
+    A job that fails is reported and skipped instead of stopping the batch.
+
+    Input:
+        jobs: list of PlotJobs
+        workers: number of worker processes. Defaults to the number of CPUs; 1 renders in this process
+            (with the current backend, but nothing is shown).
+
+    Output: list of (index, PlotJob, error) for the jobs that failed
+
+    Note: on Windows, scripts calling export_figures() need an `if __name__ == '__main__':` guard."""
+    errors = {}
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers == 1 or len(jobs) <= 1:
+        for i, job in enumerate(jobs):
+            try:
+                render_job(job)
+            except Exception as e:
+                errors[i] = e
+    else:
+        with ProcessPoolExecutor(max_workers = workers, initializer = _init_worker) as pool:
+            futures = {i: pool.submit(render_job, job) for i, job in enumerate(jobs)}
+            for i, future in futures.items():
+                try:
+                    future.result()
+                except Exception as e:
+                    errors[i] = e
+
+    failed = [(i, jobs[i], errors[i]) for i in sorted(errors)]
+    for i, job, error in failed:
+        print(f"Could not export PlotJob #{i} ({job.output}): {error}")
+    return failed
+
+
+def read_jobs(json_path: str) -> list[PlotJob]:
+    """Reads PlotJobs from a JSON list such as
+        [{"files": [["It7", "Id-Vds var const Vtgs_n1.csv"]], "plot": "3d", "Zindex": -1,
+          "domain": {"x": [0, 5]}, "output": "figures/It7.png"}]
+    'div' jobs name their DivSet's DataFile the same way: "div": ["It8", "path.csv"]"""
+    with open(json_path, 'r') as f:
+        entries = json.load(f)
+    jobs = []
+    for entry in entries:
+        DivSet = DataFile(*entry['div']) if 'div' in entry else None
+        jobs.append(PlotJob([DataFile(*df) for df in entry['files']], entry['output'],
+                            plot = entry.get('plot', '3d'),
+                            Zindex = entry.get('Zindex', -1),
+                            domain = entry.get('domain'),
+                            x_idx = entry.get('x_idx', 'x'),
+                            DivSet = DivSet,
+                            divIdx = entry.get('divIdx', -1),
+                            dpi = entry.get('dpi', 150)))
+    return jobs
+
+
+if __name__ == '__main__':
+    # python TransistorDataExport.py jobs.json [workers]
+    if len(sys.argv) < 2:
+        print("Usage: python TransistorDataExport.py jobs.json [workers]")
+        sys.exit(1)
+    plt.switch_backend('Agg')
+    jobs = read_jobs(sys.argv[1])
+    failed = export_figures(jobs, workers = int(sys.argv[2]) if len(sys.argv) > 2 else None)
+    print(f"Exported {len(jobs) - len(failed)}/{len(jobs)} figures")
+    sys.exit(1 if failed else 0)
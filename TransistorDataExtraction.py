@@ -0,0 +1,192 @@
+import numpy as np
+from TransistorDataVisualizer import DataSet, DataBank
+
+################################################
+# Device parameter extraction. Computes figures
+#   of merit (gm, gds, on/off ratio, subthreshold
+#   swing, Vth, sheet resistance) with numpy
+#   gradients and reductions along the gate or
+#   drain voltage axis, for a DataSet or for a
+#   whole DataBank stack in one pass
+################################################
+
+GATE_NAMES = ['Vgs', 'Vtgs', 'Vbgs']
+DRAIN_NAMES = ['Vds']
+CURRENT_NAMES = ['Id', 'I']
+COLUMNS = ['gm', 'gds', 'SS', 'Rsheet'] # derived columns added to the DataSets
+SUMMARY = ['Vd', 'Ion', 'Ioff', 'on_off', 'gm_max', 'Vg_gm_max', 'Vth', 'SS_min', 'Rsheet_on'] # one value per curve
+
+
+def get_roles(S: DataSet) -> tuple[int, int, int]:
+    """Returns the header indices of S's gate voltage, drain voltage and drain current.
+    The gate and drain voltages are S's two independent variables (header index 0 is x, 1 is y).
+    Raises a ValueError if S isn't a gate/drain voltage sweep of the drain current."""
+    headers = S.get_headers()
+    gate = [i for i in [0, 1] if headers[i] in GATE_NAMES]
+    drain = [i for i in [0, 1] if headers[i] in DRAIN_NAMES]
+    current = [i for i, header in enumerate(headers) if header in CURRENT_NAMES]
+    if not gate or not drain or not current:
+        raise ValueError(f"'{S.Info.data_name}' ({S.file_path}) doesn't have a gate voltage, drain voltage and "
+                         f"drain current among its headers {headers}")
+    return gate[0], drain[0], current[0]
+
+
+def get_w_over_l(S: DataSet) -> float:
+    """Channel width over length from S.Info.chan_dims, NaN if the dimensions are unknown"""
+    wid, length = S.Info.chan_dims['wid'], S.Info.chan_dims['len']
+    if isinstance(wid, (int, float)) and isinstance(length, (int, float)) and length != 0:
+        return wid / length
+    return np.nan
+
+
+def extract_arrays(vg: np.ndarray, vd: np.ndarray, Id: np.ndarray, gate_axis: int, w_over_l = np.nan) -> tuple[dict, dict]:
+    """The vectorized extraction every other function uses. Every curve (and every device of a stack) is done by
+    the same numpy operations, without Python loops.
+
+    Input:
+        vg, vd: 1D gate and drain voltages of the grid
+        Id: (rows, cols) drain current of one sweep or an (n_sets, rows, cols) stack of sweeps on the same grid
+        gate_axis: -1 if the gate voltage varies along the columns (header index 0), -2 if along the rows
+        w_over_l: channel width/length, a float or one per device of the stack
+
+    Output: (columns, summary)
+        columns: {'gm', 'gds', 'SS', 'Rsheet'} arrays shaped like Id
+        summary: {'Vd', 'Ion', 'Ioff', 'on_off', 'gm_max', 'Vg_gm_max', 'Vth', 'SS_min', 'Rsheet_on'} arrays with
+            one value per curve (Id's shape without the gate axis), i.e. per drain voltage"""
+    drain_axis = -2 if gate_axis == -1 else -1
+    Id = np.asarray(Id, dtype = float)
+    vg, vd = np.asarray(vg, dtype = float), np.asarray(vd, dtype = float)
+    w_over_l = np.asarray(w_over_l, dtype = float)
+    w_over_l = w_over_l.reshape(w_over_l.shape + (1,) * (Id.ndim - w_over_l.ndim)) # one per device, broadcast over the grid
+    Vd = np.expand_dims(vd, gate_axis) # drain voltage of every point, broadcastable to Id
+
+    with np.errstate(divide = 'ignore', invalid = 'ignore'):
+        gm = _gradient(Id, vg, gate_axis)
+        gds = _gradient(Id, vd, drain_axis)
+        abs_Id = np.abs(Id)
+        conducting = np.where(abs_Id > 0, abs_Id, np.nan) # log10 and Ioff skip zero currents
+        decades = np.abs(_gradient(np.log10(conducting), vg, gate_axis)) # decades of current per volt
+        SS = np.where(decades > 0, 1e3 / decades, np.nan) # mV/dec
+        Rsheet = Vd / Id * w_over_l
+        Rsheet[~np.isfinite(Rsheet)] = np.nan
+
+        # fmax/fmin reductions skip NaNs without warning about all-NaN curves
+        Ion = np.fmax.reduce(abs_Id, axis = gate_axis)
+        Ioff = np.fmin.reduce(conducting, axis = gate_axis)
+        at_max = np.expand_dims(np.argmax(np.nan_to_num(np.abs(gm), nan = -1), axis = gate_axis), gate_axis)
+        gm_max = np.take_along_axis(gm, at_max, gate_axis)
+        Vg_gm_max = vg[at_max]
+        # the tangent at max gm crosses Id = 0 at the threshold voltage
+        Vth = Vg_gm_max - np.take_along_axis(Id, at_max, gate_axis) / gm_max
+        curve_Vd = np.abs(np.squeeze(Vd, gate_axis)) * np.ones_like(Ion)
+        summary = {'Vd': np.squeeze(Vd, gate_axis) * np.ones_like(Ion),
+                   'Ion': Ion,
+                   'Ioff': Ioff,
+                   'on_off': Ion / Ioff,
+                   'gm_max': np.squeeze(gm_max, gate_axis),
+                   'Vg_gm_max': np.squeeze(Vg_gm_max, gate_axis),
+                   'Vth': np.squeeze(Vth, gate_axis),
+                   'SS_min': 1e3 / np.fmax.reduce(decades, axis = gate_axis),
+                   'Rsheet_on': curve_Vd / Ion * np.squeeze(w_over_l, gate_axis)}
+    for key in ['SS_min', 'Rsheet_on', 'Vth']:
+        summary[key][~np.isfinite(summary[key])] = np.nan
+    return {'gm': gm, 'gds': gds, 'SS': SS, 'Rsheet': Rsheet}, summary
+
+
+def _gradient(data: np.ndarray, values: np.ndarray, axis: int) -> np.ndarray:
+    """np.gradient along axis, or NaN if the axis has a single point (e.g. a constant drain voltage)"""
+    if len(values) < 2:
+        return np.full(data.shape, np.nan)
+    return np.gradient(data, values, axis = axis)
+
+
+def get_axis_values(S: DataSet, index: int) -> np.ndarray:
+    """The 1D values of S's independent variable at header index 0 (x, along the columns) or 1 (y, along the rows)"""
+    return S.get_data(0)[0, :] if index == 0 else S.get_data(1)[:, 0]
+
+
+def _summary(S: DataSet, summary: dict) -> dict:
+    return {'name': S.Info.data_name, 'misc': S.misc, 'file_path': S.file_path, **summary}
+
+
+def extract(S: DataSet, columns: bool = False) -> dict:
+    """Extracts the figures of merit of one DataSet.
+
+    Input:
+        S: DataSet of a drain current swept over gate and drain voltage (Id-Vds, Id-Vgs or Rds v Vgs tests)
+        columns: if True, gm, gds, SS and Rsheet are added to S as derived columns (see File.add_column()).
+            They go after the measured columns, so get_data(-1) (and every default Zindex=-1) is then Rsheet.
+
+    Output: S's summary, a dict with the name, misc and file_path of S and the SUMMARY arrays (one value per curve)"""
+    gate, drain, current = get_roles(S)
+    cols, summary = extract_arrays(get_axis_values(S, gate), get_axis_values(S, drain), S.get_data(current),
+                                   -1 if gate == 0 else -2, get_w_over_l(S))
+    if columns:
+        for name in COLUMNS:
+            S.add_column(name, cols[name])
+    return _summary(S, summary)
+
+
+def extract_bank(B: DataBank, columns: bool = False) -> list[dict]:
+    """Extracts the figures of merit of every DataSet of the DataBank. The DataSets sharing the first DataSet's grid
+    and headers are done together, in one extract_arrays() pass over B.get_stack(); the others one at a time.
+
+    Input:
+        B: DataBank
+        columns: if True, gm, gds, SS and Rsheet are added to every DataSet as derived columns (see extract())
+
+    Output: list with the summary dict of each DataSet, in the DataBank's order (see extract())"""
+    Sets = B.m_DataSets
+    if len(Sets) == 0:
+        return []
+    gate, drain, current = get_roles(Sets[0])
+    headers = Sets[0].get_headers()
+    mask = B.get_stack_mask()
+    stacked = [i for i, S in enumerate(Sets)
+               if mask[i] and S.get_headers()[:2] == headers[:2] and current < len(S.get_headers())
+               and S.get_headers()[current] == headers[current]]
+    summaries = [None] * len(Sets)
+
+    if stacked:
+        Id = B.get_stack(current)
+        if len(stacked) < len(Sets):
+            Id = Id[stacked]
+        cols, summary = extract_arrays(get_axis_values(Sets[0], gate), get_axis_values(Sets[0], drain), Id,
+                                       -1 if gate == 0 else -2, [get_w_over_l(Sets[i]) for i in stacked])
+        for j, i in enumerate(stacked):
+            summaries[i] = _summary(Sets[i], {key: values[j] for key, values in summary.items()})
+            if columns:
+                for name in COLUMNS:
+                    Sets[i].add_column(name, cols[name][j]) # (a view of the stacked result)
+    for i, S in enumerate(Sets):
+        if summaries[i] is None:
+            summaries[i] = extract(S, columns)
+    return summaries
+
+
+def summary_table(summaries: list[dict], Vd: float = None, keys: list = None) -> dict:
+    """Turns the summaries of extract()/extract_bank() into a per device table: a dict of SUMMARY columns (or keys)
+    with one value per device, taken from each device's curve at the drain voltage closest to Vd (the last curve if None)"""
+    keys = keys or SUMMARY
+    table = {'name': [s['name'] for s in summaries], 'misc': [s['misc'] for s in summaries]}
+    picks = []
+    for s in summaries:
+        if Vd is None or np.all(np.isnan(s['Vd'])):
+            picks.append(len(s['Vd']) - 1)
+        else:
+            picks.append(int(np.nanargmin(np.abs(s['Vd'] - Vd))))
+    for key in keys:
+        table[key] = np.array([s[key][i] for s, i in zip(summaries, picks)])
+    return table
+
+
+def print_summary_table(table: dict):
+    """Prints a summary_table() with one row per device"""
+    keys = [key for key in table if key not in ['name', 'misc']]
+    widths = {key: max([12, len(key) + 2] + [len(str(value)) + 2 for value in table[key]]) for key in ['name', 'misc']}
+    widths.update({key: max(12, len(key) + 2) for key in keys})
+    print(''.join(f"{key:>{widths[key]}}" for key in ['name', 'misc'] + keys))
+    for i in range(len(table['name'])):
+        row = [f"{str(table[key][i]):>{widths[key]}}" for key in ['name', 'misc']]
+        row += [f"{table[key][i]:>{widths[key]}.4g}" for key in keys]
+        print(''.join(row))
@@ -0,0 +1,364 @@
+import os
+import json
+import numpy as np
+from TransistorDataVisualizer import DataFile, DataSet, DataBank
+
+################################################
+# Columnar export/import. Writes DataBanks as one
+#   long-form table (one row per data point) to
+#   Parquet, Arrow IPC or HDF5, one DataSet at a
+#   time, and rebuilds the DataSets from it without
+#   re-parsing the easyEXPERT csvs.
+#   Needs pyarrow (Parquet/Arrow) or h5py (HDF5).
+################################################
+
+FORMATS = {'.parquet': 'parquet', '.pq': 'parquet', '.arrow': 'arrow', '.feather': 'arrow', '.h5': 'hdf5', '.hdf5': 'hdf5'}
+COMPRESSION = {'parquet': 'zstd', 'arrow': 'lz4', 'hdf5': 'gzip'}
+TEXT_COLUMNS = ['name', 'file_path', 'misc', 'gate', 'trans_num', 'trans_model', 'title', 'x_name', 'y_name']
+SET_COLUMNS = ['name', 'file_path', 'misc', 'gate', 'graph_type', 'trans_num', 'trans_model', 'chan_len', 'chan_wid',
+               'chan_area', 'title', 'x_name', 'x_start', 'x_step', 'x_count', 'y_name', 'y_start', 'y_step', 'y_count']
+META_KEY = 'tdv_sets' # file metadata holding the DataSets' headers, intervals and DataInfo
+
+
+def get_format(path: str) -> str:
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in FORMATS:
+        raise ValueError(f"'{path}' doesn't end in one of {list(FORMATS)}")
+    return FORMATS[extension]
+
+
+def export_table(Banks, path: str, compression: str = None, chunk_rows: int = 65536) -> int:
+    """Writes DataSets as one long-form table with a row per data point and the columns
+        bank, set_id, device metadata from DataInfo (name, file_path, misc, gate, graph_type, trans_num, trans_model,
+        chan_len, chan_wid, chan_area), title, sweep parameters (x_name, x_start, x_step, x_count, y_...),
+        x, y, and every dependent header column of the DataSets (empty where a DataSet doesn't have it).
+    The DataSets are converted one at a time and written in chunks, so memory stays bounded however many there are.
+
+    Input:
+        Banks: a DataBank, a list of DataBanks, or a list of DataSets/DataFiles. DataFiles are loaded, written and
+            let go one at a time, so a whole folder can be converted with bounded memory.
+        path: output file, .parquet/.pq, .arrow/.feather (Arrow IPC) or .h5/.hdf5 (the per-DataSet columns are
+            stored once per DataSet in the /sets group instead of on every row, join them on set_id)
+        compression: codec of the columns, defaults to zstd (Parquet), lz4 (Arrow) or gzip (HDF5)
+        chunk_rows: rows per Parquet row group, Arrow record batch or HDF5 chunk. DataSets are gathered until there
+            are at least chunk_rows rows (a DataSet isn't split), so that's about how many rows are held at a time.
+
+    Output: number of rows written"""
+    file_format = get_format(path)
+    compression = compression or COMPRESSION[file_format]
+    entries = _list_entries(Banks)
+    dependents = []
+    for bank, S in entries:
+        for header in S.get_headers()[2:]:
+            if header not in dependents:
+                dependents.append(header)
+
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok = True)
+    if file_format == 'hdf5':
+        writer = _HDF5Writer(path, dependents, compression, chunk_rows)
+    else:
+        writer = _ArrowWriter(path, dependents, compression, chunk_rows, file_format)
+    sets_meta, rows = [], 0
+    try:
+        for set_id, (bank, S) in enumerate(entries):
+            columns, meta = _set_columns(S, bank, set_id)
+            meta['rows'] = [rows, len(columns['x'])]
+            writer.write(columns, meta)
+            rows += len(columns['x'])
+            sets_meta.append(meta)
+            entries[set_id] = None # lets a DataSet loaded from a DataFile go once it's written
+    finally:
+        writer.close(sets_meta)
+    return rows
+
+
+def import_datasets(path: str, set_ids: list[int] = None) -> list[DataSet]:
+    """Rebuilds the DataSets of a table written by export_table() (all of them, or the ones in set_ids).
+    Each DataSet gets its original DataFile name, path and misc, DataInfo, headers and intervals back, so it
+    plots and reloads like one parsed from its csv."""
+    return [S for bank, S in _read_sets(path, set_ids)]
+
+
+def import_banks(path: str, override: bool = False) -> list[DataBank]:
+    """import_datasets() grouped back into one DataBank per exported bank"""
+    Banks = {}
+    for bank, S in _read_sets(path):
+        if bank not in Banks:
+            Banks[bank] = DataBank()
+            Banks[bank].override = override
+        Banks[bank].append(S)
+    return [Banks[key] for key in sorted(Banks)]
+
+
+def _read_sets(path: str, set_ids: list[int] = None) -> list[tuple]:
+    """(bank index, DataSet) of every DataSet of the table, or of the ones in set_ids"""
+    file_format = get_format(path)
+    reader = _HDF5Reader(path) if file_format == 'hdf5' else _ArrowReader(path, file_format)
+    try:
+        sets_meta = reader.sets_meta
+        if set_ids is not None:
+            sets_meta = [sets_meta[i] for i in set_ids]
+        return [(meta['bank'], _rebuild_dataset(meta, reader.read(meta))) for meta in sets_meta]
+    finally:
+        reader.close()
+
+
+def _list_entries(Banks) -> list[tuple]:
+    """(bank index, DataSet) of everything to export. DataFiles only get their header rows read here,
+    their data is loaded when they're written."""
+    if isinstance(Banks, (DataBank, DataSet, DataFile)):
+        Banks = [Banks]
+    entries = []
+    for bank, item in enumerate(Banks):
+        if isinstance(item, DataBank):
+            entries += [(bank, S) for S in item.m_DataSets]
+        elif isinstance(item, DataFile):
+            entries.append((0, DataSet(item, metadata_only = True)))
+        else:
+            entries.append((0, item))
+    return entries
+
+
+def _number(value) -> float:
+    return float(value) if isinstance(value, (int, float)) and not isinstance(value, bool) else np.nan
+
+
+def _set_columns(S: DataSet, bank: int, set_id: int) -> tuple[dict, dict]:
+    """The columns of one DataSet's rows (text and number metadata as single values) and its file metadata"""
+    headers = S.get_headers()
+    meta, arrays = S.export_state()
+    info = S.Info
+    columns = {'bank': bank, 'set_id': set_id,
+               'name': info.data_name, 'file_path': S.file_path, 'misc': None if S.misc is None else str(S.misc),
+               'gate': info.gate, 'graph_type': info.graph_type, 'trans_num': str(info.trans_num),
+               'trans_model': info.trans_model, 'chan_len': _number(info.chan_dims['len']),
+               'chan_wid': _number(info.chan_dims['wid']), 'chan_area': _number(info.chan_dims['area']),
+               'title': meta['title']}
+    for axis in ['x', 'y']:
+        axis_info = S.get_axis_info(axis) or {}
+        columns[f"{axis}_name"] = headers[0 if axis == 'x' else 1]
+        for key in ['start', 'step', 'count']:
+            columns[f"{axis}_{key}"] = _number(axis_info.get(key))
+    columns['x'] = np.ravel(arrays['data_0'])
+    columns['y'] = np.ravel(arrays['data_1'])
+    for i, header in enumerate(headers[2:]):
+        columns[header] = np.ravel(arrays[f"data_{i + 2}"])
+
+    file_meta = {'bank': bank, 'set_id': set_id, 'file_name': info.data_name, 'file_path': S.file_path, 'misc': S.misc,
+                 'info': {'graph_type': info.graph_type, 'trans_num': info.trans_num, 'trans_model': info.trans_model,
+                          'units': info.units, 'chan_dims': info.chan_dims, 'gate': info.gate},
+                 'state': meta,
+                 'intervals': [np.asarray(arrays[f"interval_{i}"]).tolist() for i in range(len(meta['interval_names']))]}
+    return columns, file_meta
+
+
+def _rebuild_dataset(meta: dict, data: dict) -> DataSet:
+    state = meta['state']
+    shape = (state['dim2_count'], state['dim1_count'])
+    arrays = {f"data_{i}": np.reshape(data[key], shape) for i, key in enumerate(['x', 'y'] + state['headers'][2:])}
+    for i, values in enumerate(meta['intervals']):
+        arrays[f"interval_{i}"] = np.array(values)
+    S = DataSet(DataFile(meta['file_name'], meta['file_path'], meta['misc']), state = (state, arrays))
+    for key, value in meta['info'].items():
+        setattr(S.Info, key, value)
+    return S
+
+
+class _ArrowWriter:
+    """Parquet or Arrow IPC file writer. DataSets are gathered into row groups (Parquet) or record batches (Arrow)
+    of at least chunk_rows rows, a DataSet is never split between two"""
+    def __init__(self, path: str, dependents: list, compression: str, chunk_rows: int, file_format: str):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            import pyarrow.ipc as ipc
+        except ImportError:
+            raise ImportError("Parquet and Arrow tables need pyarrow (pip install pyarrow)")
+        self.pa = pa
+        self.file_format = file_format
+        self.chunk_rows = chunk_rows
+        fields = [pa.field('bank', pa.int32()), pa.field('set_id', pa.int32())]
+        # text columns hold one value per DataSet, dictionary encoded by Parquet and compressed by Arrow
+        fields += [pa.field(name, pa.string() if name in TEXT_COLUMNS else pa.float64()) for name in SET_COLUMNS]
+        fields += [pa.field(name, pa.float64()) for name in ['x', 'y'] + dependents]
+        self.schema = pa.schema(fields)
+        if file_format == 'parquet':
+            self.writer = pq.ParquetWriter(path, self.schema, compression = compression)
+        else:
+            self.writer = ipc.new_file(path, self.schema, options = ipc.IpcWriteOptions(compression = compression))
+        self.batches = [] # the DataSets of the chunk being gathered
+        self.rows = 0 # rows in batches
+        self.chunk = 0 # index of the chunk being gathered
+
+    def write(self, columns: dict, meta: dict):
+        pa = self.pa
+        n = len(columns['x'])
+        arrays = []
+        for field in self.schema:
+            value = columns.get(field.name)
+            if field.name in ['bank', 'set_id']:
+                arrays.append(pa.array(np.full(n, value, dtype = np.int32)))
+            elif field.name in TEXT_COLUMNS and value is None:
+                arrays.append(pa.nulls(n, field.type))
+            elif field.name in TEXT_COLUMNS:
+                arrays.append(pa.repeat(pa.scalar(value, pa.string()), n))
+            elif value is None:
+                arrays.append(pa.nulls(n, pa.float64()))
+            elif np.ndim(value) == 0:
+                arrays.append(pa.array(np.full(n, value, dtype = float)))
+            else:
+                arrays.append(pa.array(value))
+        meta['chunk'] = [self.chunk, self.rows] # where the DataSet's rows are: chunk index, first row in the chunk
+        self.batches.append(pa.RecordBatch.from_arrays(arrays, schema = self.schema))
+        self.rows += n
+        if self.rows >= self.chunk_rows:
+            self.__flush()
+
+    def __flush(self):
+        if not self.batches:
+            return
+        table = self.pa.Table.from_batches(self.batches).combine_chunks()
+        if self.file_format == 'parquet':
+            self.writer.write_table(table, row_group_size = table.num_rows)
+        else:
+            self.writer.write_batch(table.to_batches()[0])
+        self.batches, self.rows = [], 0
+        self.chunk += 1
+
+    def close(self, sets_meta: list):
+        self.__flush()
+        text = json.dumps(sets_meta, default = str)
+        if self.file_format == 'parquet':
+            self.writer.add_key_value_metadata({META_KEY: text})
+        else: # Arrow files only take metadata up front, so it's carried by an empty last batch
+            self.writer.write_batch(self.pa.RecordBatch.from_pylist([], schema = self.schema), custom_metadata = {META_KEY: text})
+        self.writer.close()
+
+
+class _ArrowReader:
+    def __init__(self, path: str, file_format: str):
+        try:
+            import pyarrow.parquet as pq
+            import pyarrow.ipc as ipc
+        except ImportError:
+            raise ImportError("Parquet and Arrow tables need pyarrow (pip install pyarrow)")
+        self.file_format = file_format
+        if file_format == 'parquet':
+            self.reader = pq.ParquetFile(path)
+            schema = self.reader.schema_arrow
+            self.sets_meta = json.loads(self.reader.metadata.metadata[META_KEY.encode()])
+        else:
+            self.source = open(path, 'rb')
+            self.reader = ipc.open_file(self.source)
+            schema = self.reader.schema
+            last = self.reader.get_batch_with_custom_metadata(self.reader.num_record_batches - 1)
+            self.sets_meta = json.loads(last[1][META_KEY.encode()])
+        self.names = [name for name in schema.names if name not in ['bank', 'set_id'] + SET_COLUMNS] # x, y and data
+        self.chunk = None # index of the chunk in data
+        self.data: dict = {} # name -> numpy column of the last chunk read
+
+    def read(self, meta: dict) -> dict:
+        chunk, first = meta['chunk']
+        count = meta['rows'][1]
+        if chunk != self.chunk: # each chunk is read and decompressed once when the DataSets are read in order
+            if self.file_format == 'parquet':
+                table = self.reader.read_row_group(chunk, columns = self.names)
+            else:
+                table = self.reader.get_batch(chunk)
+            self.data = {name: table.column(name).to_numpy(zero_copy_only = False) for name in self.names}
+            self.chunk = chunk
+        return {name: self.data[name][first:first + count].copy() for name in ['x', 'y'] + meta['state']['headers'][2:]}
+
+    def close(self):
+        if self.file_format == 'parquet':
+            self.reader.close()
+        else:
+            self.source.close()
+
+
+class _HDF5Writer:
+    """HDF5 writer: one resizable, chunked and compressed dataset per column, the per-DataSet columns in /sets.
+    DataSets are gathered until chunk_rows rows, so every HDF5 chunk is compressed once."""
+    def __init__(self, path: str, dependents: list, compression: str, chunk_rows: int):
+        try:
+            import h5py
+        except ImportError:
+            raise ImportError("HDF5 tables need h5py (pip install h5py)")
+        self.h5py = h5py
+        self.file = h5py.File(path, 'w')
+        self.chunk_rows = chunk_rows
+        self.names = ['bank', 'set_id', 'x', 'y'] + dependents
+        for name in self.names:
+            integer = name in ['bank', 'set_id']
+            self.file.create_dataset(name, (0,), maxshape = (None,), dtype = np.int32 if integer else np.float64,
+                                     chunks = (chunk_rows,), compression = compression, shuffle = True,
+                                     fillvalue = 0 if integer else np.nan)
+        self.rows = 0 # rows in the file
+        self.buffer = {name: [] for name in self.names}
+        self.buffer_rows = 0
+        self.set_rows = {name: [] for name in SET_COLUMNS}
+
+    def write(self, columns: dict, meta: dict):
+        n = len(columns['x'])
+        for name in self.names:
+            value = columns.get(name)
+            if value is None:
+                value = np.nan # a header the DataSet doesn't have
+            self.buffer[name].append(np.full(n, value) if np.ndim(value) == 0 else value)
+        for name in self.set_rows:
+            self.set_rows[name].append(columns[name])
+        self.buffer_rows += n
+        if self.buffer_rows >= self.chunk_rows:
+            self.__flush()
+
+    def __flush(self):
+        if self.buffer_rows == 0:
+            return
+        end = self.rows + self.buffer_rows
+        for name in self.names:
+            dataset = self.file[name]
+            dataset.resize((end,))
+            dataset[self.rows:end] = np.concatenate(self.buffer[name])
+            self.buffer[name] = []
+        self.rows, self.buffer_rows = end, 0
+
+    def close(self, sets_meta: list):
+        self.__flush()
+        sets = self.file.create_group('sets')
+        for name in SET_COLUMNS:
+            if name in TEXT_COLUMNS:
+                sets.create_dataset(name, data = ['' if v is None else v for v in self.set_rows[name]],
+                                    dtype = self.h5py.string_dtype())
+            else:
+                sets.create_dataset(name, data = np.array(self.set_rows[name], dtype = float))
+        self.file.attrs[META_KEY] = json.dumps(sets_meta, default = str)
+        self.file.close()
+
+
+class _HDF5Reader:
+    def __init__(self, path: str):
+        try:
+            import h5py
+        except ImportError:
+            raise ImportError("HDF5 tables need h5py (pip install h5py)")
+        self.file = h5py.File(path, 'r')
+        self.sets_meta = json.loads(self.file.attrs[META_KEY])
+        self.blocks: dict = {} # name -> (first row, rows) of the column last read, at least a chunk long
+
+    def read(self, meta: dict) -> dict:
+        start, count = meta['rows']
+        data = {}
+        for name in ['x', 'y'] + meta['state']['headers'][2:]:
+            first, block = self.blocks.get(name, (0, None))
+            if block is None or start < first or start + count > first + len(block):
+                dataset = self.file[name]
+                block = dataset[start:start + max(count, dataset.chunks[0])]
+                first = start
+                self.blocks[name] = (first, block)
+            data[name] = block[start - first:start - first + count].copy()
+        return data
+
+    def close(self):
+        self.file.close()
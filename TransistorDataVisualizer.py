@@ -1,8 +1,18 @@
 import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection, PolyCollection
+from matplotlib.lines import Line2D
+from matplotlib.artist import Artist
+from matplotlib.markers import MarkerStyle
+from matplotlib.path import Path
+import matplotlib.colors as mcolors
 from dataclasses import dataclass
 from csv import reader as csvreader
 import csv
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from TransistorDataCache import DataCache
 
 @dataclass
 class DataFile:
@@ -18,8 +28,45 @@ class DataFile:
         print("File Location: ", self.file_path)
         print(f"Miscellaneous: {self.misc}")
 
+class DtypePolicy:
+    def __init__(self, dtype = np.float32, implicit_grids: bool = True, dtypes: dict = None):
+        """How a File keeps its columns in memory. Without a DtypePolicy, every column is a full float64 array.
+
+        Input:
+            dtype: dtype of the dependent columns (header index 2 and up, e.g. the measured currents). The SMU only
+                gives about 6 significant digits, which float32 (about 7) holds at half the memory.
+            implicit_grids: if True, an independent variable column whose rows (or columns) all repeat the same sweep
+                values, i.e. the start + k*step grid, is kept as a read-only np.broadcast_to() view of those 1D values
+                instead of a full 2D array. Columns that aren't a grid (e.g. measured voltages) stay as they are.
+            dtypes: header -> dtype of the columns to keep differently from dtype, e.g. {'R': np.float64}"""
+        self.dtype = np.dtype(dtype)
+        self.implicit_grids: bool = implicit_grids
+        self.dtypes: dict = {header: np.dtype(value) for header, value in (dtypes or {}).items()}
+
+    def print(self):
+        print(f"Dependent columns: {self.dtype}  Implicit grids: {self.implicit_grids}  Overrides: {self.dtypes}")
+
+    def get_dtype(self, header: str) -> np.dtype:
+        return self.dtypes.get(header, self.dtype)
+
+
 class File:
-    def __init__(self, Datafile: DataFile):
+    default_cache: DataCache = None # set to a DataCache to have every File use it
+    default_dtype_policy: DtypePolicy = None # set to a DtypePolicy to have every File use it
+
+    def __init__(self, Datafile: DataFile, bulk_parse: bool = True, cache: DataCache = None, state: tuple = None,
+                 metadata_only: bool = False, lazy: bool = False, streaming: bool = False, dtype_policy: DtypePolicy = None):
+        """Parses the easyEXPERT csv of the DataFile.
+        If metadata_only is True, only the header rows are read (sweep type, title, intervals, shape and headers).
+        The data itself is then loaded the first time get_data() is called.
+        If lazy is True, the header rows are read the same way, but get_data() only parses the one column asked for.
+        Columns that are never asked for are never parsed, but each column that is costs a pass over the csv, so
+        only use it when few of the columns get used. (A File using a DataCache always loads all its columns.)
+        If streaming is True, the DataValue rows are read in chunks and the arrays are sized to the rows that
+        actually arrived, so a file that is still being written (or was aborted) can be plotted. Call refresh()
+        to read the rows written since. Streaming Files don't use a DataCache.
+        dtype_policy (defaults to File.default_dtype_policy) sets how the columns are kept in memory, see DtypePolicy.
+        DataCache entries are always stored at full precision."""
         assert(type(Datafile) == DataFile)
         self.m_headers = []
         self.m_title: str
@@ -28,50 +75,309 @@ class File:
         self.m_dim2_count: int
         self.m_sweep_type: str
         self.file_type: str = Datafile.file_name
+        self.file_path: str = Datafile.file_path
         self.m_datadict: dict = {}
         self.m_shape: tuple # 2D shape tuple
         self.m_intervals: dict # dim1 and dim2 intervals from 'start' to 'stop' in steps of 'step'
         self.m_intervals_info: dict
-        self.__process_csv(Datafile.file_path)
+        self.m_csv_headers: list = [] # the headers of the csv's DataName row
+        self.m_data_offset: int # file position of the first DataValue row
+        self.bulk_parse: bool = bulk_parse
+        self.cache: DataCache = cache
+        self.m_lazy: bool = lazy and not streaming and not (cache or (cache is None and File.default_cache))
+        self.m_streaming: bool = streaming
+        self.m_complete: bool = True # False if a streaming File has fewer rows than Dimension1 x Dimension2
+        self.m_incomplete_sweeps: list = [] # secondary sweep (row) indices that are missing data points
+        self.m_file_stat: tuple = None # (mtime, size) of the csv when it was read, see has_changed()
+        self.m_slicing_cache: dict = {} # ('domain', axis) -> ((a, b), index slicing tuple), see get_slicing()
+        self.slicing_hits: int = 0
+        self.slicing_misses: int = 0
+        self.m_version: int = 0 # goes up whenever the columns change, see mark_changed()
+        self.dtype_policy: DtypePolicy = dtype_policy or File.default_dtype_policy
+        if state is not None: # already parsed data, e.g. from DataBank.from_files()
+            self.import_state(*state)
+        elif streaming:
+            self.__start_stream()
+        elif metadata_only or self.m_lazy:
+            self.__process_metadata(self.file_path)
+        else:
+            self.load_data()
+        self.m_file_stat = self.__stat_file()
+
+    def has_changed(self) -> bool:
+        """Returns True if the csv's modification time or size changed since the File read it"""
+        return self.__stat_file() != self.m_file_stat
+
+    def reload(self):
+        """Re-reads the csv after it changed on disk, keeping the File's other settings.
+        Streaming Files only read the rows added since the last read (unless the file got shorter)."""
+        if self.m_streaming:
+            if os.path.getsize(self.file_path) < self.m_stream_offset: # the file was rewritten, start over
+                self.__start_stream()
+            else:
+                self.refresh()
+        elif self.m_lazy:
+            self.m_headers, self.m_datadict = [], {}
+            self.__process_metadata(self.file_path)
+        else:
+            self.load_data()
+        self.m_file_stat = self.__stat_file()
+        self.m_slicing_cache = {}
+        self.mark_changed()
+
+    def mark_changed(self):
+        """Records that the File's columns changed, so stacks built from them (see DataBank.get_stack()) are rebuilt.
+        reload(), add_column(), set_dtype_policy() and the other File methods that change the columns call it,
+        code that writes to m_datadict directly has to call it too.
+        The zero-drop tolerances and keep masks (see DataBank.get_keep_masks()) depend on the data, so they're
+        dropped from the slicing cache, while the domain slicings only depend on the grid and are kept."""
+        self.m_version += 1
+        self.m_slicing_cache = {key: value for key, value in self.m_slicing_cache.items()
+                                if key[0] not in ['tolerance', 'keep']}
+
+    def __stat_file(self) -> tuple:
+        try:
+            stat = os.stat(self.file_path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def __start_stream(self):
+        self.m_headers, self.m_datadict = [], {}
+        self.__process_metadata(self.file_path)
+        self.m_planned_dim2_count: int = self.m_dim2_count # from the Dimension2 row
+        self.m_stream_offset: int = self.m_data_offset # byte position of the first row not read yet
+        self.m_stream_buffer = np.zeros((self.m_dim1_count * self.m_dim2_count, len(self.m_csv_headers)))
+        self.m_stream_rows: int = 0 # number of rows of m_stream_buffer in use
+        self.m_stream_tentative: int = 0 # 1 if the last row in use had no newline yet, so it's read again
+        self.refresh()
+
+    def load_data(self):
+        """Parses the csv (or loads it from the cache) into m_datadict.
+        Called automatically by get_data() for Files opened with metadata_only."""
+        self.m_slicing_cache = {}
+        self.mark_changed()
+        if self.m_streaming:
+            self.refresh()
+            return
+        cache = self.cache
+        if cache is None:
+            cache = File.default_cache # (cache = False skips the default cache)
+        if cache:
+            cached = cache.load(self.file_path)
+            if cached is not None:
+                self.import_state(*cached)
+                return
+
+        stat = os.stat(self.file_path) if cache else None # to check that the csv didn't change while parsing it
+        self.m_headers, self.m_datadict = [], {}
+        if self.bulk_parse:
+            self.__process_csv(self.file_path)
+        else:
+            self.__process_csv_rows(self.file_path)
         self.__process_interval()
         self.reshape_data()
         self.__check_missing_dims()
+        if cache:
+            # with a memory-mapped cache, this swaps the freshly parsed arrays for their mapped views
+            self.import_state(*cache.store(self.file_path, *self.export_state(), stat = stat))
+        else:
+            self.__apply_dtype_policy()
 
 
     def __process_csv(self, input_file):
-        '''Scrapes all pertinent data from the easyEXPERT csv into the File object.'''
+        '''Scrapes all pertinent data from the easyEXPERT csv into the File object.
+        The header rows are read one at a time until the DataName row, then the whole
+        DataValue block is converted to a 2D float array with a single NumPy call.'''
+        with open(input_file, 'r') as csvfile:
+            self.__read_header_rows(csvfile)
+            if self.m_headers:
+                # column 0 is the 'DataValue' tag, the rest are the data columns in m_headers order
+                values = np.loadtxt(csvfile, delimiter = ',', usecols = range(1, len(self.m_headers)+1), ndmin = 2)
+                if len(values) != self.m_dim1_count * self.m_dim2_count:
+                    print(f"Warning: '{input_file}' has {len(values)} DataValue rows, but Dimension1 x Dimension2 = "
+                          f"{self.m_dim1_count * self.m_dim2_count}. Open it with streaming=True to size the data to the rows that arrived.")
+                self.__store_data_block(values, self.m_headers)
+        self.m_shape = (self.m_dim2_count, self.m_dim1_count)
+
+    def __process_metadata(self, input_file):
+        '''Reads only the header rows of the easyEXPERT csv, stopping before the first DataValue row.
+        Fills in everything but m_datadict, including the independent variable missing from the DataName row.'''
+        with open(input_file, 'r') as csvfile:
+            self.__read_header_rows(csvfile)
+            self.m_data_offset = csvfile.tell() # (the byte position, since the csv is utf-8 and read line by line)
+        self.m_csv_headers = list(self.m_headers)
+        self.m_shape = (self.m_dim2_count, self.m_dim1_count)
+        self.__process_interval()
+        self.__check_missing_dims(make_arrays = False)
+
+    def __load_column(self, key: str):
+        '''Parses and reshapes the single data column key of a lazy File into m_datadict.'''
+        if key not in self.m_csv_headers: # the independent variable __check_missing_dims() added
+            self.m_datadict[key] = self.make_meshgrid()[1]
+        else:
+            with open(self.file_path, 'r') as csvfile:
+                csvfile.seek(self.m_data_offset)
+                values = np.loadtxt(csvfile, delimiter = ',', usecols = [self.m_csv_headers.index(key)+1], ndmin = 2)
+            self.__store_data_block(values, [key])
+            self.m_datadict[key] = np.reshape(self.m_datadict[key], (self.m_dim2_count, self.m_dim1_count))
+        self.__apply_dtype_policy([key])
+
+    def iter_data_chunks(self, chunk_rows: int = 4096):
+        '''Generator that yields the DataValue rows written since the last read as (rows, columns) float arrays
+        of at most chunk_rows rows. Reading picks up where the previous call left off (m_stream_offset). A last
+        line that is missing its newline is left for next time, since the instrument may still be writing it,
+        unless it's a DataValue row with every column: easyEXPERT doesn't end a finished export with a newline.
+        Such a row is only final if it's the last of the Dimension1 x Dimension2 planned rows. Otherwise its last
+        value may be cut short, so it's yielded but m_stream_offset stays before it (m_stream_tentative is set)
+        and refresh() overwrites it with the next read.'''
+        columns = range(1, len(self.m_csv_headers)+1)
+        planned_rows = self.m_dim1_count * self.m_planned_dim2_count
+        self.m_stream_tentative = 0
+        with open(self.file_path, 'rb') as csvfile:
+            csvfile.seek(self.m_stream_offset)
+            offset = self.m_stream_offset
+            rows = self.m_stream_rows
+            lines = []
+            while True:
+                line = csvfile.readline()
+                last = not line.endswith(b'\n')
+                if last and not self.__is_full_row(line):
+                    break # end of file, or a row that's only partly written
+                if line.startswith(b'DataValue'):
+                    lines.append(line.decode())
+                    rows += 1
+                if last and rows < planned_rows:
+                    self.m_stream_tentative = 1 # the number in its last column may still be being written
+                else:
+                    offset += len(line)
+                if len(lines) == chunk_rows:
+                    yield np.loadtxt(lines, delimiter = ',', usecols = columns, ndmin = 2)
+                    self.m_stream_offset, lines = offset, []
+                if last:
+                    break
+            if lines:
+                yield np.loadtxt(lines, delimiter = ',', usecols = columns, ndmin = 2)
+            self.m_stream_offset = offset
+
+    def __is_full_row(self, line: bytes) -> bool:
+        '''Whether line is a DataValue row with a non-empty value for every data column'''
+        cells = line.split(b',')
+        return (cells[0].strip() == b'DataValue' and len(cells) == len(self.m_csv_headers)+1
+                and all(cell.strip() for cell in cells[1:]))
+
+    def refresh(self) -> int:
+        '''Reads the DataValue rows written to a streaming File's csv since the last refresh and resizes the data.
+        Only the new rows are read, plus a last row that was read before its newline was written (see
+        iter_data_chunks()), which is overwritten. Returns the number of new rows.'''
+        old_rows = self.m_stream_rows
+        pending = self.m_stream_buffer[old_rows-1].copy() if self.m_stream_tentative else None
+        self.m_stream_rows -= self.m_stream_tentative
+        for chunk in self.iter_data_chunks():
+            rows = self.m_stream_rows + len(chunk)
+            if rows > len(self.m_stream_buffer): # grow the buffer by doubling so appends stay cheap
+                buffer = np.zeros((max(rows, 2 * len(self.m_stream_buffer)), len(self.m_csv_headers)))
+                buffer[:self.m_stream_rows] = self.m_stream_buffer[:self.m_stream_rows]
+                self.m_stream_buffer = buffer
+            self.m_stream_buffer[self.m_stream_rows:rows] = chunk
+            self.m_stream_rows = rows
+        changed = self.m_stream_rows != old_rows or (pending is not None
+                                                     and not np.array_equal(pending, self.m_stream_buffer[old_rows-1]))
+        if changed or not self.m_datadict:
+            self.__fit_stream_data()
+        return self.m_stream_rows - old_rows
+
+    def __fit_stream_data(self):
+        '''Sizes m_datadict to the rows a streaming File has received: one secondary sweep (row of the 2D arrays)
+        per Dimension1 points. A secondary sweep that is only partly done is filled with NaN and listed in
+        m_incomplete_sweeps; extra sweeps beyond Dimension2 extend the secondary interval.'''
+        rows, dim1 = self.m_stream_rows, self.m_dim1_count
+        sweeps = max(1, -(-rows // dim1)) # ceiling division
+        self.m_dim2_count = sweeps
+        self.m_shape = (self.m_dim2_count, self.m_dim1_count)
+        self.m_incomplete_sweeps = [sweeps-1] if rows % dim1 or rows == 0 else []
+        self.m_slicing_cache = {}
+        self.m_complete = rows >= dim1 * self.m_planned_dim2_count
+
+        v2_name = list(self.m_intervals.keys())[1]
+        v2_info = self.m_intervals_info[v2_name]
+        v2_info['count'] = sweeps
+        v2_info['stop'] = v2_info['start'] + (sweeps-1) * v2_info['step']
+        self.m_intervals[v2_name] = v2_info['start'] + v2_info['step'] * np.arange(sweeps)
+
+        block = np.full((len(self.m_csv_headers), sweeps * dim1), np.nan)
+        block[:, :rows] = self.m_stream_buffer[:rows].T
+        self.m_datadict = {}
+        for i, header in enumerate(self.m_csv_headers):
+            self.m_datadict[header] = np.reshape(block[i], self.m_shape)
+        for header in self.m_headers:
+            if header not in self.m_datadict: # the independent variable __check_missing_dims() added
+                self.m_datadict[header] = self.make_meshgrid()[1]
+        self.__apply_dtype_policy()
+        self.mark_changed()
+
+    def __read_header_rows(self, csvfile):
+        '''Reads rows from the open csv file until (and including) the DataName row,
+        which comes directly before the DataValue entries.'''
+        while not self.m_headers: # DataName fills m_headers
+            line = csvfile.readline()
+            if not line:
+                break # no DataName row, so there is no data to read
+            row = next(csvreader([line], delimiter = ','))
+            if row:
+                self.__process_header_row(row)
+
+    def __process_csv_rows(self, input_file):
+        '''Row-by-row version of __process_csv(). Every DataValue cell is converted with float() on its own.
+        Slower, but kept around for files the bulk parser chokes on and for benchmarking.'''
         with open(input_file, 'r') as csvfile:
             reader = csvreader(csvfile, delimiter = ',') # change contents to floats
             data_idx = 0 # data row index -- which row in specifically the numerical data columns we're at
             for row in reader: # each row is a list
                 match row[0].strip():
-                    case 'PrimitiveTest':
-                        self.m_sweep_type = row[1].strip()
-                    case 'TestParameter':
-                        self.__process_TestParameters(row)
-                    case 'Dimension1':
-                        self.m_dim1_count = int(row[1])
-                    case 'Dimension2':
-                        self.m_dim2_count = int(row[1])
-                    case 'AnalysisSetup':
-                        if row[1].strip() == 'Analysis.Setup.Title':
-                            self.m_title = row[2].strip()
                     case 'DataName': # This comes directly before the DataValue entries
-                        for i, header in enumerate(row):
-                            if i == 0:
-                                continue
-                            self.m_headers.append(header.strip())
-
+                        self.__process_header_row(row)
+                        for header in self.m_headers:
                             # this allocates appropriately-sized numpy arrays for the data
-                            self.m_datadict[header.strip()] = np.zeros( self.m_dim1_count * self.m_dim2_count )
+                            self.m_datadict[header] = np.zeros( self.m_dim1_count * self.m_dim2_count )
                     case 'DataValue': # this inserts data into the appropriate data array spots
                         for i, v in enumerate(row):
                             if i == 0:
                                 continue
                             self.m_datadict[self.m_headers[i-1]][data_idx] = float(v)
                         data_idx += 1
+                    case _:
+                        self.__process_header_row(row)
         self.m_shape = (self.m_dim2_count, self.m_dim1_count)
 
+    def __process_header_row(self, row):
+        '''Handles a single non-DataValue row of the easyEXPERT csv.'''
+        match row[0].strip():
+            case 'PrimitiveTest':
+                self.m_sweep_type = row[1].strip()
+            case 'TestParameter':
+                self.__process_TestParameters(row)
+            case 'Dimension1':
+                self.m_dim1_count = int(row[1])
+            case 'Dimension2':
+                self.m_dim2_count = int(row[1])
+            case 'AnalysisSetup':
+                if row[1].strip() == 'Analysis.Setup.Title':
+                    self.m_title = row[2].strip()
+            case 'DataName':
+                for header in row[1:]:
+                    self.m_headers.append(header.strip())
+
+    def __store_data_block(self, values, headers: list):
+        """Splits a (rows, len(headers)) array of DataValue rows into the 1D m_datadict arrays.
+        Missing rows (e.g. an aborted measurement) are left as zeros, same as the row-by-row parser."""
+        point_count = self.m_dim1_count * self.m_dim2_count
+        block = np.zeros((len(headers), point_count))
+        rows = min(len(values), point_count)
+        block[:, :rows] = values[:rows].T
+        for i, header in enumerate(headers):
+            self.m_datadict[header] = block[i] # each row of block is a contiguous column of the csv
+
     def __process_TestParameters(self, row):
         """Fetches stop, start, and step/count interval information from eE (easyEXPERT) csv.
         This will then be used to construct the intervals of each dimension via process_interval()"""
@@ -134,9 +440,10 @@ class File:
         self.m_intervals = intervals
 
 
-    def __check_missing_dims(self):
+    def __check_missing_dims(self, make_arrays: bool = True):
         """This function checks to see if there are independent variables NOT in m_datadict.
-        If missing variables are found, then a 2D numpy array is created via the meshgrid."""
+        If missing variables are found, then a 2D numpy array is created via the meshgrid.
+        With make_arrays = False, only the missing header is added (used when reading metadata only)."""
         header_keys = self.m_headers 
         # header_keys may or may not contain all interval keys. This determined later on.
 
@@ -150,13 +457,91 @@ class File:
             else:
                 keys[0] = interval_keys[i] # set keys[0] to the present key
         if keys[1]: # if there was an interval key that was missing from the headers keys
-            # create the missing 2D array that would go with the missing independent variable using a meshgrid
-            x, y = np.meshgrid(self.m_intervals[interval_keys[0]], self.m_intervals[interval_keys[1]])
-            # and add it to the m_headers as the 2nd independent variable
+            # add it to the m_headers as the 2nd independent variable
             self.m_headers.insert(1, keys[1])
-            self.m_datadict[keys[1]] = y
+            if make_arrays:
+                # create the missing 2D array that would go with the missing independent variable using a meshgrid
+                x, y = np.meshgrid(self.m_intervals[interval_keys[0]], self.m_intervals[interval_keys[1]])
+                self.m_datadict[keys[1]] = y
     
 
+    def export_state(self) -> tuple[dict, dict]:
+        """Returns the parsed data as a JSON-able meta dict and a dict of numpy arrays.
+        Used to store a File in a DataCache or to send it between processes; File(DF, state=...) rebuilds it."""
+        for i in range(len(self.m_headers)):
+            self.get_data(i) # loads any columns a metadata_only/lazy File hasn't loaded yet
+        meta = {'headers': self.m_headers,
+                'interval_names': list(self.m_intervals.keys()),
+                'intervals_info': self.m_intervals_info,
+                'title': getattr(self, 'm_title', None),
+                'sweep_type': getattr(self, 'm_sweep_type', None),
+                'dim1_count': self.m_dim1_count,
+                'dim2_count': self.m_dim2_count}
+        arrays = {}
+        for i, key in enumerate(self.m_headers):
+            arrays[f"data_{i}"] = self.m_datadict[key]
+        for i, key in enumerate(self.m_intervals.keys()):
+            arrays[f"interval_{i}"] = self.m_intervals[key]
+        return meta, arrays
+
+    def import_state(self, meta: dict, arrays: dict):
+        """Fills the File from the meta and arrays made by export_state()"""
+        self.m_headers = meta['headers']
+        if meta['title'] is not None:
+            self.m_title = meta['title']
+        if meta['sweep_type'] is not None:
+            self.m_sweep_type = meta['sweep_type']
+        self.m_dim1_count = meta['dim1_count']
+        self.m_dim2_count = meta['dim2_count']
+        self.m_shape = (self.m_dim2_count, self.m_dim1_count)
+        self.m_intervals_info = meta['intervals_info']
+        self.m_datadict = {key: arrays[f"data_{i}"] for i, key in enumerate(self.m_headers)}
+        self.m_intervals = {key: arrays[f"interval_{i}"] for i, key in enumerate(meta['interval_names'])}
+        self.m_slicing_cache = {}
+        self.__apply_dtype_policy()
+        self.mark_changed()
+
+    def set_dtype_policy(self, policy: DtypePolicy):
+        """Sets the File's DtypePolicy and converts the columns already loaded to it. Setting None only affects
+        columns loaded afterwards (reload() to get the csv's full precision back)."""
+        self.dtype_policy = policy
+        self.__apply_dtype_policy()
+        self.mark_changed()
+
+    def memory_bytes(self) -> int:
+        """Bytes held by the File's columns. A broadcast grid only counts its 1D interval."""
+        total = 0
+        for data in self.m_datadict.values():
+            data = np.asarray(data)
+            total += data.itemsize * int(np.prod([n for n, stride in zip(data.shape, data.strides) if stride != 0]))
+        return total
+
+    def __apply_dtype_policy(self, keys: list = None):
+        """Converts the columns in m_datadict (or only keys) to the File's DtypePolicy"""
+        policy = self.dtype_policy
+        if policy is None:
+            return
+        for key in keys if keys is not None else list(self.m_datadict.keys()):
+            data = self.m_datadict[key]
+            if key in self.m_headers[:2]:
+                if policy.implicit_grids:
+                    self.m_datadict[key] = self.__as_grid(data)
+            else:
+                self.m_datadict[key] = np.asarray(data).astype(policy.get_dtype(key), copy = False)
+        self.m_slicing_cache = {key: value for key, value in self.m_slicing_cache.items() if key[0] != 'tolerance'}
+
+    def __as_grid(self, data: np.ndarray) -> np.ndarray:
+        """Returns a grid column (one whose rows, or columns, all repeat the same values, like the start + k*step sweep
+        of an independent variable) as a broadcast view of its 1D values, or data itself if it isn't one"""
+        data = np.asarray(data)
+        if data.shape != self.m_shape or data.size == 0 or 0 in data.strides: # (already a view)
+            return data
+        if np.array_equal(data, np.broadcast_to(data[:1, :], data.shape)): # varies along the columns only
+            return np.broadcast_to(data[:1, :].copy(), data.shape)
+        if np.array_equal(data, np.broadcast_to(data[:, :1], data.shape)): # varies along the rows only
+            return np.broadcast_to(data[:, :1].copy(), data.shape)
+        return data
+
     def reshape_data(self, reverse = False):
         """Untested function, beware. It is supposed flip data along the x = y line."""
         for key in self.m_headers:
@@ -180,13 +565,14 @@ class File:
         return np.meshgrid(self.m_intervals[keys[0]], self.m_intervals[keys[1]])
     
 
-    def quick_plot3d(self, Zindex:int, connectors:bool = True):
+    def quick_plot3d(self, Zindex:int, connectors:bool = True, show:bool = True):
         """Creates a 3D plot of the data, with the Z axis selected via Zindex
 
         Input: 
             Zindex: index the Z-data will be pulled from. If 0 or 1, will be the same as X or Y data. 
                 Suggested to set Zindex to -1 or -2.
             connectors: Bool of whether to have the wireframe object automatically connect points.   
+            show: Bool of whether to plt.show() the figure. The figure is returned either way.
         """
         if Zindex >= len(self.m_headers):
             print(f"Zindex [{Zindex}] out of bounds of data with len = {len(self.m_headers)}")
@@ -205,9 +591,11 @@ class File:
         ax1.set_ylabel(self.get_data_name(1))
         ax1.set_zlabel(self.get_data_name(Zindex))
         ax1.set_title(self.get_title())
-        plt.show()
+        if show:
+            plt.show()
+        return fig
 
-    def quick_plot3d_data(self, X:list, Y:list, Z:list, connectors:bool = True):
+    def quick_plot3d_data(self, X:list, Y:list, Z:list, connectors:bool = True, show:bool = True):
         """Creates a 3D plot of the X, Y, Z data according to the combinations of (X[i,j],Y[i,j],Z[i,j]) coordinate triplets.
         X and Y are typically the product of the NumPy.meshgrid(x:1Dlist, y:1Dlist) which will return (X, Y)
         
@@ -216,6 +604,7 @@ class File:
             Y is a 2D list of values that vary row to row but not column to column
             Z is a 2D list of values that map each 
             connectors: bool of whether to have the wireframe object automatically connect points.
+            show: bool of whether to plt.show() the figure. The figure is returned either way.
         """
         fig, ax1 = plt.subplots(
             1, 1, figsize = (12, 18),
@@ -229,16 +618,40 @@ class File:
         ax1.set_ylabel(self.get_data_name(1))
         #ax1.set_zlabel()
         ax1.set_title(self.get_title())
-        plt.show()
+        if show:
+            plt.show()
+        return fig
 
     def get_data(self, index: int):
-        return self.m_datadict[self.m_headers[index]]
+        key = self.m_headers[index]
+        if key not in self.m_datadict: # opened with metadata_only or lazy
+            if self.m_lazy:
+                self.__load_column(key)
+            else:
+                self.load_data()
+        return self.m_datadict[key]
     
     def get_data_name(self, index: int):
         return self.m_headers[index]
     
     def get_headers(self):
         return self.m_headers
+
+    def get_header_index(self, name: str) -> int:
+        """Returns the header index of the data named name (e.g. 'Id' or a derived 'gm' column)"""
+        return self.m_headers.index(name)
+
+    def add_column(self, name: str, data: np.ndarray):
+        """Adds (or replaces) a derived data column, e.g. from TransistorDataExtraction.
+        The new header goes after the measured ones, so get_data(-1) is then the last column added.
+        Derived columns are dropped when the csv is reloaded."""
+        if np.shape(data) != self.m_shape:
+            raise ValueError(f"column '{name}' has shape {np.shape(data)}, not the File's {self.m_shape}")
+        if name not in self.m_headers:
+            self.m_headers.append(name)
+        self.m_datadict[name] = data
+        self.__apply_dtype_policy([name])
+        self.mark_changed()
     
     def get_interval(self, index: int):
         return self.m_intervals[self.m_headers[index]]
@@ -253,23 +666,75 @@ class File:
     def get_interval_info(self, index: int) -> dict:
         """Returns the interval_info of the data at index specified."""
         return self.m_intervals_info[self.m_headers[index]]
-    
+
+    def get_axis_info(self, axis) -> dict:
+        """Returns the {start, stop, step, count} interval_info that generates the x (x[0, :]) or y (y[:, 0]) axis,
+        or None if the axis isn't a regular sweep. The interval is matched on its values rather than its name
+        since easyEXPERT doesn't always list the intervals in the same order as the data columns.
+        The result is cached with the slicing indices until the File's data is reloaded."""
+        key = ('grid', 'x' if axis in [0, 'x'] else 'y')
+        if key in self.m_slicing_cache:
+            return self.m_slicing_cache[key]
+        values = self.get_data(0)[0, :] if axis in [0, 'x'] else self.get_data(1)[:, 0]
+        axis_info = None
+        for info in self.m_intervals_info.values():
+            if info['count'] == len(values) and np.allclose(info['start'] + info['step'] * np.arange(info['count']), values):
+                axis_info = info
+                break
+        self.m_slicing_cache[key] = axis_info
+        return axis_info
+
+    def get_sweep_info(self) -> dict:
+        """Returns the {start, stop, step, count} interval_info of each independent variable, keyed by its header:
+        {headers[0]: primary sweep (x, Dimension1), headers[1]: secondary sweep (y, Dimension2)}.
+        m_intervals_info pairs the Primary/Secondary sweep settings with the names in Channel.VName order, which
+        isn't always the sweep order (e.g. the Id-Vds tests list Vtgs first). Only needs the header rows."""
+        primary, secondary = self.m_intervals_info.values()
+        return {self.m_headers[0]: primary, self.m_headers[1]: secondary}
+
+    def get_index_range(self, axis, domain: list[float, float]) -> tuple[int, int]:
+        """Returns the same (a, b) as get_slicing() without caching it. For regular sweeps (see get_axis_info())
+        the indices come from the interval's start/step in O(1), otherwise from a searchsorted of the axis values.
+        Used on get_slicing() cache misses and by the domain sliders, where every slider position is a new domain."""
+        info = self.get_axis_info(axis)
+        if info is None or info['step'] <= 0:
+            values = self.get_data(0)[0, :] if axis in [0, 'x'] else self.get_data(1)[:, 0]
+            return (int(np.searchsorted(values, domain[0])), int(np.searchsorted(values, domain[1], side='right')))
+        count, start, step = info['count'], info['start'], info['step']
+        a = np.ceil((domain[0] - start) / step - 1e-9) # the tolerance absorbs the rounding of the csv's values
+        b = np.floor((domain[1] - start) / step + 1e-9) + 1
+        return (int(min(max(a, 0), count)), int(min(max(b, 0), count)))
+
+    def has_same_grid(self, Other) -> bool:
+        """True if Other's x/y grid is the same as this File's"""
+        return (self.m_shape == Other.m_shape and np.array_equal(self.get_data(0)[0, :], Other.get_data(0)[0, :])
+                and np.array_equal(self.get_data(1)[:, 0], Other.get_data(1)[:, 0]))
+
     def get_slicing(self, axis, domain: list[float, float]) -> tuple[int, int]:
         """Returns a tuple for index slicing to reduce the x or y axis to the domain [a, b] via x[:, a:b] or y[a:b, :]
         
         Input:  axis ->'x' or 0 or 'y' or 1 to select axis
                 domain -> [a, b] to restrict given axis to
                 
-        Ouptut: tuple for index slicing of form (a, b)"""
+        Ouptut: tuple for index slicing of form (a, b)
+        
+        The result for the last domain of each axis is cached until the File's data is reloaded, so re-plotting
+        with the same domain is free while a moving domain (e.g. a slider) doesn't grow the cache
+        (see slicing_hits/slicing_misses)."""
+        key = ('domain', 'x' if axis in [0, 'x'] else 'y' if axis in [1, 'y'] else axis)
+        cached = self.m_slicing_cache.get(key)
+        if cached is not None and cached[0] == (domain[0], domain[1]):
+            self.slicing_hits += 1
+            return cached[1]
         if axis == 0 or axis == 'x':
-            xdom = domain
-            x = self.get_data(0)
-            cols = (np.searchsorted(x[0,:], xdom[0]),    np.searchsorted(x[0, :], xdom[1], side='right'))
+            cols = self.get_index_range('x', domain)
+            self.slicing_misses += 1
+            self.m_slicing_cache[key] = ((domain[0], domain[1]), cols)
             return cols
         elif axis == 1 or axis == 'y':
-            ydom = domain
-            y = self.get_data(1)
-            rows = (np.searchsorted(y[:, 0], ydom[0]),    np.searchsorted(y[:, 0], ydom[1], side='right'))
+            rows = self.get_index_range('y', domain)
+            self.slicing_misses += 1
+            self.m_slicing_cache[key] = ((domain[0], domain[1]), rows)
             return rows
         else:
             print("Invalid axis selection. Enter either the axis index or character (ei. 'x' or 0; 'y' or 1)")
@@ -297,7 +762,155 @@ class File:
 
 
 
+def _parse_file_state(Datafile: DataFile) -> tuple[dict, dict]:
+    """Process pool worker for DataBank.from_files(). Parses the csv and returns the File's export_state().
+    The numpy arrays are sent back to the main process as raw buffers instead of Python lists."""
+    return File(Datafile, cache = False).export_state()
+
+
+class GridResampler:
+    def __init__(self, method: str = 'linear'):
+        """Resamples the data of one File onto the x/y grid of another with separable 'linear' or 'nearest'
+        interpolation, e.g. to divide sweeps taken with different step sizes.
+        For regular sweeps the fractional indices come straight from the interval's start/step, irregular axes
+        fall back to np.interp over the axis values. The weights are cached per (source grid, target grid) pair,
+        so resampling one reference onto N DataSets that share a grid computes them once."""
+        self.method: str = method
+        self.m_weights: dict = {} # (method, source grid, target grid) -> (row weights, col weights)
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def resample(self, Source: File, index, Target: File, method: str = None) -> np.ndarray:
+        """Returns Source's data at index on Target's grid (shape Target.m_shape).
+        Points of Target's grid outside of Source's sweep range are NaN, nothing is extrapolated."""
+        return self.resample_array(Source.get_data(index), Source, Target, method)
+
+    def resample_array(self, z: np.ndarray, Source: File, Target: File, method: str = None) -> np.ndarray:
+        """resample() of data z on Source's grid: a (dim2, dim1) array or an (n, dim2, dim1) stack of arrays
+        that all share Source's grid, which are then resampled together with the same weights"""
+        method = method or self.method
+        (r0, r1, wy, row_ok), (c0, c1, wx, col_ok) = self.get_weights(Source, Target, method)
+        r0, r1 = r0[:, None], r1[:, None]
+        if method == 'nearest':
+            out = z[..., r0, c0].astype(float)
+        else:
+            wy = wy[:, None]
+            out = ((z[..., r0, c0] * (1 - wx) + z[..., r0, c1] * wx) * (1 - wy)
+                   + (z[..., r1, c0] * (1 - wx) + z[..., r1, c1] * wx) * wy)
+        out[..., ~row_ok, :] = np.nan
+        out[..., :, ~col_ok] = np.nan
+        return out
+
+    def get_weights(self, Source: File, Target: File, method: str = None) -> tuple:
+        """Returns ((rows0, rows1, row_weights, row_valid), (cols0, cols1, col_weights, col_valid)) that map
+        Source's grid onto Target's, computing them only if this grid pair hasn't been seen before"""
+        method = method or self.method
+        key = (method, *self.grid_key(Source), *self.grid_key(Target))
+        if key in self.m_weights:
+            self.hits += 1
+            return self.m_weights[key]
+        self.misses += 1
+        weights = (self.__axis_weights(Source, Target, 'y', method), self.__axis_weights(Source, Target, 'x', method))
+        self.m_weights[key] = weights
+        return weights
+
+    def clear(self):
+        self.m_weights = {}
+        self.hits, self.misses = 0, 0
+
+    def grid_key(self, F: File) -> tuple:
+        """Hashable (y, x) description of F's grid, the same for every File swept on the same grid"""
+        return (self.__axis_key(F, 'y'), self.__axis_key(F, 'x'))
+
+    def __axis_values(self, F: File, axis) -> np.ndarray:
+        return F.get_data(0)[0, :] if axis == 'x' else F.get_data(1)[:, 0]
+
+    def __axis_key(self, F: File, axis):
+        """Regular axes are identified by their (start, step, count), irregular ones by their values"""
+        info = F.get_axis_info(axis)
+        if info is not None:
+            return (info['start'], info['step'], info['count'])
+        return self.__axis_values(F, axis).tobytes()
+
+    def __axis_weights(self, Source: File, Target: File, axis, method: str) -> tuple:
+        values = self.__axis_values(Source, axis)
+        target = np.asarray(self.__axis_values(Target, axis), dtype = float)
+        n = len(values)
+        tol = 1e-9 * max(1.0, float(np.max(np.abs(values))))
+        valid = (target >= np.min(values) - tol) & (target <= np.max(values) + tol)
+
+        if n == 1: # a single row/column can only be "interpolated" onto itself
+            i0 = np.zeros(len(target), dtype = int)
+            return i0, i0, np.zeros(len(target)), valid
+
+        info = Source.get_axis_info(axis)
+        if info is not None and info['step'] != 0:
+            f = (target - info['start']) / info['step'] # direct index arithmetic, no search
+        elif values[0] <= values[-1]:
+            f = np.interp(target, values, np.arange(n))
+        else:
+            f = (n - 1) - np.interp(target, values[::-1], np.arange(n))
+
+        if method == 'nearest':
+            i0 = np.clip(np.rint(f), 0, n - 1).astype(int)
+            return i0, i0, np.zeros(len(target)), valid
+        i0 = np.clip(np.floor(f), 0, n - 2).astype(int)
+        w = np.clip(f - i0, 0, 1)
+        return i0, i0 + 1, w, valid
+
+
 # @dataclass
+class CurveMarkers(Artist):
+    def __init__(self, curves: np.ndarray, colors: np.ndarray, marker: str):
+        """The markers of many curves as a single artist, e.g. of one DataSet in quick_plot2d().
+        Each curve is stamped with matplotlib's single-color marker drawing, the same as a marker-only Line2D,
+        which draws several times faster than a scatter with a color per point.
+
+        Input:
+            curves: (n_curves, n_points, 2) array of the (x, y) data points of each curve
+            colors: (n_curves, 3 or 4) color of each curve
+            marker: matplotlib marker, e.g. '.'"""
+        super().__init__()
+        self.m_marker = MarkerStyle(marker)
+        self.m_size: float = plt.rcParams['lines.markersize']
+        self.m_edge_width: float = plt.rcParams['lines.markeredgewidth']
+        self.set_zorder(Line2D.zorder)
+        self.set_data(curves, colors)
+
+    def set_data(self, curves: np.ndarray, colors: np.ndarray):
+        self.m_curves = np.asarray(curves, dtype = float)
+        self.m_colors = mcolors.to_rgba_array(colors)
+        self.stale = True
+
+    def draw(self, renderer):
+        if not self.get_visible():
+            return
+        renderer.open_group('curve_markers', self.get_gid())
+        gc = renderer.new_gc()
+        self._set_gc_clip(gc)
+        gc.set_antialiased(plt.rcParams['lines.antialiased'])
+        gc.set_joinstyle(self.m_marker.get_joinstyle())
+        gc.set_capstyle(self.m_marker.get_capstyle())
+        snap = self.m_marker.get_snap_threshold() # (as Line2D does)
+        gc.set_snap(renderer.points_to_pixels(self.m_size) >= snap if isinstance(snap, (int, float)) else snap)
+        marker_trans = self.m_marker.get_transform()
+        if self.m_marker.get_marker() == ',': # pixels aren't scaled or stroked
+            gc.set_linewidth(0)
+        else:
+            gc.set_linewidth(self.m_edge_width)
+            marker_trans = marker_trans.scale(renderer.points_to_pixels(self.m_size))
+        transform = self.get_transform()
+        for curve, color in zip(self.m_curves, self.m_colors):
+            if self.get_alpha() is not None:
+                color = mcolors.to_rgba(color, self.get_alpha())
+            gc.set_foreground(color, isRGBA = True)
+            path = transform.transform_path_non_affine(Path(curve))
+            renderer.draw_markers(gc, self.m_marker.get_path(), marker_trans, path, transform.get_affine().frozen(), color)
+        gc.restore()
+        renderer.close_group('curve_markers')
+        self.stale = False
+
+
 class DataInfo:
     def __init__(self):
         self.data_name: str = ''
@@ -338,16 +951,32 @@ class DataInfo:
 
 
 class DataSet(File):
-    def __init__(self, DataFile: DataFile):
-        super().__init__(DataFile)
+    def __init__(self, DataFile: DataFile, **kwargs):
+        super().__init__(DataFile, **kwargs) # kwargs are passed on to File (e.g. cache, lazy)
         self.Info = DataInfo()
         self.ln_style = '-'
         self.marker = '.'
         self.Info.data_name = DataFile.file_name 
+        self.misc = DataFile.misc # e.g. 'cryo' or 'post-epoxy'
         # self.title: str
         self.color = [0.5, 0.5, 0.5]
+        self.bands: dict = {} # header -> (low, high) arrays shaded around that data by quick_plot2d(), e.g. repeat run spread
         self.parse_data_name(DataFile.file_name) # 1 char, 1 char, #'s numbers (graph type, gate, item number)
 
+    @classmethod
+    def derived(cls, Base, file_path: str, misc = None, columns: dict = None):
+        """Returns a DataSet on Base's grid that isn't read from a csv, e.g. the mean of repeat runs or a comparison.
+        file_path says what it was derived from and shouldn't exist on disk, so reload_changed()/watch() never
+        replace the derived data with a csv. columns (header -> array) are its data columns after Base's x and y,
+        Base's own columns are used if it's None."""
+        meta, arrays = Base.export_state()
+        if columns is not None:
+            meta = dict(meta, headers = Base.get_headers()[:2] + list(columns))
+            arrays = {key: arrays[key] for key in ['data_0', 'data_1', 'interval_0', 'interval_1']}
+            for i, data in enumerate(columns.values()):
+                arrays[f"data_{i + 2}"] = data
+        return cls(DataFile(Base.Info.data_name, file_path, misc), state = (meta, arrays))
+
     def print(self, with_data_info = False, with_data = False):
         """Prints DataSet's information"""
         self.Info.print()
@@ -403,10 +1032,10 @@ class DataSet(File):
     
     def set_marker(self, num: int):
         markers = ['.', '3', '*', '4', 'v', 'o']
-        if num < 7:
+        if num < len(markers):
             self.marker = markers[num]
         else:
-            self.set_marker(num-6)
+            self.set_marker(num-len(markers))
 
     def set_lnstyle(self, style: str):
         self.ln_style = style
@@ -479,9 +1108,89 @@ class DataBank:
         self.connectors: bool = False
         self.Bank_Info: DataInfo = None
         self.override: bool = False
+        self.load_errors: list = [] # (index, DataFile, error) for each file from_files() couldn't load
+        self.m_stacks: dict = {} # header index -> (n_sets, dim2, dim1) array, see get_stack()
+        self.m_stack_mask: np.ndarray = None
+        self.m_stack_versions: tuple = None # File.m_version of each DataSet when the stacks were built
+        self.m_resampler: GridResampler = GridResampler() # keeps its weights between quick_div_plot3d() calls
+        self.point_budget: int = None # max points drawn per 3D figure, None for full resolution (see decimate_minmax())
+        self.m_session: PlotSession = None # see session()
+        self.dtype_policy: DtypePolicy = None # applied to the DataSets appended, see set_dtype_policy()
         if Set:
             self.append(Set)
 
+    @classmethod
+    def from_files(cls, DataFiles: list[DataFile], workers: int = None, cache: DataCache = None, override: bool = False,
+                   dtype_policy: DtypePolicy = None):
+        """Creates a DataBank from a list of DataFiles, parsing the CSVs in parallel across worker processes.
+        The DataSets are appended in the original order, so gate/graph type checks and colors/markers are
+        the same as appending them one by one. A file that fails to load is reported and skipped
+        (see DataBank.load_errors) instead of stopping the whole batch.
+
+        Input:
+            DataFiles: list of DataFiles to load
+            workers: number of worker processes. Defaults to the number of CPUs; 1 parses in this process.
+            cache: DataCache to load from/store to. Defaults to File.default_cache.
+            override: the DataBank's override setting used while appending
+            dtype_policy: the DataBank's DtypePolicy (see set_dtype_policy())
+
+        Note: on Windows, scripts calling from_files() need an `if __name__ == '__main__':` guard.
+        """
+        Bank = cls()
+        Bank.override = override
+        Bank.dtype_policy = dtype_policy
+        if cache is None:
+            cache = File.default_cache
+
+        states = [None] * len(DataFiles)
+        errors = {}
+        to_parse = [] # indices of the files that aren't in the cache
+        stats = {} # os.stat() of the files to parse, taken before parsing them (see DataCache.store())
+        for i, DF in enumerate(DataFiles):
+            try:
+                states[i] = cache.load(DF.file_path) if cache else None
+                if states[i] is None and cache:
+                    stats[i] = os.stat(DF.file_path)
+            except Exception as e:
+                errors[i] = e
+                continue
+            if states[i] is None:
+                to_parse.append(i)
+
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers == 1 or len(to_parse) <= 1:
+            for i in to_parse:
+                try:
+                    states[i] = _parse_file_state(DataFiles[i])
+                except Exception as e:
+                    errors[i] = e
+        else:
+            with ProcessPoolExecutor(max_workers = workers) as pool:
+                futures = {i: pool.submit(_parse_file_state, DataFiles[i]) for i in to_parse}
+                for i, future in futures.items():
+                    try:
+                        states[i] = future.result()
+                    except Exception as e:
+                        errors[i] = e
+
+        for i, DF in enumerate(DataFiles):
+            if i in errors:
+                continue
+            try:
+                if cache and i in to_parse:
+                    states[i] = cache.store(DF.file_path, *states[i], stat = stats[i])
+                Set = DataSet(DF, state = states[i], dtype_policy = dtype_policy)
+            except Exception as e:
+                errors[i] = e
+                continue
+            Bank.append(Set)
+
+        Bank.load_errors = [(i, DataFiles[i], errors[i]) for i in sorted(errors)]
+        for i, DF, error in Bank.load_errors:
+            print(f"Could not load DataFile #{i} '{DF.file_name}' ({DF.file_path}): {error}")
+        return Bank
+
     def change_Set_color(self, SetIndex: int, color: list[float,float,float]):
         """Method to change a DataSet at index SetIndex to the RGB input color"""
         print(f"Data Set #{SetIndex} color changed from {self.m_DataSets[SetIndex].color}")
@@ -505,6 +1214,9 @@ class DataBank:
     def append(self, Set: DataSet):
         """Method for appending DataSets to the DataBank"""
         assert(type(Set) == DataSet)
+        self.invalidate_stacks()
+        if self.dtype_policy is not None and Set.dtype_policy is not self.dtype_policy:
+            Set.set_dtype_policy(self.dtype_policy)
 
         s_count = len(self.m_DataSets)
         if s_count == 0:
@@ -574,25 +1286,43 @@ class DataBank:
             zlbl = r'Drain Current $I_D$ (mA)'
         elif zlbl == 'Iu':
             zlbl = r'Drain Current $I_D$ (μA)'
+        elif zlbl == 'gm':
+            zlbl = r'Transconductance $g_m$ (S)'
+        elif zlbl == 'gds':
+            zlbl = r'Output Conductance $g_{ds}$ (S)'
+        elif zlbl == 'SS':
+            zlbl = r'Subthreshold Swing $SS$ (mV/dec)'
+        elif zlbl == 'Rsheet':
+            zlbl = r'Sheet Resistance $R_{sh}$ (Ω/□)'
         lbls = [xlbl, ylbl, zlbl]
         return lbls
 
     
 
-    def quick_plot3d(self, Zindex = -1):
+    def quick_plot3d(self, Zindex = -1, ax = None, point_budget: int = None, show: bool = True):
         """Displays a 3D plot of the DataBank's contents with 
         user-set domain restriction, potential auto-labeling, and possible connectors.
+        If a 3D axes ax is given, the plot is drawn into it instead of a new figure and isn't shown.
+        Returns the figure, which isn't shown if show is False (e.g. to save it with fig.savefig()).
+        If point_budget (or the DataBank's point_budget) is set, the figure is drawn with at most that many points,
+        split evenly between the DataSets, see decimate_minmax(). Domains small enough to fit are drawn in full.
+        A budget too small for 4 points per curve is exceeded with a warning (see get_budget_cols()).
         """
-
-        fig, ax1 = plt.subplots(
-            1, 1, 
-            # figsize = (12, 18),
-            subplot_kw={'projection': '3d'})
+        if point_budget is None:
+            point_budget = self.point_budget
+        if ax is None:
+            fig, ax1 = plt.subplots(
+                1, 1, 
+                # figsize = (12, 18),
+                subplot_kw={'projection': '3d'})
+        else:
+            ax1 = ax
         
         if len(self.m_DataSets) == 0:
             print("No data loaded, empty plot generated")
-            plt.show()
-            return      
+            if ax is None and show:
+                plt.show()
+            return ax1.figure
 
         labels = [self.m_DataSets[0].get_data_name(0),
                     self.m_DataSets[0].get_data_name(1),
@@ -607,48 +1337,102 @@ class DataBank:
         ax1.set_title(self.Bank_Info.data_name)
         
         for i, S in enumerate(self.m_DataSets):
-            x, y = S.get_data(0), S.get_data(1)
-            z = S.get_data(Zindex)
             dim1, dim2 = S.m_dim1_count, S.m_dim2_count
 
-            cols = S.get_slicing('x', self.domain['x'])
-            rows = S.get_slicing('y', self.domain['y'])
-
             color = S.color
             name = S.Info.data_name
 
+            x, y, z = self.get_domain_view(S, 0), self.get_domain_view(S, 1), self.get_domain_view(S, Zindex)
+            if point_budget:
+                x, y, z = self.decimate_minmax(x, y, z, self.get_budget_cols(point_budget, z.shape[0]), self.connectors)
+                dim1 = z.shape[1]
+
             if self.connectors:
                 col_counts = dim1
             else:
                 col_counts = 0
 
-            ax1.plot_wireframe( x[ rows[0]:rows[1], cols[0]:cols[1] ],
-                                y[ rows[0]:rows[1], cols[0]:cols[1] ],
-                                z[ rows[0]:rows[1], cols[0]:cols[1] ], 
+            ax1.plot_wireframe( x, y, z,
                                 rcount=dim2, 
                                 ccount= col_counts,
                                 color = color,
                                 label = name)
 
-        plt.show()
-        
-
-
-    def quick_div_plot3d(self, DivSet: DataSet, divIdx, drop_zeros=True, tolerance: float = -1, Zindex=-1):
+        if ax is None and show:
+            plt.show()
+        return ax1.figure
+
+
+    def get_budget_cols(self, point_budget: int, curve_count: int) -> int:
+        """Returns the columns each of the curve_count curves of a DataSet gets when point_budget is split evenly
+        between the DataSets (see quick_plot3d()). The budget is only a rendering hint: if it leaves fewer than the 4
+        columns decimate_minmax() keeps, 4 are used and a warning says the budget is exceeded."""
+        max_cols = point_budget // (len(self.m_DataSets) * max(curve_count, 1))
+        if max_cols < 4:
+            warnings.warn(f"a point budget of {point_budget} leaves {max_cols} points per curve for {len(self.m_DataSets)} "
+                          f"DataSets of {curve_count} curves. Drawing 4 per curve (the first, last, smallest and largest), "
+                          f"which exceeds the budget.", stacklevel = 3)
+            max_cols = 4
+        return max_cols
+
+    def decimate_minmax(self, x: np.ndarray, y: np.ndarray, z: np.ndarray, max_cols: int,
+                        shared_cols: bool = False) -> tuple:
+        """Reduces the x, y, z arrays to at most max_cols columns along the primary sweep: the first and last, and
+        the points where z is smallest and largest in each of (max_cols - 2) // 2 buckets of columns, in sweep order,
+        so the extremes and knees of every curve survive. Raises a ValueError if max_cols is below 4.
+        Rows can keep different columns, so x and y are gathered with z. Arrays that already fit are returned as is.
+        With shared_cols, every row keeps the same columns so column k is still one point of the secondary sweep
+        (needed to draw connectors): the union of the rows' columns, or if that's more than max_cols, the first, the
+        last and the columns that are an extreme of the most rows."""
+        n = z.shape[1]
+        if n <= max_cols:
+            return x, y, z
+        if max_cols < 4:
+            raise ValueError(f"a point budget of {max_cols} points per curve is too small for min/max decimation, "
+                             f"which keeps at least 4 (the first, last, smallest and largest). Raise the point_budget.")
+        size = int(np.ceil(n / ((max_cols - 2) // 2)))
+        buckets = int(np.ceil(n / size))
+        pad = buckets * size - n
+        zmin = np.pad(np.where(np.isnan(z), np.inf, z), ((0, 0), (0, pad)), constant_values = np.inf)
+        zmax = np.pad(np.where(np.isnan(z), -np.inf, z), ((0, 0), (0, pad)), constant_values = -np.inf)
+        imin = np.argmin(zmin.reshape(len(z), buckets, size), axis = 2)
+        imax = np.argmax(zmax.reshape(len(z), buckets, size), axis = 2)
+        idx = np.sort(np.stack([imin, imax], axis = 2), axis = 2) + (np.arange(buckets) * size)[None, :, None]
+        idx = np.minimum(idx.reshape(len(z), 2 * buckets), n - 1)
+        ends = np.ones((len(z), 1), dtype = int)
+        idx = np.hstack([0 * ends, idx, (n - 1) * ends])
+        if not shared_cols:
+            return tuple(np.take_along_axis(a, idx, axis = 1) for a in (x, y, z))
+        cols, counts = np.unique(idx, return_counts = True) # (cols[0] and cols[-1] are the ends)
+        if len(cols) > max_cols:
+            inner = np.argsort(-counts[1:-1], kind = 'stable')[:max_cols - 2] + 1
+            cols = np.sort(np.concatenate([cols[[0, -1]], cols[inner]]))
+        return tuple(a[:, cols] for a in (x, y, z))
+
+    def quick_div_plot3d(self, DivSet: DataSet, divIdx, drop_zeros=True, tolerance: float = -1, Zindex=-1,
+                         resample: str = 'linear', ax = None, show: bool = True):
         """Displays a 3D plot of the DataBank's contents relative to the dividing DataSet. 
+        DataSets on a different x/y grid than DivSet get DivSet's data resampled onto their grid
+        ('linear' or 'nearest', see GridResampler). With resample=None they are skipped instead.
+        If a 3D axes ax is given, the plot is drawn into it instead of a new figure and isn't shown.
+        Returns the figure, which isn't shown if show is False.
         """
         
         div_data_dims = (DivSet.m_dim1_count, DivSet.m_dim2_count)
 
-        fig, ax1 = plt.subplots(
-            1, 1, 
-            # figsize = (12, 18),
-            subplot_kw={'projection': '3d'})
+        if ax is None:
+            fig, ax1 = plt.subplots(
+                1, 1, 
+                # figsize = (12, 18),
+                subplot_kw={'projection': '3d'})
+        else:
+            ax1 = ax
         
         if len(self.m_DataSets) == 0:
             print("No data loaded, empty plot generated")
-            plt.show()
-            return
+            if ax is None and show:
+                plt.show()
+            return ax1.figure
 
         labels = [self.m_DataSets[0].get_data_name(0),
                   self.m_DataSets[0].get_data_name(1),
@@ -668,30 +1452,40 @@ class DataBank:
         for i, S in enumerate(self.m_DataSets):
             S_data_dims = (S.m_dim1_count, S.m_dim2_count)
 
-            # if dimensinos mismatch, omit the data set
-            if S_data_dims != div_data_dims:
+            if S.has_same_grid(DivSet):
+                zdiv = DivSet.get_data(divIdx)
+            elif resample:
+                # points of S's grid outside DivSet's sweep come back as NaN (and get dropped with the zeros)
+                zdiv = self.m_resampler.resample(DivSet, divIdx, S, resample)
+            else:
+                # if the grids mismatch, omit the data set
                 print(f"DataSet at index ({i}) does not have matching x,y array dimensions of the dividing DataSet")
                 print(f"\t{S_data_dims} =/= {div_data_dims}")
                 print(f"Skipping DataSet ({i}) in DataBank")
                 # add a "skipped DataSets" list here to keep track of for labelling later down the line
                 continue
 
-            zdiv = DivSet.get_data(divIdx)
             x = S.get_data(0)
             y = S.get_data(1)
             z = S.get_data(Zindex)
+
+            # the domain's index ranges on S's full grid, from S's slicing cache
+            cols = S.get_slicing('x', self.domain['x'])
+            rows = S.get_slicing('y', self.domain['y'])
             if drop_zeros:
-                zdiv, x, y, z = self.drop_zeros([zdiv, x, y, z], tolerance)
+                keep_rows, keep_cols = self.get_keep_masks(DivSet, divIdx, tolerance, S, resample)
+                keep_rows = keep_rows & self.__range_mask(rows, len(keep_rows))
+                keep_cols = keep_cols & self.__range_mask(cols, len(keep_cols))
+                zdiv, x, y, z = self.apply_keep_masks([zdiv, x, y, z], keep_rows, keep_cols)
+            else:
+                zdiv, x, y, z = [a[ rows[0]:rows[1], cols[0]:cols[1] ] for a in (zdiv, x, y, z)]
 
             dim1s.append(S.m_dim1_count)
             dim2s.append(S.m_dim2_count)
 
-            cols = self.get_slicing('x', self.domain['x'], x)
-            rows = self.get_slicing('y', self.domain['y'], y)
-
-            X.append(x[ rows[0]:rows[1], cols[0]:cols[1] ])
-            Y.append(y[ rows[0]:rows[1], cols[0]:cols[1] ])
-            Z.append(z[ rows[0]:rows[1], cols[0]:cols[1] ] / zdiv[ rows[0]:rows[1], cols[0]:cols[1] ])
+            X.append(x)
+            Y.append(y)
+            Z.append(z / zdiv)
 
             colors.append( S.color )
             names.append( S.Info.data_name )
@@ -707,8 +1501,59 @@ class DataBank:
                                 ccount=col_counts,
                                 color = colors[i],
                                 label = names[i])#cstride=file.m_dim2_count)
-        plt.show()
+        if ax is None and show:
+            plt.show()
+        return ax1.figure
     
+    def reload_changed(self) -> list[int]:
+        """Re-reads the csvs of the DataSets whose files changed (modification time or size) since they were read.
+        Unchanged DataSets keep their data, so this only costs as much as the changed files.
+        Returns the indices of the reloaded DataSets."""
+        changed = []
+        for i, S in enumerate(self.m_DataSets):
+            if S.has_changed():
+                try:
+                    S.reload()
+                except Exception as e: # e.g. the file is caught half-exported, try again next time
+                    print(f"Could not reload DataSet #{i} ({S.file_path}): {e}")
+                    continue
+                changed.append(i)
+        if changed:
+            self.invalidate_stacks()
+        return changed
+
+    def watch(self, plot: str = '3d', interval: float = 2.0, Zindex = -1, x_idx = 'x', cycles: int = None):
+        """Plots the DataBank and keeps the figure up to date while its csvs get re-exported.
+        Every interval seconds the DataSets' files are checked and only the changed ones are re-read
+        (see reload_changed()), then the same figure is redrawn. Stops once the figure is closed
+        (or after cycles checks) and returns the figure.
+
+        Input:
+            plot: '3d' for quick_plot3d(Zindex) or '2d' for quick_plot2d(x_idx, Zindex)
+            interval: seconds between checks for changed files
+        """
+        if plot == '3d':
+            fig, ax1 = plt.subplots(1, 1, subplot_kw={'projection': '3d'})
+            draw = lambda: self.quick_plot3d(Zindex, ax = ax1)
+        elif plot == '2d':
+            fig, ax1 = plt.subplots(1, figsize = (6, 4))
+            draw = lambda: self.quick_plot2d(x_idx, Zindex, ax = ax1)
+        else:
+            print(f"Invalid plot '{plot}'. Choose from '3d' or '2d'.")
+            return None
+
+        draw()
+        plt.show(block = False)
+        count = 0
+        while plt.fignum_exists(fig.number) and (cycles is None or count < cycles):
+            plt.pause(interval)
+            if self.reload_changed():
+                ax1.cla()
+                draw()
+                fig.canvas.draw_idle()
+            count += 1
+        return fig
+
     def print_indices(self):   
         '''Prints off indices of the corresponding axis label'''     
         for i, S in enumerate(self.m_DataSets):
@@ -755,9 +1600,103 @@ class DataBank:
     def pop(self, i:int =-1) -> DataSet:
         """Akin to str pop method. If len(m_DataSets) becomes 0, Bank_Info resets to None type"""
         S = self.m_DataSets.pop(i)
+        self.invalidate_stacks()
         if len(self.m_DataSets) == 0:
             self.Bank_Info: DataInfo = None
         return S
+
+    def get_stack(self, index = -1, domain: bool = False) -> np.ndarray:
+        """Returns the data at index of every DataSet as one contiguous (n_sets, dim2, dim1) array, so math
+        across devices (ratios, normalization, reductions like np.nanmax(stack, axis=0)) is a single numpy operation.
+        DataSets whose x/y grid doesn't match the first DataSet's are left as NaN; see get_stack_mask().
+        The stack is built the first time it's asked for and reused until DataSets are appended or popped, or the
+        columns of one of them change (reload(), add_column(), set_dtype_policy(), see File.mark_changed()).
+
+        Input:
+            index: header index of the data to stack, same as DataSet.get_data()
+            domain: if True, returns a view restricted to the DataBank's domain"""
+        if len(self.m_DataSets) == 0:
+            return np.zeros((0, 0, 0))
+        self.__check_stacks()
+        key = index % len(self.m_DataSets[0].get_headers())
+        if key not in self.m_stacks:
+            mask = self.get_stack_mask()
+            columns = [S.get_data(key) if mask[i] else None for i, S in enumerate(self.m_DataSets)]
+            # float32 DataSets (see DtypePolicy) give a float32 stack
+            dtype = np.result_type(*[data.dtype for data in columns if data is not None] + [np.float32])
+            stack = np.full((len(self.m_DataSets),) + self.m_DataSets[0].m_shape, np.nan, dtype = dtype)
+            for i, data in enumerate(columns):
+                if data is not None:
+                    stack[i] = data
+            self.m_stacks[key] = stack
+            self.m_stack_versions = self.__stack_versions() # (loading a metadata_only DataSet counts as a change)
+        stack = self.m_stacks[key]
+        if domain:
+            cols = self.m_DataSets[0].get_slicing('x', self.domain['x'])
+            rows = self.m_DataSets[0].get_slicing('y', self.domain['y'])
+            return stack[:, rows[0]:rows[1], cols[0]:cols[1]]
+        return stack
+
+    def get_stack_mask(self) -> np.ndarray:
+        """Returns a bool array that is True for the DataSets that share the first DataSet's x/y grid
+        (and so have their data in get_stack())"""
+        self.__check_stacks()
+        if self.m_stack_mask is None:
+            ref = self.m_DataSets[0] if self.m_DataSets else None
+            mask = np.zeros(len(self.m_DataSets), dtype = bool)
+            for i, S in enumerate(self.m_DataSets):
+                mask[i] = S.has_same_grid(ref)
+            self.m_stack_mask = mask
+        return self.m_stack_mask
+
+    def get_stack_grid(self, domain: bool = False) -> tuple[np.ndarray, np.ndarray]:
+        """Returns the 2D x, y grid shared by the stacked DataSets (the first DataSet's)"""
+        x, y = self.m_DataSets[0].get_data(0), self.m_DataSets[0].get_data(1)
+        if domain:
+            cols = self.m_DataSets[0].get_slicing('x', self.domain['x'])
+            rows = self.m_DataSets[0].get_slicing('y', self.domain['y'])
+            return x[rows[0]:rows[1], cols[0]:cols[1]], y[rows[0]:rows[1], cols[0]:cols[1]]
+        return x, y
+
+    def get_domain_view(self, Set: DataSet, index) -> np.ndarray:
+        """Returns the Set's data at index restricted to the DataBank's domain, as a view.
+        The slicing indices come from the Set's cache, so re-plots with the same domain skip the searchsorted."""
+        cols = Set.get_slicing('x', self.domain['x'])
+        rows = Set.get_slicing('y', self.domain['y'])
+        return Set.get_data(index)[ rows[0]:rows[1], cols[0]:cols[1] ]
+
+    def slice_cache_stats(self) -> dict:
+        """Returns the domain slicing cache hits and misses summed over the DataBank's DataSets"""
+        return {'hits': sum(S.slicing_hits for S in self.m_DataSets),
+                'misses': sum(S.slicing_misses for S in self.m_DataSets)}
+
+    def set_dtype_policy(self, policy: DtypePolicy):
+        """Sets the DtypePolicy of every DataSet, and of the DataSets appended from now on
+        (e.g. DtypePolicy() for float32 data and implicit grids, about a fifth of the memory of an Id-Vds sweep)"""
+        self.dtype_policy = policy
+        for S in self.m_DataSets:
+            S.set_dtype_policy(policy)
+        self.invalidate_stacks()
+
+    def memory_bytes(self) -> int:
+        """Bytes held by the columns of the DataSets and by the stacks of get_stack()"""
+        return sum(S.memory_bytes() for S in self.m_DataSets) + sum(stack.nbytes for stack in self.m_stacks.values())
+
+    def invalidate_stacks(self):
+        """Drops the stacks built by get_stack() so they get rebuilt from the current DataSets"""
+        self.m_stacks = {}
+        self.m_stack_mask = None
+        self.m_stack_versions = None
+
+    def __stack_versions(self) -> tuple:
+        return tuple(S.m_version for S in self.m_DataSets)
+
+    def __check_stacks(self):
+        """Drops the stacks if a DataSet's columns changed since they were built"""
+        if self.m_stack_versions is not None and self.m_stack_versions != self.__stack_versions():
+            self.invalidate_stacks()
+        if self.m_stack_versions is None:
+            self.m_stack_versions = self.__stack_versions()
     
     def create_projection_mapping(self, X2: list):
         """creates a dictionary of valid column indices as keys and
@@ -775,20 +1714,19 @@ class DataBank:
         return meta_col_data, meta_color_data
 
 
-    def quick_plot2d(self, x_idx, y_idx):
+    def quick_plot2d(self, x_idx, y_idx, ax = None, batched: bool = True, show: bool = True):
         """Given the selected independent x-axis and dependent y-axis, generate a 2D plot projected
             onto the second independent x2-axis, representing x2 via greyscaling.
         Input: 
             x_idx = 'x'/'y' or 0/1 and will select data for x-axis of 2D plot
             y_idx = 2/3/-1 and will select data for y-axis of 2D plot
                   the non-selected independent axis will be represented via sidebar 
+            ax = optional axes to draw into instead of a new figure (the plot isn't shown then)
+            batched = if True, each DataSet is drawn as one LineCollection (one scatter when x_idx is 'y')
+                  instead of one artist per curve, which draws much faster on big banks
+            show = if False, the figure isn't shown. The figure is returned either way, empty if the DataBank is.
             hint: to know which index correpsonds to what header, use the get_indices() method    
         """
-        if len(self.m_DataSets) == 0:
-            print("No data loaded, empty plot generated")
-            plt.show()
-            return
-
         if x_idx in [0, 'x']:
             x_idx = [0, 'x']
             x2_idx = [1, 'y']
@@ -799,11 +1737,20 @@ class DataBank:
             print(" Error: Invalid x_idx, choose from 0/'x' or 1/'y'")
             return
 
-        fig, ax1 = plt.subplots(
-            1, figsize = (6, 4))
+        if ax is None:
+            fig, ax1 = plt.subplots(
+                1, figsize = (6, 4))
+        else:
+            ax1 = ax
+
+        if len(self.m_DataSets) == 0:
+            print("No data loaded, empty plot generated")
+            if ax is None and show:
+                plt.show()
+            return ax1.figure
 
         X, X2, Y = [], [], []
-        markers, colors, names = [], [], []
+        markers, colors, names, bands = [], [], [], []
         # line_names = []  
 
         labels = [self.m_DataSets[0].get_data_name(x_idx[0]),
@@ -818,27 +1765,9 @@ class DataBank:
         ax1.set_title(self.Bank_Info.data_name)
 
         for S in self.m_DataSets:
-            x: list = S.get_data(x_idx[0])
-            x2: list= S.get_data(x2_idx[0])
-            y: list = S.get_data(y_idx)
-            
-            if x2_idx[0]: # if x2_idx is the 2nd indep variable (corresponding to y axis in 3d plot)
-                cols = S.get_slicing(x_idx[0], self.domain[x_idx[1]]) # x vars by columns
-                rows = S.get_slicing(x2_idx[0], self.domain[x2_idx[1]]) # y vars by rows
-                x2 = x2[ rows[0]:rows[1], 0 ]
-                x = x[ 0, cols[0]:cols[1] ]
-                y = y[ rows[0]:rows[1], cols[0]:cols[1] ]
-                rc_reversal = False # the order of rows and columns is preserved
-            else:
-                # x varies by columns and y varies by rows, so if x_idx == 'y' and x2_idx == 'x'
-                #   then the row and column slicing must be swapped accordingly.
-                rows = S.get_slicing(x_idx[0], self.domain[x_idx[1]]) 
-                cols = S.get_slicing(x2_idx[0], self.domain[x2_idx[1]]) 
-                x2 = x2[ 0, cols[0]: cols[1] ]
-                x = x[ rows[0]:rows[1], 0 ]
-                y = y[ rows[0]:rows[1], cols[0]:cols[1] ]
-                rc_reversal = True # the order of rows and columns is flipped
+            x, x2, y, rc_reversal = self.get_projection_data(S, x_idx, x2_idx, y_idx)
             dim1, dim2, ydim = len(x), len(x2), len(y)
+            band = self.get_projection_band(S, x_idx, x2_idx, y_idx)
 
             X.append( x )
             X2.append(x2)
@@ -850,8 +1779,21 @@ class DataBank:
                 markers.append(S.marker)
             colors.append(np.array(S.color))
             names.append(S.Info.data_name)
+            bands.append(band)
 
         meta_col_data, meta_color_data = self.create_projection_mapping(X2)
+        for s in range(len(X)):
+            if bands[s] is not None:
+                self.__draw_projection_band(ax1, X[s], bands[s], meta_color_data[s][:, None] * colors[s][None, :], rc_reversal)
+
+        if batched:
+            for s in range(len(X)):
+                self.__draw_projection_batch(ax1, X[s], Y[s], meta_color_data[s][:, None] * colors[s][None, :],
+                                             markers[s], rc_reversal)
+            ax1.autoscale_view()
+            if ax is None and show:
+                plt.show()
+            return ax1.figure
     
         for col, sets in meta_col_data.items():
             for s in sets:
@@ -864,7 +1806,111 @@ class DataBank:
                                 color = meta_color_data[s][col] * colors[s], 
                                 marker = markers[s])
                                 #marker='.')
-        plt.show()
+        if ax is None and show:
+            plt.show()
+        return ax1.figure
+
+    def get_projection_data(self, S: DataSet, x_idx: list, x2_idx: list, y_idx) -> tuple:
+        """Returns (x, x2, y, rc_reversal) of S restricted to the DataBank's domain for quick_plot2d():
+        the 1D x-axis values, the 1D values of the collapsed axis x2, the 2D y data and whether the rows and
+        columns of y are reversed (the curves are its columns instead of its rows).
+        x_idx and x2_idx are the [index, char] pairs of the axes, e.g. [0, 'x'] and [1, 'y']"""
+        x: list = S.get_data(x_idx[0])
+        x2: list= S.get_data(x2_idx[0])
+        y: list = S.get_data(y_idx)
+        
+        if x2_idx[0]: # if x2_idx is the 2nd indep variable (corresponding to y axis in 3d plot)
+            cols = S.get_slicing(x_idx[0], self.domain[x_idx[1]]) # x vars by columns
+            rows = S.get_slicing(x2_idx[0], self.domain[x2_idx[1]]) # y vars by rows
+            x2 = x2[ rows[0]:rows[1], 0 ]
+            x = x[ 0, cols[0]:cols[1] ]
+            y = y[ rows[0]:rows[1], cols[0]:cols[1] ]
+            rc_reversal = False # the order of rows and columns is preserved
+        else:
+            # x varies by columns and y varies by rows, so if x_idx == 'y' and x2_idx == 'x'
+            #   then the row and column slicing must be swapped accordingly.
+            rows = S.get_slicing(x_idx[0], self.domain[x_idx[1]]) 
+            cols = S.get_slicing(x2_idx[0], self.domain[x2_idx[1]]) 
+            x2 = x2[ 0, cols[0]: cols[1] ]
+            x = x[ rows[0]:rows[1], 0 ]
+            y = y[ rows[0]:rows[1], cols[0]:cols[1] ]
+            rc_reversal = True # the order of rows and columns is flipped
+        return x, x2, y, rc_reversal
+
+    def get_projection_band(self, S: DataSet, x_idx: list, x2_idx: list, y_idx) -> tuple:
+        """Returns the (low, high) band of S's y_idx data (see DataSet.bands) restricted to the DataBank's domain
+        the same way as get_projection_data(), or None if S has no band for it"""
+        band = S.bands.get(S.get_data_name(y_idx))
+        if band is None:
+            return None
+        if x2_idx[0]:
+            cols = S.get_slicing(x_idx[0], self.domain[x_idx[1]])
+            rows = S.get_slicing(x2_idx[0], self.domain[x2_idx[1]])
+        else:
+            rows = S.get_slicing(x_idx[0], self.domain[x_idx[1]])
+            cols = S.get_slicing(x2_idx[0], self.domain[x2_idx[1]])
+        return tuple(b[ rows[0]:rows[1], cols[0]:cols[1] ] for b in band)
+
+    def get_wireframe_segments(self, x: np.ndarray, y: np.ndarray, z: np.ndarray, connectors: bool = False) -> list:
+        """Returns the lines plot_wireframe() draws for x, y, z with rcount=rows and ccount=cols (or 0 without
+        connectors) as a list of (n, 3) arrays, so an existing Line3DCollection can be updated with set_segments()"""
+        points = np.stack([x, y, z], axis = 2)
+        segments = list(points)
+        if connectors:
+            segments += list(points.transpose(1, 0, 2))
+        return segments
+
+    def session(self, plot: str = '3d', Zindex = -1, x_idx = 'x', blit: bool = True):
+        """Returns the DataBank's PlotSession for plot ('3d' or '2d'), creating it if there isn't an open one.
+        See PlotSession"""
+        if self.m_session is None or not self.m_session.is_open() or self.m_session.plot != plot:
+            self.m_session = PlotSession(self, plot, Zindex, x_idx, blit)
+        else:
+            self.m_session.update(Zindex, x_idx)
+        return self.m_session
+
+    def interactive(self, plot: str = '2d', Zindex = -1, x_idx = 'x', show: bool = True):
+        """Opens the DataBank's PlotSession with x and y domain range sliders (see PlotSession.add_domain_sliders())
+        and shows it. Returns the PlotSession"""
+        P = self.session(plot, Zindex, x_idx)
+        P.add_domain_sliders()
+        if show:
+            plt.show()
+        return P
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['m_session'] = None # a figure doesn't travel to other processes (e.g. export_figures())
+        return state
+
+    def __draw_projection_batch(self, ax1, x: np.ndarray, y: np.ndarray, shades: np.ndarray, marker: str, rc_reversal: bool):
+        """Draws every curve of one DataSet of quick_plot2d(): a single LineCollection for the lines and a single
+        CurveMarkers for their markers, or a single scatter (PathCollection) if the rows and columns are reversed.
+        shades holds the greyscaled color of each curve."""
+        if rc_reversal: # one point per (row, curve) pair, the curves are the columns of y
+            point_colors = np.repeat(shades[None, :, :], len(x), axis = 0).reshape(-1, shades.shape[1])
+            ax1.scatter(np.repeat(x, y.shape[1]), y.ravel(), color = point_colors, marker = marker,
+                        s = plt.rcParams['lines.markersize'] ** 2, linewidths = plt.rcParams['lines.markeredgewidth'])
+            return
+        segments = np.empty(y.shape + (2,))
+        segments[:, :, 0] = x[None, :]
+        segments[:, :, 1] = y
+        ax1.add_collection(LineCollection(segments, colors = shades, linewidths = plt.rcParams['lines.linewidth']))
+        if marker not in [None, '', 'None', ' ']: # (the LineCollection already set the data limits)
+            ax1.add_artist(CurveMarkers(segments, shades, marker))
+
+    def __draw_projection_band(self, ax1, x: np.ndarray, band: tuple, shades: np.ndarray, rc_reversal: bool):
+        """Shades the (low, high) band around every curve of one DataSet of quick_plot2d() as a single
+        PolyCollection: one polygon per curve, along low and back along high"""
+        low, high = band
+        if rc_reversal: # the curves are the columns
+            low, high = low.T, high.T
+        polygons = np.empty((low.shape[0], 2 * len(x), 2))
+        polygons[:, :len(x), 0] = x[None, :]
+        polygons[:, :len(x), 1] = low
+        polygons[:, len(x):, 0] = x[None, ::-1]
+        polygons[:, len(x):, 1] = high[:, ::-1]
+        ax1.add_collection(PolyCollection(polygons, facecolors = shades, edgecolors = 'none', alpha = 0.25))
 
     def get_slicing(self, axis, domain: list[float, float], Array2D: np.array) -> tuple[int, int]:
         """Returns a tuple for index slicing to reduce the x or y axis to the domain [a, b] via x[:, a:b] or y[a:b, :]
@@ -902,27 +1948,420 @@ class DataBank:
         ytrimmed = y[ rows[0]:rows[1], cols[0]:cols[1] ]
         """
 
-    def drop_zeros(self, arrays: list[np.array], tolerance: float = -1)->list[np.array]:
+    def drop_zeros(self, arrays: list[np.array], tolerance: float = -1, masked: bool = False)->list[np.array]:
         """Input a list of np.arrays of the same dimensions. Finds the columns and rows that are all zero in arrays[0],
         Drops the rows/columns of the 0th element of the input array that are all zeros from all arrays in the input.
         
         Input: arrays: list[np.array] -> arrays to drop zeros from using 0th item to determine what to drop
+               masked: bool -> if True, returns np.ma.masked_arrays with the zero rows/columns masked instead
         
         Output: list[np.array] with rows/colums of zeros dropped"""
-        drop_arr = arrays[0].copy()
-        if tolerance == -1:
-            min = np.min(np.absolute(drop_arr))
-            var = np.var(drop_arr)
-            tolerance = min+var
+        keep_rows, keep_cols = self.find_zero_masks(arrays[0], tolerance)
+        return self.apply_keep_masks(arrays, keep_rows, keep_cols, masked)
 
-        drop_arr = arrays[0].copy()
-        drop_arr[np.absolute(drop_arr) <= tolerance] = 0
+    def find_zero_masks(self, array: np.array, tolerance: float = -1) -> tuple[np.ndarray, np.ndarray]:
+        """Returns the (keep_rows, keep_cols) bool masks of array, False for the rows/columns that are all zero
+        within the tolerance. NaN (e.g. outside a resampled sweep) counts as zero.
+        The default tolerance (-1) is min(|array|) + var(array)."""
+        if tolerance == -1:
+            tolerance = np.nanmin(np.absolute(array)) + np.nanvar(array)
+        nonzero = np.absolute(array) > tolerance
+        return nonzero.any(axis = 1), nonzero.any(axis = 0)
+
+    def get_keep_masks(self, DivSet: DataSet, divIdx, tolerance: float = -1, Target: DataSet = None,
+                       resample: str = 'linear') -> tuple[np.ndarray, np.ndarray]:
+        """Returns the (keep_rows, keep_cols) masks of DivSet's data at divIdx on Target's grid (DivSet's own grid
+        if Target is None), see find_zero_masks(). The default tolerance is computed once from DivSet's data.
+        Both are cached in DivSet's slicing cache, so they're dropped when DivSet is reloaded."""
+        cache = DivSet.m_slicing_cache
+        idx = divIdx % len(DivSet.get_headers())
+        if tolerance == -1:
+            if ('tolerance', idx) not in cache:
+                zdiv = DivSet.get_data(idx)
+                cache[('tolerance', idx)] = np.nanmin(np.absolute(zdiv)) + np.nanvar(zdiv)
+            tolerance = cache[('tolerance', idx)]
+
+        same_grid = Target is None or Target.has_same_grid(DivSet)
+        grid = None if same_grid else (resample, self.m_resampler.grid_key(Target))
+        key = ('keep', idx, tolerance, grid)
+        if key not in cache:
+            zdiv = DivSet.get_data(idx) if same_grid else self.m_resampler.resample(DivSet, idx, Target, resample)
+            cache[key] = self.find_zero_masks(zdiv, tolerance)
+        return cache[key]
+
+    def apply_keep_masks(self, arrays: list[np.array], keep_rows: np.ndarray, keep_cols: np.ndarray,
+                         masked: bool = False) -> list[np.array]:
+        """Restricts every array to the kept rows/columns. If both masks are one contiguous run, the results are
+        views, otherwise every array is copied with a single fancy index.
+        If masked is True, the arrays are instead returned whole as np.ma.masked_arrays (no copy of the data)."""
+        if masked:
+            mask = ~(keep_rows[:, None] & keep_cols[None, :])
+            return [np.ma.masked_array(a, mask = mask) for a in arrays]
+        rows, cols = self.__mask_to_index(keep_rows), self.__mask_to_index(keep_cols)
+        if isinstance(rows, slice) and isinstance(cols, slice):
+            return [a[rows, cols] for a in arrays]
+        index = np.ix_(np.arange(len(keep_rows))[rows], np.arange(len(keep_cols))[cols])
+        return [a[index] for a in arrays]
+
+    def __range_mask(self, index_range: tuple[int, int], length: int) -> np.ndarray:
+        """Returns a boolean mask of the given length that is True in [a, b) of index_range (a, b)"""
+        mask = np.zeros(length, dtype = bool)
+        mask[index_range[0]:index_range[1]] = True
+        return mask
+
+    def __mask_to_index(self, keep: np.ndarray):
+        """Returns a slice if the True values of keep are one contiguous run, otherwise their indices"""
+        idx = np.flatnonzero(keep)
+        if len(idx) == 0:
+            return slice(0, 0)
+        if idx[-1] - idx[0] + 1 == len(idx):
+            return slice(idx[0], idx[-1] + 1)
+        return idx
+
+
+class PlotSession:
+    def __init__(self, Bank: DataBank, plot: str = '3d', Zindex = -1, x_idx = 'x', blit: bool = True):
+        """One figure of a DataBank that stays open while exploring. update() puts the DataBank's current domain,
+        DataSets and Zindex into the existing artists (set_segments/set_data/set_offsets) instead of making a new
+        figure. Only the DataSets' artists are redrawn while the axis limits and labels stay the same, by blitting
+        on 2D plots if the backend supports it. Changed limits or labels redraw the whole figure.
+        As in quick_plot2d(), each DataSet's markers are one CurveMarkers and its error band (see DataSet.bands), if any,
+        is shaded.
+
+        Input:
+            Bank: DataBank to plot, usually through DataBank.session()
+            plot: '3d' (like quick_plot3d(Zindex)) or '2d' (like quick_plot2d(x_idx, Zindex))
+            blit: whether 2D updates may be blitted"""
+        self.Bank: DataBank = Bank
+        self.plot: str = plot
+        self.Zindex = Zindex
+        self.x_idx = x_idx
+        self.full_draws: int = 0
+        self.blits: int = 0
+        self.m_artists: dict = {} # id(DataSet) -> (DataSet, [artists])
+        self.m_full_data: dict = {} # id(DataSet) -> (key, arrays, data), see __full_data()
+        self.m_sliders: dict = {} # axis -> RangeSlider, see add_domain_sliders()
+        self.m_limits: tuple = None
+        self.m_labels: tuple = None
+        self.m_background = None
+        self.m_saving: bool = False
+        self.m_held: bool = False # limits held while dragging a slider, rescaled on release
+        if plot == '3d':
+            self.fig, self.ax = plt.subplots(1, 1, subplot_kw={'projection': '3d'})
+        elif plot == '2d':
+            self.fig, self.ax = plt.subplots(1, figsize = (6, 4))
+        else:
+            raise ValueError(f"plot '{plot}' is not '3d' or '2d'")
+        canvas = self.fig.canvas
+        self.blit: bool = blit and plot == '2d' and getattr(canvas, 'supports_blit', False) and hasattr(canvas, 'copy_from_bbox')
+        canvas.mpl_connect('draw_event', self.__on_draw)
+        canvas.mpl_connect('button_release_event', self.__on_release)
+        self.update()
 
-        zero_rows = [i for i in range(drop_arr.shape[0]) if not drop_arr[i,:].any()]
-        zero_cols = [i for i in range(drop_arr.shape[1]) if not drop_arr[:,i].any()]
+    def print(self):
+        print(f"Plot: {self.plot}  Zindex: {self.Zindex}  x_idx: {self.x_idx}  Blitting: {self.blit}")
+        print(f"DataSets drawn: {len(self.m_artists)}")
+        print(f"Full draws: {self.full_draws}  Blits: {self.blits}")
+
+    def is_open(self) -> bool:
+        return plt.fignum_exists(self.fig.number)
+
+    def show(self, block: bool = False):
+        plt.show(block = block)
+
+    def close(self):
+        plt.close(self.fig)
+
+    def savefig(self, *args, **kwargs):
+        """fig.savefig() with the DataSets included (blitted artists are left out of regular draws otherwise)"""
+        self.m_saving = True
+        animated = [artist for S, artists in self.m_artists.values() for artist in artists]
+        if self.blit:
+            animated += [artist for slider in self.m_sliders.values() for artist in self.__slider_artists(slider)]
+        for artist in animated:
+            artist.set_animated(False)
+        try:
+            self.fig.savefig(*args, **kwargs)
+        finally:
+            for artist in animated:
+                artist.set_animated(self.blit)
+            self.m_saving = False
+            self.m_background = None # the next update() draws the whole figure again
+
+    def update(self, Zindex = None, x_idx = None, draw: bool = True, rescale: bool = True):
+        """Updates the figure to the DataBank's current domain and DataSets, and to Zindex/x_idx if given.
+        With draw=False, the artists, limits and labels are updated but drawing is left to the caller.
+        With rescale=False, the axis limits are kept so the update can be blitted (used while dragging a slider)."""
+        if Zindex is not None:
+            self.Zindex = Zindex
+        if x_idx is not None:
+            self.x_idx = x_idx
+        current = {id(S): S for S in self.Bank.m_DataSets}
+        for key in list(self.m_artists):
+            if current.get(key) is not self.m_artists[key][0]: # popped DataSets
+                for artist in self.m_artists.pop(key)[1]:
+                    artist.remove()
+                self.m_full_data.pop(key, None)
+
+        limits = []
+        for S in self.Bank.m_DataSets:
+            if self.plot == '3d':
+                limits.append(self.__update_3d(S))
+            else:
+                limits.append(self.__update_2d(S))
+        limits = [l for l in limits if l is not None] # (min, max) of each axis, for every DataSet
+        if limits:
+            lows, highs = np.nanmin([l[::2] for l in limits], axis = 0), np.nanmax([l[1::2] for l in limits], axis = 0)
+            limits = tuple(float(v) for pair in zip(lows, highs) for v in pair)
+        else:
+            limits = None
+
+        if not rescale and self.m_limits is not None:
+            limits = self.m_limits
+        labels = self.__labels()
+        if not draw:
+            if limits != self.m_limits or labels != self.m_labels:
+                self.__set_labels(labels)
+                self.__set_limits(limits)
+                self.m_limits, self.m_labels = limits, labels
+        elif limits != self.m_limits or labels != self.m_labels or not self.blit or self.m_background is None:
+            self.__set_labels(labels)
+            self.__set_limits(limits)
+            self.m_limits, self.m_labels = limits, labels
+            self.fig.canvas.draw_idle()
+            self.full_draws += 1
+        else:
+            canvas = self.fig.canvas
+            canvas.restore_region(self.m_background)
+            self.__draw_artists()
+            canvas.blit(self.fig.bbox)
+            canvas.flush_events()
+            self.blits += 1
+
+    def add_domain_sliders(self):
+        """Adds x and y domain RangeSliders under the plot. Moving them sets the DataBank's domain and updates the
+        figure: the new index ranges come from index arithmetic on each DataSet's intervals and the artists get
+        views of their full resolution data, so nothing is re-sliced or re-read while dragging.
+        When blitting, the axis limits are held while a slider is dragged so only the DataSets and the sliders are
+        redrawn, and the figure is rescaled once the mouse button is released."""
+        from matplotlib.widgets import RangeSlider
+        if self.m_sliders or len(self.Bank.m_DataSets) == 0:
+            return
+        self.fig.subplots_adjust(bottom = 0.25)
+        for i, axis in enumerate(['x', 'y']):
+            values = [S.get_data(0)[0, :] if axis == 'x' else S.get_data(1)[:, 0] for S in self.Bank.m_DataSets]
+            low, high = float(min(np.nanmin(v) for v in values)), float(max(np.nanmax(v) for v in values))
+            if low == high: # a single row/column, nothing to slide
+                continue
+            domain = self.Bank.domain[axis]
+            slider_ax = self.fig.add_axes([0.25, 0.1 - 0.05 * i, 0.5, 0.03])
+            slider = RangeSlider(slider_ax, f"{axis} domain", low, high,
+                                 valinit = (max(domain[0], low), min(domain[1], high)))
+            slider.on_changed(lambda val, axis = axis: self.__on_slider(axis, val))
+            if self.blit: # the session draws the slider
+                slider.drawon = False
+                for artist in self.__slider_artists(slider):
+                    artist.set_animated(True)
+            self.m_sliders[axis] = slider
+        self.fig.canvas.draw_idle()
+
+    def __on_slider(self, axis: str, val):
+        self.Bank.set_domain(axis, val)
+        if not self.blit:
+            self.update(draw = False) # the slider redraws the figure itself
+        elif self.m_sliders[axis].drag_active:
+            self.m_held = True
+            self.update(rescale = False)
+        else: # set_val() or a click on the track
+            self.update()
+
+    def __on_release(self, event):
+        if self.m_held:
+            self.m_held = False
+            self.update()
+
+    @staticmethod
+    def __slider_artists(slider) -> list:
+        """The parts of a RangeSlider that move: the selected range, the handles and the value text"""
+        return [slider.poly, slider.valtext] + list(slider.ax.lines)
+
+    def __full_data(self, S: DataSet) -> dict:
+        """Full resolution arrays of S laid out for drawing, built once per DataSet, Zindex and x_idx
+        (and again if S is reloaded). Domain changes only take views of these."""
+        z = S.get_data(self.Zindex)
+        key = (self.plot, self.Zindex, self.x_idx, id(z))
+        cached = self.m_full_data.get(id(S))
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        if self.plot == '3d':
+            full = {'points': np.stack([S.get_data(0), S.get_data(1), z], axis = 2)}
+        elif self.x_idx in [0, 'x']: # curves are the rows of z
+            points = np.empty(z.shape + (2,))
+            points[:, :, 0] = S.get_data(0)[0, :][None, :]
+            points[:, :, 1] = z
+            full = {'points': points}
+        else: # curves are the columns of z
+            points = np.empty(z.shape + (2,))
+            points[:, :, 0] = S.get_data(1)[:, 0][:, None]
+            points[:, :, 1] = z
+            full = {'points': points}
+        self.m_full_data[id(S)] = (key, full, z) # (keeping z alive so its id can't be reused by a reloaded array)
+        return full
+
+    def __domain_ranges(self, S: DataSet) -> tuple:
+        """(rows, cols) index ranges of the DataBank's domain, by index arithmetic (see File.get_index_range())"""
+        return S.get_index_range('y', self.Bank.domain['y']), S.get_index_range('x', self.Bank.domain['x'])
+
+    def __update_3d(self, S: DataSet) -> tuple:
+        from mpl_toolkits.mplot3d.art3d import Line3DCollection
+        Bank = self.Bank
+        rows, cols = self.__domain_ranges(S)
+        points = self.__full_data(S)['points'][rows[0]:rows[1], cols[0]:cols[1]]
+        if points.size == 0:
+            segments = []
+        elif Bank.point_budget:
+            max_cols = Bank.get_budget_cols(Bank.point_budget, points.shape[0])
+            x, y, z = Bank.decimate_minmax(points[:, :, 0], points[:, :, 1], points[:, :, 2], max_cols, Bank.connectors)
+            segments = Bank.get_wireframe_segments(x, y, z, Bank.connectors)
+        else:
+            segments = list(points)
+            if Bank.connectors:
+                segments += list(points.transpose(1, 0, 2))
+        if id(S) in self.m_artists:
+            lines = self.m_artists[id(S)][1][0]
+            lines.set_segments(segments)
+            lines.set_color(S.color)
+        else:
+            lines = Line3DCollection(segments, colors = S.color, label = S.Info.data_name)
+            self.ax.add_collection3d(lines)
+            self.m_artists[id(S)] = (S, [lines])
+        if points.size == 0:
+            return None
+        return (np.nanmin(points[:, :, 0]), np.nanmax(points[:, :, 0]), np.nanmin(points[:, :, 1]), np.nanmax(points[:, :, 1]),
+                np.nanmin(points[:, :, 2]), np.nanmax(points[:, :, 2]))
+
+    def __update_2d(self, S: DataSet) -> tuple:
+        rc_reversal = self.x_idx not in [0, 'x']
+        rows, cols = self.__domain_ranges(S)
+        points = self.__full_data(S)['points'][rows[0]:rows[1], cols[0]:cols[1]]
+        if rc_reversal:
+            points = points.transpose(1, 0, 2) # one curve per column
+        curve_count = points.shape[0]
+        shades = self.Bank.create_projection_mapping([range(curve_count)])[1][0][:, None] * np.array(S.color)[None, :]
+        marker = ',' if rc_reversal and S.marker == '.' else S.marker
+        kind = 'scatter' if rc_reversal else 'lines'
+        old = self.m_artists[id(S)][1] if id(S) in self.m_artists else []
+        artists = {artist.session_kind: artist for artist in old} # kind -> artist: 'band', 'lines'/'scatter', 'markers'
+        if old and kind not in artists: # x_idx changed
+            for artist in old:
+                artist.remove()
+            artists = {}
+
+        band = self.__session_band(S, rows, cols, rc_reversal)
+        if band is None:
+            if 'band' in artists:
+                artists.pop('band').remove()
+        else:
+            polygons = np.empty((curve_count, 2 * points.shape[1], 2))
+            polygons[:, :points.shape[1], 0] = points[:, :, 0]
+            polygons[:, :points.shape[1], 1] = band[0]
+            polygons[:, points.shape[1]:, 0] = points[:, ::-1, 0]
+            polygons[:, points.shape[1]:, 1] = band[1][:, ::-1]
+            if 'band' in artists:
+                artists['band'].set_verts(polygons)
+                artists['band'].set_facecolor(shades)
+            else:
+                artists['band'] = self.ax.add_collection(PolyCollection(polygons, facecolors = shades,
+                                                                        edgecolors = 'none', alpha = 0.25))
+
+        if rc_reversal:
+            offsets = points.transpose(1, 0, 2).reshape(-1, 2)
+            point_colors = np.tile(shades, (points.shape[1], 1))
+            if 'scatter' in artists:
+                artists['scatter'].set_offsets(offsets)
+                artists['scatter'].set_color(point_colors)
+            else:
+                artists['scatter'] = self.ax.scatter(offsets[:, 0], offsets[:, 1], color = point_colors, marker = marker,
+                                                     s = plt.rcParams['lines.markersize'] ** 2,
+                                                     linewidths = plt.rcParams['lines.markeredgewidth'])
+        else:
+            if 'lines' in artists:
+                artists['lines'].set_segments(points)
+                artists['lines'].set_color(shades)
+            else:
+                artists['lines'] = self.ax.add_collection(LineCollection(points, colors = shades,
+                                                                         linewidths = plt.rcParams['lines.linewidth']))
+            if 'markers' in artists and (marker in [None, '', 'None', ' ']
+                                         or artists['markers'].m_marker.get_marker() != MarkerStyle(marker).get_marker()):
+                artists.pop('markers').remove()
+            if marker not in [None, '', 'None', ' ']: # one CurveMarkers for all the curves, as in quick_plot2d()
+                if 'markers' in artists:
+                    artists['markers'].set_data(points, shades)
+                else:
+                    artists['markers'] = self.ax.add_artist(CurveMarkers(points, shades, marker))
+        for kind, artist in artists.items():
+            artist.session_kind = kind
+            artist.set_animated(self.blit)
+        self.m_artists[id(S)] = (S, list(artists.values()))
+        if points.size == 0:
+            return None
+        y = points[:, :, 1] if band is None else np.concatenate([points[:, :, 1], band[0], band[1]])
+        return (np.nanmin(points[:, :, 0]), np.nanmax(points[:, :, 0]), np.nanmin(y), np.nanmax(y))
+
+    def __session_band(self, S: DataSet, rows: tuple, cols: tuple, rc_reversal: bool) -> tuple:
+        """The (low, high) band of S's Zindex data (see DataSet.bands) in the domain, one row per curve,
+        or None if S has no band for it"""
+        band = S.bands.get(S.get_data_name(self.Zindex))
+        if band is None:
+            return None
+        low, high = (b[rows[0]:rows[1], cols[0]:cols[1]] for b in band)
+        return (low.T, high.T) if rc_reversal else (low, high)
 
-        for i in range(len(arrays)):     
-            arrays[i] = np.delete(arrays[i], zero_rows, axis=0)
-            arrays[i] = np.delete(arrays[i], zero_cols, axis=1)   
+    def __labels(self) -> tuple:
+        if len(self.Bank.m_DataSets) == 0:
+            return None
+        S = self.Bank.m_DataSets[0]
+        if self.plot == '3d':
+            labels = [S.get_data_name(0), S.get_data_name(1), S.get_data_name(self.Zindex)]
+        else:
+            x, x2 = (0, 1) if self.x_idx in [0, 'x'] else (1, 0)
+            labels = [S.get_data_name(x), S.get_data_name(x2), S.get_data_name(self.Zindex)]
+        if self.Bank.auto_labels:
+            labels = self.Bank.make_auto_labels(labels[0], labels[1], labels[2])
+        return tuple(labels) + (self.Bank.Bank_Info.data_name,)
+
+    def __set_labels(self, labels: tuple):
+        if labels is None:
+            return
+        self.ax.set_xlabel(labels[0])
+        if self.plot == '3d':
+            self.ax.set_ylabel(labels[1])
+            self.ax.set_zlabel(labels[2])
+        else:
+            self.ax.set_ylabel(labels[2])
+        self.ax.set_title(labels[3])
 
-        return arrays
+    def __set_limits(self, limits: tuple):
+        if limits is None:
+            return
+        if self.plot == '3d':
+            self.ax.auto_scale_xyz(limits[0:2], limits[2:4], limits[4:6], had_data = False)
+        else:
+            self.ax.ignore_existing_data_limits = True
+            self.ax.update_datalim([limits[0::2], limits[1::2]])
+            self.ax.autoscale_view()
+
+    def __draw_artists(self):
+        artists = [artist for S, artists in self.m_artists.values() for artist in artists]
+        for artist in sorted(artists, key = lambda artist: artist.get_zorder()): # bands under lines under markers
+            self.ax.draw_artist(artist)
+        if self.blit:
+            for slider in self.m_sliders.values():
+                for artist in self.__slider_artists(slider):
+                    slider.ax.draw_artist(artist)
+
+    def __on_draw(self, event):
+        """After a full draw, keeps the background without the (animated) DataSet artists for blitting"""
+        if self.blit and not self.m_saving:
+            self.m_background = self.fig.canvas.copy_from_bbox(self.fig.bbox)
+            self.__draw_artists()
@@ -0,0 +1,497 @@
+# Timing comparisons for the TransistorDataVisualizer (tdv) package
+# run from the repository folder:
+#   python benchmark.py            runs every benchmark
+#   python benchmark.py parser     runs only the named benchmark(s)
+
+import os
+import sys
+import shutil
+import timeit
+import tempfile
+import numpy as np
+import TransistorDataVisualizer as tdv
+import TransistorDataExtraction as tde
+import TransistorDataAggregation as tda
+import TransistorDataComparison as tdc
+import TransistorDataTable as tdt
+import TransistorDataArchive as tar
+
+CSV_PATH = "Id-Vds var const Vtgs_n1.csv" # bundled easyEXPERT export
+REPEATS = 20
+
+
+def best_time(func, repeats: int = REPEATS) -> float:
+    """Returns the best wall time (in seconds) of func() over several repeats"""
+    return min(timeit.repeat(func, number = 1, repeat = repeats))
+
+
+def report(name: str, old: float, new: float):
+    print(f"{name}")
+    print(f"   before: {old*1e3:9.3f} ms")
+    print(f"   after:  {new*1e3:9.3f} ms")
+    print(f"   speedup: {old/new:.1f}x")
+
+
+def bench_parser():
+    """Row-by-row csv parsing vs. the bulk NumPy DataValue parser"""
+    DF = tdv.DataFile('It7', CSV_PATH) # tests/test_parser.py checks that both parsers agree
+    rows = tdv.File(DF, bulk_parse = False)
+    old = best_time(lambda: tdv.File(DF, bulk_parse = False))
+    new = best_time(lambda: tdv.File(DF))
+    report(f"File() parse of '{CSV_PATH}' ({rows.m_dim1_count * rows.m_dim2_count} points)", old, new)
+
+
+def bench_cache(entry_count: int = 200):
+    """Parsing the csv vs. loading it back from a warm DataCache holding entry_count csvs"""
+    with tempfile.TemporaryDirectory() as directory:
+        cache = tdv.DataCache(os.path.join(directory, 'cache'))
+        for i in range(entry_count): # the size of the index is what a cache hit used to pay for
+            path = os.path.join(directory, f"It7_{i}.csv")
+            shutil.copy(CSV_PATH, path)
+            tdv.File(tdv.DataFile('It7', path), cache = cache) # warms the cache
+        DF = tdv.DataFile('It7', path)
+        parsed, cached = tdv.File(DF), tdv.File(DF, cache = cache)
+        assert parsed.m_headers == cached.m_headers
+        for i in range(len(parsed.m_headers)):
+            assert np.array_equal(parsed.get_data(i), cached.get_data(i))
+        old = best_time(lambda: tdv.File(DF))
+        new = best_time(lambda: tdv.File(DF, cache = cache))
+        cache.close()
+    report(f"File() of '{CSV_PATH}' from the csv vs. from a warm DataCache of {entry_count} entries", old, new)
+
+
+def bench_ingest(file_count: int = 48):
+    """Appending DataSets one at a time vs. DataBank.from_files() with a process pool"""
+    with tempfile.TemporaryDirectory() as directory:
+        DFs = []
+        for i in range(file_count): # one copy of the bundled csv per file in TransistorDataFiles.py
+            path = os.path.join(directory, f"It7_{i}.csv")
+            shutil.copy(CSV_PATH, path)
+            DFs.append(tdv.DataFile('It7', path))
+
+        def serial():
+            B = tdv.DataBank()
+            for DF in DFs:
+                B.append(tdv.DataSet(DF))
+        old = best_time(serial, repeats = 3)
+        new = best_time(lambda: tdv.DataBank.from_files(DFs), repeats = 3)
+    report(f"Loading {file_count} csvs into a DataBank, serial vs. from_files() on {os.cpu_count()} CPU(s)", old, new)
+
+
+def bench_lazy():
+    """Loading every column of a DataSet vs. lazily loading only the columns that get used"""
+    DF = tdv.DataFile('It7', CSV_PATH)
+    # tests/test_lazy.py checks that lazy columns match the eager ones
+    old = best_time(lambda: tdv.DataSet(DF).get_data(-1))
+    new = best_time(lambda: tdv.DataSet(DF, lazy = True).get_data(-1))
+    report(f"DataSet() + get_data(-1) of '{CSV_PATH}', eager vs. lazy columns", old, new)
+
+    def plot_columns(S): # what a quick_plot3d() reads
+        return S.get_data(0), S.get_data(1), S.get_data(-1)
+    old = best_time(lambda: plot_columns(tdv.DataSet(DF)))
+    new = best_time(lambda: plot_columns(tdv.DataSet(DF, lazy = True)))
+    report(f"DataSet() + get_data() of x, y and z, eager vs. lazy columns (why lazy is opt-in)", old, new)
+
+
+def bench_index(entry_count: int = 10000):
+    """Predicate query over a DataIndex of entry_count tests vs. filtering the same records in a Python loop"""
+    import TransistorDataCatalog as cat
+    DF = tdv.DataFile('It7', CSV_PATH)
+    record = {'name': 'It7', 'gate': 'top', 'graph_type': 1, 'chan_len': 50, 'chan_wid': 50, 'chan_area': 2500,
+              'title': 'Id-Vds var const Vtgs', 'intervals_info': tdv.File(DF, metadata_only = True).get_sweep_info()}
+    Index = cat.DataIndex()
+    for i in range(entry_count):
+        Index.add_record(DF, dict(record, trans_num = i % 9, misc = ['post-epoxy', None, 'cryo', 'cryo,post-epoxy'][i % 4]))
+    Index.columns() # built once, then reused by every query
+
+    def loop():
+        return [i for i, r in enumerate(Index.m_records)
+                if r['gate'] == 'top' and r['graph_type'] == 1 and r['chan_len'] == 50 and 'post-epoxy' in (r['misc'] or '').split(',')
+                and abs(r['intervals_info']['Vds']['stop'] - r['intervals_info']['Vds']['start']) >= 10]
+    query = lambda: Index.query(gate = 'top', graph_type = 1, chan_len = 50, misc = 'post-epoxy',
+                                where = lambda c: c['Vds_span'] >= 10)
+    assert list(query()) == loop()
+    report(f"Query over {entry_count} indexed tests, Python loop vs. DataIndex.query()", best_time(loop), best_time(query))
+
+
+def bench_stack(set_count: int = 20):
+    """Normalizing every DataSet of a bank to a reference in a Python loop vs. one operation on the stacked bank"""
+    DF = tdv.DataFile('It7', CSV_PATH)
+    B = tdv.DataBank()
+    for i in range(set_count):
+        B.append(tdv.DataSet(DF))
+    B.set_domain('x', [0, 5])
+    ref = B.m_DataSets[0].get_data(-1)
+
+    def loop():
+        out = []
+        for S in B.m_DataSets:
+            cols = S.get_slicing('x', B.domain['x'])
+            rows = S.get_slicing('y', B.domain['y'])
+            z = S.get_data(-1)[rows[0]:rows[1], cols[0]:cols[1]] / ref[rows[0]:rows[1], cols[0]:cols[1]]
+            out.append(z / np.max(np.abs(z)))
+        return out
+    def stacked():
+        cols = B.m_DataSets[0].get_slicing('x', B.domain['x'])
+        rows = B.m_DataSets[0].get_slicing('y', B.domain['y'])
+        z = B.get_stack(-1, domain = True) / ref[rows[0]:rows[1], cols[0]:cols[1]]
+        return z / np.max(np.abs(z), axis = (1, 2), keepdims = True)
+    B.get_stack(-1) # built once, reused until the bank changes
+    assert np.allclose(np.array(loop()), stacked())
+    report(f"Ratio + normalization of {set_count} DataSets, per-set loop vs. DataBank.get_stack()", best_time(loop), best_time(stacked))
+
+
+def bench_slicing(set_count: int = 20):
+    """Domain views of every DataSet in a bank with a cold vs. warm slicing cache (a re-plot with a new Zindex)"""
+    DF = tdv.DataFile('It7', CSV_PATH)
+    B = tdv.DataBank()
+    for i in range(set_count):
+        B.append(tdv.DataSet(DF))
+    B.set_domain('x', [0, 5])
+    B.set_domain('y', [-2, 2])
+
+    def views(clear_cache: bool):
+        for S in B.m_DataSets:
+            if clear_cache:
+                S.m_slicing_cache = {}
+            B.get_domain_view(S, 0), B.get_domain_view(S, 1), B.get_domain_view(S, -1)
+    report(f"Domain views of {set_count} DataSets, cold vs. warm slicing cache",
+           best_time(lambda: views(True)), best_time(lambda: views(False)))
+
+
+def bench_resample(set_count: int = 20):
+    """Resampling a coarse reference onto the grid of set_count DataSets with per-row/column np.interp
+    vs. a GridResampler that computes the weights once for the grid pair"""
+    DF = tdv.DataFile('It7', CSV_PATH)
+    sets = [tdv.DataSet(DF) for i in range(set_count)]
+    meta, arrays = sets[0].export_state()
+    intervals_info = {key: dict(info) for key, info in meta['intervals_info'].items()}
+    for info in intervals_info.values():
+        if info['count'] == meta['dim1_count']: # every other point along x
+            info.update(step = 2 * info['step'], count = (info['count'] + 1) // 2)
+    meta = dict(meta, intervals_info = intervals_info, dim1_count = (meta['dim1_count'] + 1) // 2)
+    ref = tdv.DataSet(DF, state = (meta, {key: (a[:, ::2] if key.startswith('data') else a) for key, a in arrays.items()}))
+
+    def loop():
+        out = []
+        z, rx, ry = ref.get_data(-1), ref.get_data(0)[0, :], ref.get_data(1)[:, 0]
+        for S in sets:
+            x, y = S.get_data(0)[0, :], S.get_data(1)[:, 0]
+            zx = np.array([np.interp(x, rx, row) for row in z])
+            out.append(np.array([np.interp(y, ry, col) for col in zx.T]).T)
+        return out
+    def resampler():
+        R = tdv.GridResampler()
+        return [R.resample(ref, -1, S) for S in sets]
+    assert np.allclose(np.array(loop()), np.array(resampler()))
+    report(f"Resampling a reference onto {set_count} DataSets, per-row np.interp vs. GridResampler", best_time(loop), best_time(resampler))
+
+
+def bench_zeros(set_count: int = 20):
+    """Dropping the divisor's zero rows/columns for every DataSet of a quick_div_plot3d() with the previous
+    list comprehension + np.delete drop_zeros vs. the keep-masks cached per DivSet"""
+    DF = tdv.DataFile('It7', CSV_PATH)
+    B = tdv.DataBank()
+    for i in range(set_count):
+        B.append(tdv.DataSet(DF))
+    DivSet = B.m_DataSets[0]
+
+    def old_drop_zeros(arrays, tolerance = -1):
+        drop_arr = arrays[0].copy()
+        if tolerance == -1:
+            tolerance = np.min(np.absolute(drop_arr)) + np.var(drop_arr)
+        drop_arr[np.absolute(drop_arr) <= tolerance] = 0
+        zero_rows = [i for i in range(drop_arr.shape[0]) if not drop_arr[i,:].any()]
+        zero_cols = [i for i in range(drop_arr.shape[1]) if not drop_arr[:,i].any()]
+        for i in range(len(arrays)):
+            arrays[i] = np.delete(arrays[i], zero_rows, axis=0)
+            arrays[i] = np.delete(arrays[i], zero_cols, axis=1)
+        return arrays
+    def loop():
+        return [old_drop_zeros([DivSet.get_data(-1), S.get_data(0), S.get_data(1), S.get_data(-1)]) for S in B.m_DataSets]
+    def masks():
+        out = []
+        for S in B.m_DataSets:
+            keep_rows, keep_cols = B.get_keep_masks(DivSet, -1, Target = S)
+            out.append(B.apply_keep_masks([DivSet.get_data(-1), S.get_data(0), S.get_data(1), S.get_data(-1)], keep_rows, keep_cols))
+        return out
+    # tests/test_zeros.py checks that the masks drop the same rows/columns
+    report(f"Zero dropping for {set_count} DataSets divided by one DivSet, drop_zeros() per set vs. cached keep-masks",
+           best_time(loop), best_time(masks))
+
+
+def synthetic_bank(set_count: int, vds_count: int, vgs_count: int) -> tdv.DataBank:
+    """Returns a DataBank of set_count Id-Vds DataSets on a vgs_count x vds_count grid, for sweeps denser than the bundled csv"""
+    DF = tdv.DataFile('It7', CSV_PATH)
+    x, y = np.meshgrid(np.linspace(-5, 5, vds_count), np.linspace(-5, 5, vgs_count))
+    meta = {'headers': ['Vds', 'Vtgs', 'Id'], 'interval_names': ['Vds', 'Vtgs'], 'title': 'Id-Vds var const Vtgs',
+            'sweep_type': None, 'dim1_count': vds_count, 'dim2_count': vgs_count,
+            'intervals_info': {'Vds': {'start': -5.0, 'stop': 5.0, 'step': 10 / (vds_count - 1), 'count': vds_count},
+                               'Vtgs': {'start': -5.0, 'stop': 5.0, 'step': 10 / (vgs_count - 1), 'count': vgs_count}}}
+    B = tdv.DataBank()
+    for i in range(set_count):
+        z = 1e-6 * (i + 1) * np.tanh(2 * x) * np.maximum(y + 5, 0) ** 2 + 1e-8 * np.random.default_rng(i).normal(size = x.shape)
+        arrays = {'data_0': x, 'data_1': y, 'data_2': z, 'interval_0': x[0, :], 'interval_1': y[:, 0]}
+        B.append(tdv.DataSet(DF, state = (meta, arrays)))
+    return B
+
+
+def bench_lod(set_count: int = 6, vds_count: int = 4001, vgs_count: int = 21, point_budget: int = 20000):
+    """Render time (Agg canvas draw) of quick_plot3d() on dense sweeps at full resolution vs. with a point budget"""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    B = synthetic_bank(set_count, vds_count, vgs_count)
+
+    def render(budget):
+        fig, ax = plt.subplots(1, 1, subplot_kw = {'projection': '3d'})
+        B.quick_plot3d(ax = ax, point_budget = budget)
+        fig.canvas.draw()
+        plt.close(fig)
+    report(f"quick_plot3d() + draw of {set_count} DataSets x {vgs_count * vds_count} points, "
+           f"full resolution vs. point_budget={point_budget}", best_time(lambda: render(None), 3), best_time(lambda: render(point_budget), 3))
+
+
+def bench_plot2d(set_count: int = 10, vds_count: int = 201, vgs_count: int = 100):
+    """Render time (Agg canvas draw) of quick_plot2d() with one artist per curve vs. one collection per DataSet,
+    with the default '.' markers, without markers, and with x/y reversed (scatter)"""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    B = synthetic_bank(set_count, vds_count, vgs_count)
+
+    def render(x_idx, batched):
+        fig, ax = plt.subplots(1, figsize = (6, 4))
+        B.quick_plot2d(x_idx, -1, ax = ax, batched = batched)
+        fig.canvas.draw()
+        plt.close(fig)
+    for case, x_idx, marker in [("'.' markers", 'x', '.'), ("no markers", 'x', None), ("x/y reversed", 'y', '.')]:
+        for S in B.m_DataSets:
+            S.marker = marker
+        report(f"quick_plot2d('{x_idx}') + draw of {set_count} DataSets x {vgs_count} curves ({case}), one artist per curve vs. batched",
+               best_time(lambda: render(x_idx, False), 3), best_time(lambda: render(x_idx, True), 3))
+
+
+def bench_session(set_count: int = 10, vds_count: int = 201, vgs_count: int = 21, steps: int = 10):
+    """Re-plotting after each of several domain changes with a new quick_plot2d()/quick_plot3d() figure every time
+    vs. updating one PlotSession in place (Agg canvas draws)"""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    B = synthetic_bank(set_count, vds_count, vgs_count) # with the default '.' markers
+    domains = [[-5 + 0.2 * i, 5 - 0.2 * i] for i in range(steps)]
+
+    for plot in ['2d', '3d']:
+        def new_figures():
+            for domain in domains:
+                B.set_domain('x', domain)
+                fig = B.quick_plot2d('x', -1, show = False) if plot == '2d' else B.quick_plot3d(-1, show = False)
+                fig.canvas.draw()
+                plt.close(fig)
+        def session():
+            P = B.session(plot)
+            for domain in domains:
+                B.set_domain('x', domain)
+                P.update()
+        report(f"{steps} domain changes of a {plot} plot of {set_count} DataSets, new figure each time vs. PlotSession.update()",
+               best_time(new_figures, 3), best_time(session, 3))
+        B.m_session.close()
+    B.reset_domain()
+
+    full, blitted = tdv.PlotSession(B, '2d', blit = False), tdv.PlotSession(B, '2d', blit = True)
+    report(f"PlotSession.update() of a 2d plot of {set_count} DataSets with unchanged limits, full draw vs. blit",
+           best_time(full.update), best_time(blitted.update))
+    full.close()
+    blitted.close()
+
+
+def bench_sliders(set_count: int = 20, steps: int = 10):
+    """Narrowing the x domain of full resolution Id-Vds sweeps: set_domain() and a new quick_plot2d()/quick_plot3d()
+    figure per step vs. dragging the x slider of DataBank.interactive() (Agg canvas draws)"""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    DF = tdv.DataFile('It7', CSV_PATH)
+    B = tdv.DataBank()
+    for i in range(set_count):
+        B.append(tdv.DataSet(DF))
+    domains = [(-5 + 0.2 * i, 5 - 0.2 * i) for i in range(steps)]
+
+    for plot in ['2d', '3d']:
+        def new_figures():
+            for domain in domains:
+                B.set_domain('x', domain)
+                fig = B.quick_plot2d('x', -1, show = False) if plot == '2d' else B.quick_plot3d(-1, show = False)
+                fig.canvas.draw()
+                plt.close(fig)
+        P = B.interactive(plot, show = False)
+        P.fig.canvas.draw()
+        slider = P.m_sliders['x']
+        def drag():
+            slider.drag_active = True
+            for domain in domains:
+                slider.set_val(domain)
+            slider.drag_active = False
+        report(f"{steps} x domain steps of a {plot} plot of {set_count} Id-Vds sweeps, new figure each time vs. slider drag",
+               best_time(new_figures, 3), best_time(drag, 3))
+        P.close()
+        B.reset_domain()
+
+
+def bench_extract(set_count: int = 300, vds_count: int = 101, vgs_count: int = 41):
+    """gm, gds, on/off, SS, Vth and Rsheet of every sweep of a bank: a Python loop over DataSets and curves
+    (the notebook way) vs. one TransistorDataExtraction.extract_bank() pass over the stack"""
+    B = synthetic_bank(set_count, vds_count, vgs_count)
+
+    def per_curve():
+        for S in B.m_DataSets:
+            vd, vg, Id = S.get_data(0)[0, :], S.get_data(1)[:, 0], S.get_data(2)
+            w_over_l = tde.get_w_over_l(S)
+            gm, gds = np.gradient(Id, vg, axis = 0), np.gradient(Id, vd, axis = 1)
+            for c in range(Id.shape[1]):
+                curve = Id[:, c]
+                abs_curve = np.abs(curve)
+                on_off = abs_curve.max() / abs_curve[abs_curve > 0].min()
+                i = np.argmax(np.abs(gm[:, c]))
+                Vth = vg[i] - curve[i] / gm[i, c]
+                with np.errstate(divide = 'ignore'):
+                    SS_min = 1e3 / np.max(np.abs(np.gradient(np.log10(abs_curve), vg)))
+                    Rsheet = vd[c] / curve * w_over_l
+
+    def vectorized():
+        B.invalidate_stacks()
+        tde.extract_bank(B, columns = False)
+    report(f"Extraction of {set_count} {vgs_count}x{vds_count} sweeps, per-curve loop vs. extract_bank()",
+           best_time(per_curve, 3), best_time(vectorized, 3))
+
+
+def bench_repeats(repeat_count: int = 50, vds_count: int = 401, vgs_count: int = 41):
+    """Repeat runs arriving one at a time: recomputing the group's mean/std/min/max from every repeat after each
+    new one vs. folding it into a RepeatGroup (Welford update)"""
+    Sets = synthetic_bank(repeat_count, vds_count, vgs_count).m_DataSets
+
+    def recompute():
+        for n in range(1, repeat_count + 1):
+            stack = np.stack([S.get_data(2) for S in Sets[:n]])
+            stack.mean(axis = 0), stack.std(axis = 0, ddof = 1 if n > 1 else 0), stack.min(axis = 0), stack.max(axis = 0)
+
+    def streaming():
+        group = tda.RepeatGroup()
+        for S in Sets:
+            group.add(S)
+            group.get_stat('std', 2)
+    report(f"{repeat_count} repeats of a {vgs_count}x{vds_count} sweep added one at a time, recompute vs. RepeatGroup.add()",
+           best_time(recompute, 3), best_time(streaming, 3))
+
+
+def bench_compare(pair_count: int = 300, vds_count: int = 101, vgs_count: int = 41):
+    """Before/after comparison of many pairs, the After sweeps on a coarser grid: per pair, a Python loop over curves
+    (np.interp resampling, deltas, Vth and Ion by curve) vs. one batched TransistorDataComparison.compare()"""
+    Before = synthetic_bank(pair_count, vds_count, vgs_count).m_DataSets
+    After = synthetic_bank(pair_count, (vds_count + 1) // 2, vgs_count).m_DataSets
+
+    def per_curve():
+        for S_b, S_a in zip(Before, After):
+            vd_b, vd_a, vg = S_b.get_data(0)[0, :], S_a.get_data(0)[0, :], S_b.get_data(1)[:, 0]
+            before = S_b.get_data(2)
+            after = np.array([np.interp(vd_b, vd_a, row) for row in S_a.get_data(2)])
+            with np.errstate(divide = 'ignore', invalid = 'ignore'):
+                delta, rel, log_ratio = after - before, (after - before) / np.abs(before), np.log10(np.abs(after) / np.abs(before))
+            for c in range(before.shape[1]):
+                shifts = []
+                for curve in [before[:, c], after[:, c]]:
+                    gm = np.gradient(curve, vg)
+                    i = np.argmax(np.abs(gm))
+                    shifts.append((vg[i] - curve[i] / gm[i], np.abs(curve).max()))
+                dVth, Ion_ratio = shifts[1][0] - shifts[0][0], shifts[1][1] / shifts[0][1]
+
+    report(f"Comparison of {pair_count} pairs of {vgs_count}x{vds_count} sweeps (After resampled), per-curve loop vs. compare()",
+           best_time(per_curve, 3), best_time(lambda: tdc.compare(Before, After, 'Id'), 3))
+
+
+def bench_table(file_count: int = 200):
+    """Re-parsing the easyEXPERT csvs of a folder vs. importing the DataSets from one columnar export of them"""
+    with tempfile.TemporaryDirectory() as directory:
+        DFs = []
+        for i in range(file_count):
+            path = os.path.join(directory, f"It7_{i}.csv")
+            shutil.copy(CSV_PATH, path)
+            DFs.append(tdv.DataFile('It7', path, i))
+        old = best_time(lambda: [tdv.DataSet(DF) for DF in DFs], repeats = 3)
+        for extension in ['parquet', 'arrow', 'h5']: # tests/test_table.py checks the round trips
+            path = os.path.join(directory, f"bank.{extension}")
+            tdt.export_table(DFs, path)
+            new = best_time(lambda: tdt.import_datasets(path), repeats = 3)
+            report(f"{file_count} DataSets from their csvs vs. from a .{extension} export ({os.path.getsize(path) / 1e6:.2f} MB)",
+                   old, new)
+
+
+def bench_archive(file_count: int = 200):
+    """Parsing the csvs of a folder vs. opening a DataArchive of them: all DataSets, and one column of one DataSet"""
+    with tempfile.TemporaryDirectory() as directory:
+        DFs = []
+        for i in range(file_count):
+            path = os.path.join(directory, f"It7_{i}.csv")
+            shutil.copy(CSV_PATH, path)
+            DFs.append(tdv.DataFile('It7', path, i))
+        path = os.path.join(directory, "project.tdva") # tests/test_archive.py checks the round trips
+        tar.DataArchive(path).append(DFs)
+
+        def from_archive():
+            Archive = tar.DataArchive(path)
+            return [Archive.get_dataset(i).get_data(-1).sum() for i in range(len(Archive))]
+        old = best_time(lambda: [tdv.DataSet(DF).get_data(-1).sum() for DF in DFs], repeats = 3)
+        report(f"{file_count} DataSets from their csvs vs. from a DataArchive ({os.path.getsize(path) / 1e6:.2f} MB)",
+               old, best_time(from_archive, repeats = 3))
+        Archive = tar.DataArchive(path)
+        old = best_time(lambda: tdv.DataSet(DFs[file_count // 2], lazy = True).get_data(-1))
+        new = best_time(lambda: Archive.get_column(file_count // 2, -1))
+        report(f"One column of one DataSet, lazy csv parse vs. get_column() of an open DataArchive", old, new)
+        print(f"   (opening the DataArchive: {best_time(lambda: tar.DataArchive(path)) * 1e3:.3f} ms)")
+
+
+def bench_dtype(set_count: int = 200):
+    """Memory of a DataBank (columns and the stack of Id) with full float64 columns vs. with a DtypePolicy
+    (float32 data, implicit grids), and the time to load it"""
+    DF = tdv.DataFile('It7', CSV_PATH)
+
+    def load(policy):
+        B = tdv.DataBank()
+        B.set_dtype_policy(policy)
+        for i in range(set_count):
+            B.append(tdv.DataSet(DF))
+        B.get_stack(-1)
+        return B
+    full, compact = load(None), load(tdv.DtypePolicy())
+    error = np.max(np.abs(compact.get_stack(-1) - full.get_stack(-1)) / np.maximum(np.abs(full.get_stack(-1)), 1e-30))
+    print(f"DataBank of {set_count} DataSets: {full.memory_bytes() / 1e6:.2f} MB float64 vs. "
+          f"{compact.memory_bytes() / 1e6:.2f} MB with a DtypePolicy ({full.memory_bytes() / compact.memory_bytes():.1f}x less), "
+          f"max relative error of Id {error:.1e}")
+    report(f"Loading the {set_count} DataSets, float64 vs. DtypePolicy", best_time(lambda: load(None), 3),
+           best_time(lambda: load(tdv.DtypePolicy()), 3))
+
+
+BENCHMARKS = {'parser': bench_parser,
+              'cache': bench_cache,
+              'ingest': bench_ingest,
+              'lazy': bench_lazy,
+              'index': bench_index,
+              'stack': bench_stack,
+              'slicing': bench_slicing,
+              'resample': bench_resample,
+              'zeros': bench_zeros,
+              'lod': bench_lod,
+              'plot2d': bench_plot2d,
+              'session': bench_session,
+              'sliders': bench_sliders,
+              'extract': bench_extract,
+              'repeats': bench_repeats,
+              'compare': bench_compare,
+              'table': bench_table,
+              'archive': bench_archive,
+              'dtype': bench_dtype}
+
+if __name__ == '__main__':
+    selected = sys.argv[1:] or list(BENCHMARKS.keys())
+    for name in selected:
+        BENCHMARKS[name]()
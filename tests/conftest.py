@@ -0,0 +1,40 @@
+import os
+import sys
+import matplotlib
+
+matplotlib.use('Agg') # the plotting tests don't open windows
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# the easyEXPERT csvs bundled with the repo, as shipped (no trailing newline)
+IT7 = os.path.join(ROOT, 'Id-Vds var const Vtgs_n1.csv')
+IB7 = os.path.join(ROOT, 'Id-Vds var const Vbgs_n1.csv')
+RT7 = os.path.join(ROOT, 'Rds v Vtgs_n1.csv')
+
+
+def mixed_bank():
+    """A DataBank of DataSets with different headers, grids and misc (None, int and tags): the bundled Id-Vds and
+    Rds csvs, and an Id-Vds one with derived columns (some of them NaN)"""
+    import TransistorDataVisualizer as tdv
+    import TransistorDataExtraction as tde
+    B = tdv.DataBank()
+    B.override = True
+    for name, path, misc in [('It7', IT7, None), ('Ib7', IB7, 1), ('Rt7', RT7, 'cryo,post-epoxy')]:
+        B.append(tdv.DataSet(tdv.DataFile(name, path, misc)))
+    S = tdv.DataSet(tdv.DataFile('It8', IT7, 'post-epoxy'))
+    tde.extract(S, columns = True)
+    B.append(S)
+    return B
+
+
+def check_round_trip(Sets: list, copies: list):
+    """Asserts that copies (e.g. read back from an export) have the names, misc, headers, intervals and data of Sets"""
+    import numpy as np
+    assert len(copies) == len(Sets)
+    for S, C in zip(Sets, copies):
+        assert (C.Info.data_name, C.misc, C.get_headers()) == (S.Info.data_name, S.misc, S.get_headers())
+        assert C.m_intervals_info == S.m_intervals_info
+        for i in range(len(S.get_headers())):
+            assert C.get_data(i).shape == S.get_data(i).shape
+            np.testing.assert_array_equal(C.get_data(i), S.get_data(i))
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+import TransistorDataVisualizer as tdv
+import TransistorDataAggregation as agg
+from conftest import IT7
+
+
+def make_repeats(count: int) -> list:
+    """count repeats of the bundled Id-Vds sweep with noise on Id"""
+    rng = np.random.default_rng(1)
+    Sets = []
+    for _ in range(count):
+        S = tdv.DataSet(tdv.DataFile('It7', IT7))
+        S.m_datadict['Id'] = S.get_data(-1) + rng.normal(scale = 1e-6, size = S.get_data(-1).shape)
+        Sets.append(S)
+    return Sets
+
+
+def check_stats(group: agg.RepeatGroup, Sets: list):
+    stack = np.stack([S.get_data(-1) for S in Sets])
+    assert group.count == len(Sets)
+    np.testing.assert_allclose(group.get_stat('mean', 'Id'), stack.mean(axis = 0), rtol = 1e-12, atol = 1e-20)
+    expected_std = stack.std(axis = 0, ddof = 1) if len(Sets) > 1 else np.zeros(stack.shape[1:])
+    np.testing.assert_allclose(group.get_stat('std', 'Id'), expected_std, rtol = 1e-9, atol = 1e-20)
+    np.testing.assert_array_equal(group.get_stat('min', 'Id'), stack.min(axis = 0))
+    np.testing.assert_array_equal(group.get_stat('max', 'Id'), stack.max(axis = 0))
+    np.testing.assert_array_equal(group.get_stat('median', 'Id'), np.median(stack, axis = 0))
+
+
+@pytest.mark.parametrize('batches', [[1], [1, 1, 1, 1, 1], [2, 3], [1, 4], [3, 1, 1]])
+def test_merged_stats_match_numpy(batches):
+    Sets = make_repeats(sum(batches))
+    group = agg.RepeatGroup()
+    added = 0
+    for size in batches:
+        if size == 1:
+            group.add(Sets[added])
+        else:
+            group.add_many(Sets[added:added + size])
+        added += size
+        check_stats(group, Sets[:added])
+
+
+def test_dataset_carries_bands():
+    Sets = make_repeats(3)
+    group = agg.RepeatGroup(Sets[:2])
+    S = group.get_dataset()
+    low, high = S.bands['Id']
+    std = group.get_stat('std', 'Id')
+    np.testing.assert_allclose(low, S.get_data(-1) - std)
+    np.testing.assert_allclose(high, S.get_data(-1) + std)
+
+    group.add(Sets[2]) # the same DataSet follows the group
+    np.testing.assert_allclose(S.get_data(-1), np.stack([T.get_data(-1) for T in Sets]).mean(axis = 0))
+    np.testing.assert_allclose(S.bands['Id'][1] - S.bands['Id'][0], 2 * group.get_stat('std', 'Id'))
+
+    minmax = agg.RepeatGroup(Sets, band = 'minmax').get_dataset()
+    np.testing.assert_array_equal(minmax.bands['Id'][0], group.get_stat('min', 'Id'))
+    np.testing.assert_array_equal(minmax.bands['Id'][1], group.get_stat('max', 'Id'))
@@ -0,0 +1,79 @@
+import os
+import shutil
+import numpy as np
+import TransistorDataVisualizer as tdv
+import TransistorDataArchive as tar
+from conftest import IT7, IB7, mixed_bank, check_round_trip
+
+
+def make_folder(root) -> str:
+    folder = os.path.join(str(root), 'S31_#7_50x50_P25243')
+    os.makedirs(folder)
+    for path in [IT7, IB7]:
+        shutil.copy(path, folder)
+    return folder
+
+
+def test_round_trip(tmp_path):
+    B = mixed_bank()
+    for codec in tar.CODECS:
+        Archive = tar.DataArchive(str(tmp_path / f"{codec}.tdva"), codec)
+        Archive.append(B)
+        Archive = tar.DataArchive(Archive.path) # reopened from the file
+        check_round_trip(B.m_DataSets, Archive.bank(override = True).m_DataSets)
+        np.testing.assert_array_equal(Archive.get_column(2, 'R'), B.m_DataSets[2].get_data(-1))
+
+
+def test_datafiles_round_trip(tmp_path):
+    DFs = []
+    for i in range(3):
+        path = str(tmp_path / f"It7_{i}.csv")
+        shutil.copy(IT7, path)
+        DFs.append(tdv.DataFile('It7', path, i))
+    Archive = tar.DataArchive(str(tmp_path / 'project.tdva'))
+    assert Archive.append(DFs) == [0, 1, 2]
+    check_round_trip([tdv.DataSet(DF) for DF in DFs], [tar.DataArchive(Archive.path).get_dataset(i) for i in range(3)])
+
+
+def test_convert_folder_supersedes_changed_csv(tmp_path):
+    folder = make_folder(tmp_path)
+    path = str(tmp_path / 'project.tdva')
+    assert len(tar.convert_folder(str(tmp_path), path)) == 2
+    assert len(tar.convert_folder(str(tmp_path), path)) == 2 # nothing changed
+
+    changed = os.path.join(folder, os.path.basename(IT7))
+    with open(changed, 'rb') as f:
+        data = f.read()
+    with open(changed, 'wb') as f: # the last Id point of the sweep was remeasured
+        f.write(data[:data.rindex(b',')] + b', 1.0')
+    Archive = tar.convert_folder(str(tmp_path), path)
+    assert len(Archive) == 2
+    assert Archive.m_superseded == 1
+    ids = Archive.find(file_path = changed)
+    assert len(ids) == 1
+    assert Archive.get_column(ids[0], 'Id')[-1, -1] == 1.0
+    assert len(Archive.bank(override = True).m_DataSets) == 2
+    assert tar.DataArchive(path).m_positions == Archive.m_positions # the same after reopening
+
+
+def test_convert_folder_skips_unreadable_csv(tmp_path):
+    folder = make_folder(tmp_path)
+    with open(IB7, 'rb') as f:
+        data = f.read()
+    with open(os.path.join(folder, 'Id-Vds half written.csv'), 'wb') as f:
+        f.write(data[:len(data) // 2] + b'garbage\r\n')
+    Archive = tar.convert_folder(str(tmp_path), str(tmp_path / 'project.tdva'))
+    assert len(Archive) == 2
+    (i, DF, error), = Archive.append_errors
+    assert DF.file_path.endswith('half written.csv')
+    assert len(tar.DataArchive(Archive.path)) == 2 # the good csvs were committed
+
+
+def test_find_matches_misc_tags(tmp_path):
+    Archive = tar.DataArchive(str(tmp_path / 'tags.tdva'))
+    Archive.append([tdv.DataFile('It7', IT7, 'cryo,post-epoxy'), tdv.DataFile('Ib7', IB7, 1), tdv.DataFile('Ib7', IB7)])
+    assert Archive.find(misc = 'post-epoxy') == [0]
+    assert Archive.find(misc = 'epoxy') == [] # whole tags only
+    assert Archive.find(misc = 1) == Archive.find(misc = '1') == [1]
+    assert Archive.find(misc = ['cryo', 1]) == [0, 1]
+    assert Archive.find(misc = None) == [2]
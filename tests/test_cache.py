@@ -0,0 +1,94 @@
+import gc
+import os
+import json
+import shutil
+import weakref
+import numpy as np
+import pytest
+import TransistorDataVisualizer as tdv
+from conftest import IT7
+
+
+def read_index(directory: str) -> dict:
+    with open(os.path.join(directory, 'index.json'), 'r') as f:
+        return json.load(f)
+
+
+def test_hit_writes_index_only_on_close(tmp_path):
+    path = str(tmp_path / 'It7.csv')
+    shutil.copy(IT7, path)
+    directory = str(tmp_path / 'cache')
+    cache = tdv.DataCache(directory)
+    parsed = tdv.File(tdv.DataFile('It7', path), cache = cache)
+    stored = os.path.getmtime(os.path.join(directory, 'index.json'))
+    last_used = read_index(directory)[cache.make_key(path)]['last_used']
+
+    loaded = tdv.File(tdv.DataFile('It7', path), cache = cache)
+    assert cache.hits == 1
+    np.testing.assert_array_equal(loaded.get_data(-1), parsed.get_data(-1))
+    assert os.path.getmtime(os.path.join(directory, 'index.json')) == stored # a hit doesn't rewrite the index
+
+    cache.close()
+    assert read_index(directory)[cache.make_key(path)]['last_used'] > last_used
+    assert tdv.DataCache(directory).m_index == cache.m_index
+
+
+def test_csv_rewritten_while_parsing_is_not_cached(tmp_path, monkeypatch):
+    path = str(tmp_path / 'It7.csv')
+    shutil.copy(IT7, path)
+    cache = tdv.DataCache(str(tmp_path / 'cache'))
+    process_interval = tdv.File._File__process_interval
+
+    def rewrite_then_process(self):
+        with open(path, 'a') as f: # the csv changes after it was read but before the result is stored
+            f.write('\n')
+        process_interval(self)
+    monkeypatch.setattr(tdv.File, '_File__process_interval', rewrite_then_process)
+    tdv.File(tdv.DataFile('It7', path), cache = cache)
+    assert cache.make_key(path) not in cache.m_index
+
+    monkeypatch.undo()
+    tdv.File(tdv.DataFile('It7', path), cache = cache)
+    assert cache.make_key(path) in cache.m_index
+    assert cache.m_index[cache.make_key(path)]['size'] == os.path.getsize(path)
+
+
+def test_unused_cache_is_collected_and_closed(tmp_path):
+    path = str(tmp_path / 'It7.csv')
+    shutil.copy(IT7, path)
+    directory = str(tmp_path / 'cache')
+    cache = tdv.DataCache(directory)
+    tdv.File(tdv.DataFile('It7', path), cache = cache)
+    tdv.File(tdv.DataFile('It7', path), cache = cache) # a hit, only in memory so far
+    last_used = cache.m_index[cache.make_key(path)]['last_used']
+    ref = weakref.ref(cache)
+    del cache
+    gc.collect()
+    assert ref() is None # the exit hook doesn't keep it alive
+    assert list(read_index(directory).values())[0]['last_used'] == last_used
+
+
+@pytest.mark.parametrize('mmap', [False, True])
+def test_store_replaces_leftover_entry_files(tmp_path, mmap):
+    path = str(tmp_path / 'It7.csv')
+    shutil.copy(IT7, path)
+    directory = str(tmp_path / 'cache')
+    cache = tdv.DataCache(directory, mmap = mmap)
+    key = cache.make_key(path)
+    entry = os.path.join(directory, key if mmap else key + '.npz')
+    if mmap: # a crash left a temporary entry, and an entry that isn't in the index (e.g. index.json was lost)
+        for folder in [entry + '.tmp', entry]:
+            os.makedirs(folder)
+            np.save(os.path.join(folder, 'stale.npy'), np.zeros(3))
+    else:
+        for file_path in [entry + '.tmp', entry]:
+            with open(file_path, 'wb') as f:
+                f.write(b'stale')
+    parsed = tdv.File(tdv.DataFile('It7', path), cache = cache)
+    assert key in cache.m_index and not os.path.exists(entry + '.tmp')
+
+    loaded = tdv.File(tdv.DataFile('It7', path), cache = tdv.DataCache(directory, mmap = mmap))
+    assert loaded.get_headers() == parsed.get_headers()
+    np.testing.assert_array_equal(loaded.get_data(-1), parsed.get_data(-1))
+    if mmap:
+        assert 'stale.npy' not in os.listdir(entry)
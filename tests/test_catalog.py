@@ -0,0 +1,57 @@
+import os
+import shutil
+import TransistorDataCatalog as cat
+from conftest import IT7, IB7, RT7
+
+
+def make_catalog(root) -> cat.DataCatalog:
+    folder = os.path.join(str(root), 'S31_#7_50x50_P25243_cryo_post_epoxy')
+    os.makedirs(folder)
+    for path in [IT7, RT7]:
+        shutil.copy(path, folder)
+    Catalog = cat.DataCatalog(':memory:')
+    Catalog.crawl(str(root))
+    return Catalog
+
+
+def test_sweeps_are_labeled_by_role(tmp_path):
+    Catalog = make_catalog(tmp_path)
+    Id_Vds, = Catalog.find(test_type = 'I')
+    # Channel.VName lists Vtgs first, but Vds is the primary (x) sweep of the Id-Vds tests
+    assert (Id_Vds['v1_name'], Id_Vds['v1_count'], Id_Vds['v1_step']) == ('Vds', 101, 0.1)
+    assert (Id_Vds['v2_name'], Id_Vds['v2_count'], Id_Vds['v2_step']) == ('Vtgs', 11, 1.0)
+    Rds, = Catalog.find(test_type = 'R')
+    assert (Rds['v1_name'], Rds['v1_count'], Rds['v2_name'], Rds['v2_count']) == ('Vtgs', 101, 'Vds', 1)
+
+
+def test_misc_matches_tags(tmp_path):
+    Catalog = make_catalog(tmp_path)
+    assert {record['misc'] for record in Catalog.find()} == {'cryo,post-epoxy'}
+    assert len(Catalog.find(misc = 'post-epoxy')) == 2
+    assert len(Catalog.find(misc = 'cryo')) == 2
+    assert len(Catalog.find(misc = 'pre-epoxy')) == 0
+    assert len(Catalog.find(misc = 'epoxy')) == 0 # whole tags only
+
+
+def test_index_query(tmp_path):
+    Catalog = make_catalog(tmp_path)
+    for Index in [cat.DataIndex.from_catalog(Catalog), cat.DataIndex.from_datafiles(Catalog.datafiles())]:
+        Id_Vds = Index.query(graph_type = 1)
+        assert len(Id_Vds) == 1
+        assert Index.columns()['Vds_count'][Id_Vds[0]] == 101
+        assert Index.columns()['Vds_span'][Id_Vds[0]] == 10
+        assert len(Index.query(misc = 'post-epoxy')) == 2
+        assert len(Index.query(misc = ['pre-epoxy', 'cryo'])) == 2
+        assert len(Index.query(misc = None)) == 0
+        assert list(Index.query(misc = 'post-epoxy', where = lambda c: c['Vds_count'] == 101)) == list(Id_Vds)
+
+
+def test_index_int_misc():
+    # TransistorDataFiles.py passes ints as misc too, e.g. Ib3 and Rt3
+    Index = cat.DataIndex.from_datafiles([cat.DataFile('It7', IT7, 1), cat.DataFile('Ib7', IB7, 'cryo,1'),
+                                          cat.DataFile('Rt7', RT7, 0)])
+    assert list(Index.query(misc = 1)) == [0, 1]
+    assert list(Index.query(misc = '1')) == [0, 1]
+    assert list(Index.query(misc = 0)) == [2]
+    assert list(Index.query(misc = ['cryo', 0])) == [1, 2]
+    assert len(Index.query(misc = None)) == 0
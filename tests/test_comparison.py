@@ -0,0 +1,51 @@
+import numpy as np
+import TransistorDataVisualizer as tdv
+import TransistorDataComparison as tdc
+
+VD = np.array([0.1, 0.5, 1.0])
+
+
+def make_sweep(name: str, vth: float, k: float, vg: np.ndarray, misc: str) -> tdv.DataSet:
+    """An Id-Vgs DataSet (gate voltage along x, one curve per drain voltage) of a device that conducts
+    Id = k * (Vg - vth) * Vd above vth, so the max gm tangent crosses zero at vth"""
+    x, y = np.meshgrid(vg, VD)
+    Id = k * np.maximum(x - vth, 0) * y
+    interval = lambda v: {'start': float(v[0]), 'stop': float(v[-1]), 'step': float(v[1] - v[0]), 'count': len(v)}
+    meta = {'headers': ['Vtgs', 'Vds', 'Id'], 'interval_names': ['Vtgs', 'Vds'], 'title': 'Id v Vtgs',
+            'sweep_type': None, 'dim1_count': len(vg), 'dim2_count': len(VD),
+            'intervals_info': {'Vtgs': interval(vg), 'Vds': interval(VD)}}
+    arrays = {'data_0': x, 'data_1': y, 'data_2': Id, 'interval_0': vg, 'interval_1': VD}
+    return tdv.DataSet(tdv.DataFile(name, f"{name}_{misc}.csv", misc), state = (meta, arrays))
+
+
+def test_known_shifts_and_mismatched_grids(capsys):
+    vg, fine = np.linspace(0, 5, 51), np.linspace(0, 5, 201)
+    Before = [make_sweep('It7', 1.0, 2e-6, vg, 'pre'), make_sweep('It8', 1.0, 2e-6, vg, 'pre'),
+              make_sweep('It9', 0.5, 1e-6, vg, 'pre')]
+    After = [make_sweep('It7', 1.5, 1.6e-6, vg, 'post'), make_sweep('It8', 1.5, 1.6e-6, fine, 'post')]
+    results = tdc.compare(Before, After)
+    assert 'It9_pre.csv' in capsys.readouterr().out # unpaired, reported and left out
+    assert [result['name'] for result in results] == ['It7', 'It8']
+
+    for result in results:
+        assert result['misc'] == 'post vs. pre'
+        np.testing.assert_allclose(result['Vd'], VD)
+        np.testing.assert_allclose(result['dVth'], 0.5, atol = 1e-9)
+        np.testing.assert_allclose(result['Ion_ratio'], 0.8 * (5 - 1.5) / (5 - 1.0), rtol = 1e-9)
+        np.testing.assert_allclose(result['dIon'], (1.6e-6 * 3.5 - 2e-6 * 4) * VD, rtol = 1e-9)
+
+        S = result['DataSet']
+        assert S.get_headers() == ['Vtgs', 'Vds', 'dId', 'Id_rel', 'Id_log']
+        assert S.get_data(0).shape == (len(VD), len(vg)) # on the Before grid, also for the finer After sweep
+        x, y = np.meshgrid(vg, VD)
+        expected = 1.6e-6 * np.maximum(x - 1.5, 0) * y - 2e-6 * np.maximum(x - 1.0, 0) * y
+        np.testing.assert_allclose(S.get_data(2), expected, atol = 1e-18)
+
+
+def test_after_outside_before_range_is_nan():
+    vg = np.linspace(0, 5, 51)
+    Before, After = make_sweep('It7', 1.0, 2e-6, vg, 'pre'), make_sweep('It7', 1.0, 2e-6, np.linspace(0, 4, 41), 'post')
+    result, = tdc.compare([Before], [After], metrics = False)
+    dId = result['DataSet'].get_data(2)
+    assert np.isnan(dId[:, vg > 4 + 1e-9]).all()
+    np.testing.assert_allclose(dId[:, vg <= 4], 0, atol = 1e-18)
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+import matplotlib.pyplot as plt
+import TransistorDataVisualizer as tdv
+from conftest import IT7
+
+
+@pytest.mark.parametrize('max_cols', [4, 5, 9, 50])
+def test_decimate_minmax_respects_budget(max_cols):
+    rng = np.random.default_rng(0)
+    x = np.tile(np.arange(1000.0), (7, 1))
+    z = rng.normal(size = x.shape)
+    X, Y, Z = tdv.DataBank().decimate_minmax(x, x, z, max_cols)
+    assert Z.shape == (7, Z.shape[1]) and Z.shape[1] <= max_cols
+    np.testing.assert_array_equal(Z.max(axis = 1), z.max(axis = 1))
+    np.testing.assert_array_equal(Z.min(axis = 1), z.min(axis = 1))
+    assert np.all(np.diff(X, axis = 1) >= 0)
+
+
+def test_too_small_budget_warns():
+    B = tdv.DataBank(tdv.DataSet(tdv.DataFile('It7', IT7)))
+    fig = plt.figure()
+    ax = fig.add_subplot(projection = '3d')
+    with pytest.warns(UserWarning, match = 'exceeds the budget'):
+        B.quick_plot3d(ax = ax, point_budget = 11 * 3) # 3 points for each of the 11 curves
+    fig.canvas.draw() # (3D segments are projected on draw)
+    assert [len(segment) for segment in ax.collections[0].get_segments()] == [4] * 11
+    plt.close(fig)
+
+
+@pytest.mark.parametrize('max_cols', [4, 9, 50])
+def test_decimate_minmax_shared_cols(max_cols):
+    rng = np.random.default_rng(1)
+    x = np.tile(np.arange(1000.0), (7, 1))
+    z = rng.normal(size = x.shape)
+    X, Y, Z = tdv.DataBank().decimate_minmax(x, x, z, max_cols, shared_cols = True)
+    assert Z.shape[1] <= max_cols
+    assert np.all(X == X[0]) # column k is the same point of every curve
+    assert X[0, 0] == 0 and X[0, -1] == 999 and np.all(np.diff(X[0]) > 0)
+
+    z = z[0] * np.arange(1.0, 8.0)[:, None] # curves of the same shape have their extremes in the same columns
+    X, Y, Z = tdv.DataBank().decimate_minmax(x, x, z, max_cols, shared_cols = True)
+    np.testing.assert_array_equal(Z.max(axis = 1), z.max(axis = 1))
+    np.testing.assert_array_equal(Z.min(axis = 1), z.min(axis = 1))
+
+
+def test_decimated_connectors_join_the_same_column():
+    B = tdv.DataBank(tdv.DataSet(tdv.DataFile('It7', IT7)))
+    B.connectors = True
+    B.point_budget = 11 * 8
+    P = B.session('3d')
+    lines = P.m_artists[id(B.m_DataSets[0])][1][0]
+    segments = lines._segments3d # (get_segments() returns them projected)
+    curves, connectors = segments[:11], segments[11:]
+    assert len(connectors) == len(curves[0]) <= 8
+    for connector in connectors:
+        assert np.all(np.asarray(connector)[:, 0] == connector[0][0]) # each connector is at one x
+    P.close()
@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+import TransistorDataVisualizer as tdv
+import TransistorDataTable as tdt
+import TransistorDataArchive as tar
+from conftest import IT7, IB7, RT7
+
+PATHS = [('It7', IT7), ('Ib7', IB7), ('Rt7', RT7)]
+
+
+def make_bank(policy) -> tdv.DataBank:
+    B = tdv.DataBank()
+    B.override = True
+    B.set_dtype_policy(policy)
+    for name, path in PATHS:
+        B.append(tdv.DataSet(tdv.DataFile(name, path)))
+    return B
+
+
+def assert_close(compact: np.ndarray, full: np.ndarray):
+    assert compact.shape == full.shape
+    np.testing.assert_allclose(np.asarray(compact, dtype = float), full, rtol = 1e-6, atol = 1e-30, equal_nan = True)
+
+
+def assert_sets_close(Compact: list, Full: list):
+    assert len(Compact) == len(Full)
+    for C, S in zip(Compact, Full):
+        assert C.get_headers() == S.get_headers()
+        assert C.get_sweep_info() == S.get_sweep_info()
+        for i in range(len(S.get_headers())):
+            assert_close(C.get_data(i), S.get_data(i))
+
+
+def test_policy_memory_of_an_id_vds_sweep():
+    # the figure given in the README and the File documentation
+    S = tdv.DataSet(tdv.DataFile('It7', IT7))
+    C = tdv.DataSet(tdv.DataFile('It7', IT7), dtype_policy = tdv.DtypePolicy())
+    assert (S.memory_bytes(), C.memory_bytes()) == (26664, 5340)
+
+
+def test_policy_matches_float64():
+    full, compact = make_bank(None), make_bank(tdv.DtypePolicy())
+    for C, S in zip(compact.m_DataSets, full.m_DataSets):
+        assert C.get_data(-1).dtype == np.float32
+        assert 0 in C.get_data(0).strides # the Vds grid is an implicit broadcast view
+        assert C.memory_bytes() < S.memory_bytes()
+    assert_sets_close(compact.m_DataSets, full.m_DataSets)
+
+    for B in [full, compact]:
+        B.set_domain('x', [1, 4])
+        B.set_domain('y', [-2, 3])
+    for C, S in zip(compact.m_DataSets, full.m_DataSets):
+        for i in range(len(S.get_headers())):
+            assert_close(compact.get_domain_view(C, i), full.get_domain_view(S, i))
+    for domain in [False, True]:
+        assert_close(compact.get_stack(-1, domain), full.get_stack(-1, domain))
+
+
+def test_policy_archive_round_trip(tmp_path):
+    full, compact = make_bank(None), make_bank(tdv.DtypePolicy())
+    Archive = tar.DataArchive(str(tmp_path / 'compact.tdva'))
+    Archive.append(compact)
+    Archive = tar.DataArchive(Archive.path)
+    assert_sets_close([Archive.get_dataset(i) for i in range(len(Archive))], full.m_DataSets)
+
+
+@pytest.mark.parametrize('extension', ['.parquet', '.arrow', '.h5'])
+def test_policy_table_round_trip(tmp_path, extension):
+    pytest.importorskip('h5py' if extension == '.h5' else 'pyarrow')
+    full, compact = make_bank(None), make_bank(tdv.DtypePolicy())
+    path = str(tmp_path / f"compact{extension}")
+    tdt.export_table(compact, path)
+    assert_sets_close(tdt.import_datasets(path), full.m_DataSets)
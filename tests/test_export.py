@@ -0,0 +1,31 @@
+import os
+import pytest
+import matplotlib.pyplot as plt
+import TransistorDataVisualizer as tdv
+import TransistorDataExport as tdx
+from conftest import IT7
+
+
+def test_render_job(tmp_path):
+    for plot in tdx.PLOTS:
+        job = tdx.PlotJob([tdv.DataFile('It7', IT7)], str(tmp_path / f"{plot}.png"), plot = plot,
+                          DivSet = tdv.DataFile('It7', IT7), domain = {'x': [0, 5]})
+        assert os.path.getsize(tdx.render_job(job)) > 0
+    assert plt.get_fignums() == []
+
+
+def test_failed_job_closes_its_figure(tmp_path):
+    B = tdv.DataBank(tdv.DataSet(tdv.DataFile('It7', IT7)))
+    (tmp_path / 'file').write_text('') # saving under a file fails after the figure is drawn
+    output = str(tmp_path / 'file' / 'It7.png')
+    with pytest.raises(OSError):
+        tdx.render_job(tdx.PlotJob(B, output))
+    assert plt.get_fignums() == []
+    assert tdx.export_figures([tdx.PlotJob(B, output)] * 3, workers = 1)
+    assert plt.get_fignums() == []
+
+
+def test_quick_plot2d_of_empty_bank():
+    fig = tdv.DataBank().quick_plot2d('x', -1, show = False)
+    assert isinstance(fig, plt.Figure)
+    plt.close(fig)
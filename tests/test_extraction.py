@@ -0,0 +1,85 @@
+import numpy as np
+import TransistorDataVisualizer as tdv
+import TransistorDataExtraction as tde
+from conftest import IT7, IB7
+
+
+def make_bank() -> tdv.DataBank:
+    return tdv.DataBank.from_files([tdv.DataFile('It7', IT7), tdv.DataFile('Ib7', IB7)], workers = 1, override = True)
+
+
+def test_extract_bank_keeps_drain_current_last():
+    B = make_bank()
+    Id = [S.get_data(-1).copy() for S in B.m_DataSets]
+    summaries = tde.extract_bank(B)
+    assert len(summaries) == 2
+    for S, before in zip(B.m_DataSets, Id):
+        assert S.get_data_name(-1) == 'Id'
+        np.testing.assert_array_equal(S.get_data(-1), before)
+    np.testing.assert_array_equal(B.get_stack(-1), np.stack(Id))
+
+
+def test_extract_bank_columns():
+    B = make_bank()
+    tde.extract_bank(B, columns = True)
+    for S in B.m_DataSets:
+        assert S.get_headers()[-4:] == tde.COLUMNS
+        assert S.get_data(S.get_header_index('gm')).shape == S.get_data(S.get_header_index('Id')).shape
+
+
+VG = np.linspace(-1, 2, 31) # gate voltage along x, 0.1 V steps
+VD = np.array([0.1, 0.5, 1.0])
+VT0 = 0.35 # (between grid points, so Id is never 0)
+
+
+def synthetic_set(Id: np.ndarray, wid = 10, length = 2) -> tdv.DataSet:
+    """An Id-Vgs DataSet on the VG x VD grid with the given drain current and channel dimensions"""
+    x, y = np.meshgrid(VG, VD)
+    meta = {'headers': ['Vgs', 'Vds', 'Id'], 'interval_names': ['Vgs', 'Vds'], 'title': 'Id-Vgs var const Vds',
+            'sweep_type': None, 'dim1_count': len(VG), 'dim2_count': len(VD),
+            'intervals_info': {'Vgs': {'start': -1.0, 'stop': 2.0, 'step': 0.1, 'count': len(VG)},
+                               'Vds': {'start': 0.1, 'stop': 1.0, 'step': 0.45, 'count': len(VD)}}}
+    arrays = {'data_0': x, 'data_1': y, 'data_2': Id, 'interval_0': VG, 'interval_1': VD}
+    S = tdv.DataSet(tdv.DataFile('It7', IT7), state = (meta, arrays))
+    S.Info.chan_dims = {'len': length, 'wid': wid, 'area': wid * length}
+    return S
+
+
+def test_extract_linear_device():
+    k = 2e-4
+    Vg, Vd = np.meshgrid(VG, VD)
+    Id = k * Vd * (Vg - VT0) # linear region: gm = k Vd, gds = k (Vg - VT0)
+    S = synthetic_set(Id)
+    summary = tde.extract(S, columns = True)
+    np.testing.assert_allclose(S.get_data(S.get_header_index('gm')), k * Vd, rtol = 1e-9)
+    np.testing.assert_allclose(S.get_data(S.get_header_index('gds')), k * (Vg - VT0), rtol = 1e-9, atol = 1e-15)
+    np.testing.assert_allclose(S.get_data(S.get_header_index('Rsheet')), Vd / Id * 5, rtol = 1e-9)
+    np.testing.assert_allclose(summary['Vd'], VD)
+    np.testing.assert_allclose(summary['gm_max'], k * VD, rtol = 1e-9)
+    np.testing.assert_allclose(summary['Vth'], VT0, rtol = 1e-9)
+    np.testing.assert_allclose(summary['Ion'], k * VD * (2 - VT0), rtol = 1e-9)
+    np.testing.assert_allclose(summary['Rsheet_on'], 5 / (k * (2 - VT0)), rtol = 1e-9)
+
+
+def test_extract_subthreshold_swing():
+    swing = 0.08 # V per decade
+    Vg, Vd = np.meshgrid(VG, VD)
+    Id = 1e-12 * Vd * 10 ** ((Vg + 1) / swing)
+    summary = tde.extract(synthetic_set(Id))
+    np.testing.assert_allclose(summary['SS_min'], 1e3 * swing, rtol = 1e-9) # mV/dec
+    np.testing.assert_allclose(summary['on_off'], 10 ** (3 / swing), rtol = 1e-9)
+    np.testing.assert_allclose(summary['Ioff'], 1e-12 * VD, rtol = 1e-9)
+
+
+def test_extract_bank_matches_extract():
+    Vg, Vd = np.meshgrid(VG, VD)
+    B = tdv.DataBank()
+    B.override = True
+    for k in [1e-4, 2e-4, 3e-4]:
+        B.append(synthetic_set(k * Vd * (Vg - VT0), wid = 1e4 * k))
+    stacked = tde.extract_bank(B)
+    for S, summary in zip(B.m_DataSets, stacked):
+        single = tde.extract(S)
+        for key in tde.SUMMARY:
+            np.testing.assert_allclose(summary[key], single[key], rtol = 1e-12)
+    np.testing.assert_allclose([s['gm_max'][-1] for s in stacked], [1e-4, 2e-4, 3e-4], rtol = 1e-9)
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+import TransistorDataVisualizer as tdv
+from conftest import IT7, IB7, RT7
+
+
+def make_files(tmp_path) -> list:
+    bad = tmp_path / 'Id-Vds bad.csv'
+    with open(IB7, 'rb') as f:
+        data = f.read()
+    bad.write_bytes(data[:len(data) // 2] + b'garbage\r\n')
+    return [tdv.DataFile('It7', IT7, 'cryo'), tdv.DataFile('Ib7', str(bad)), tdv.DataFile('Ib7', IB7, 1),
+            tdv.DataFile('Rt7', str(tmp_path / 'missing.csv')), tdv.DataFile('Rt7', RT7)]
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_bad_files_land_in_load_errors(tmp_path, workers):
+    DataFiles = make_files(tmp_path)
+    B = tdv.DataBank.from_files(DataFiles, workers = workers, override = True)
+    assert [S.file_path for S in B.m_DataSets] == [IT7, IB7, RT7]
+    assert [(i, DF) for i, DF, error in B.load_errors] == [(1, DataFiles[1]), (3, DataFiles[3])]
+
+
+def test_parallel_and_serial_give_the_same_datasets(tmp_path):
+    DataFiles = make_files(tmp_path)
+    serial = tdv.DataBank()
+    serial.override = True
+    for i in [0, 2, 4]:
+        serial.append(tdv.DataSet(DataFiles[i]))
+    for workers in [1, 2]:
+        B = tdv.DataBank.from_files(DataFiles, workers = workers, override = True)
+        assert len(B.m_DataSets) == len(serial.m_DataSets)
+        for S, T in zip(B.m_DataSets, serial.m_DataSets):
+            assert (S.Info.data_name, S.misc, S.get_headers()) == (T.Info.data_name, T.misc, T.get_headers())
+            assert (S.color, S.marker) == (T.color, T.marker)
+            assert S.get_sweep_info() == T.get_sweep_info()
+            for i in range(len(T.get_headers())):
+                assert S.get_data(i).dtype == T.get_data(i).dtype
+                np.testing.assert_array_equal(S.get_data(i), T.get_data(i))
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+import TransistorDataVisualizer as tdv
+from conftest import IT7, RT7
+
+
+def count_calls(monkeypatch, name: str) -> list:
+    """Wraps the File method name so every call is recorded (with its arguments) in the returned list"""
+    calls = []
+    method = getattr(tdv.File, name)
+    def wrapper(self, *args):
+        calls.append(args)
+        return method(self, *args)
+    monkeypatch.setattr(tdv.File, name, wrapper)
+    return calls
+
+
+@pytest.mark.parametrize('name, path', [('It7', IT7), ('Rt7', RT7)])
+def test_metadata_only_reads_data_on_first_get_data(monkeypatch, name, path):
+    parses = count_calls(monkeypatch, '_File__process_csv')
+    F = tdv.File(tdv.DataFile(name, path), metadata_only = True, cache = False)
+    full = tdv.File(tdv.DataFile(name, path), cache = False)
+    assert len(parses) == 1 # only the full File read the DataValue rows
+    assert F.m_datadict == {}
+    assert F.get_headers() == full.get_headers()
+    assert (F.m_dim1_count, F.m_dim2_count) == (full.m_dim1_count, full.m_dim2_count)
+
+    np.testing.assert_array_equal(F.get_data(-1), full.get_data(-1))
+    assert len(parses) == 2
+    for i in range(len(full.get_headers())):
+        np.testing.assert_array_equal(F.get_data(i), full.get_data(i))
+    assert len(parses) == 2
+
+
+@pytest.mark.parametrize('name, path', [('It7', IT7), ('Rt7', RT7)])
+def test_lazy_parses_only_the_columns_asked_for(monkeypatch, name, path):
+    loads = count_calls(monkeypatch, '_File__load_column')
+    F = tdv.File(tdv.DataFile(name, path), lazy = True, cache = False)
+    full = tdv.File(tdv.DataFile(name, path), cache = False)
+    assert F.m_datadict == {} and loads == []
+
+    z = F.get_header_index(F.get_data_name(-1))
+    np.testing.assert_array_equal(F.get_data(z), full.get_data(z))
+    assert list(F.m_datadict) == [F.get_data_name(z)] and loads == [(F.get_data_name(z),)]
+    F.get_data(z)
+    assert len(loads) == 1
+
+    for i in range(len(full.get_headers())):
+        np.testing.assert_array_equal(F.get_data(i), full.get_data(i))
+    assert sorted(F.m_datadict) == sorted(full.m_datadict)
+    assert len(loads) == len(full.get_headers())
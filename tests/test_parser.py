@@ -0,0 +1,33 @@
+import shutil
+import numpy as np
+import pytest
+import TransistorDataVisualizer as tdv
+from conftest import IT7, IB7, RT7
+
+
+def parse_both(path: str) -> tuple:
+    DF = tdv.DataFile('T', path)
+    return tdv.File(DF, bulk_parse = False, cache = False), tdv.File(DF, cache = False)
+
+
+@pytest.mark.parametrize('path', [IT7, IB7, RT7]) # as shipped, without a trailing newline
+def test_bulk_parser_matches_row_parser(path):
+    rows, bulk = parse_both(path)
+    assert bulk.m_headers == rows.m_headers
+    assert (bulk.m_dim1_count, bulk.m_dim2_count) == (rows.m_dim1_count, rows.m_dim2_count)
+    assert bulk.get_sweep_info() == rows.get_sweep_info()
+    for key in rows.m_headers:
+        assert bulk.m_datadict[key].dtype == rows.m_datadict[key].dtype
+        np.testing.assert_array_equal(bulk.m_datadict[key], rows.m_datadict[key])
+
+
+def test_bulk_parser_with_trailing_newline(tmp_path):
+    path = str(tmp_path / 'It7.csv')
+    shutil.copy(IT7, path)
+    with open(path, 'ab') as f:
+        f.write(b'\r\n')
+    rows, bulk = parse_both(path)
+    shipped = parse_both(IT7)[1]
+    for key in rows.m_headers:
+        np.testing.assert_array_equal(bulk.m_datadict[key], rows.m_datadict[key])
+        np.testing.assert_array_equal(bulk.m_datadict[key], shipped.m_datadict[key])
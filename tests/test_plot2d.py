@@ -0,0 +1,38 @@
+import numpy as np
+import matplotlib.pyplot as plt
+from matplotlib.lines import Line2D
+import TransistorDataVisualizer as tdv
+from conftest import IT7, IB7
+
+
+def render(draw) -> np.ndarray:
+    fig, ax = plt.subplots(figsize = (4, 3))
+    draw(ax)
+    ax.autoscale_view()
+    fig.canvas.draw()
+    image = np.asarray(fig.canvas.buffer_rgba()).copy()
+    plt.close(fig)
+    return image
+
+
+def test_batched_markers_are_one_artist_per_dataset():
+    B = tdv.DataBank.from_files([tdv.DataFile('It7', IT7), tdv.DataFile('Ib7', IB7)], workers = 1, override = True)
+    fig, ax = plt.subplots()
+    B.quick_plot2d('x', -1, ax = ax)
+    assert len([a for a in ax.get_children() if isinstance(a, tdv.CurveMarkers)]) == 2
+    assert not [a for a in ax.get_children() if isinstance(a, Line2D) and a.get_marker() not in [None, 'None']]
+    plt.close(fig)
+
+
+def test_curve_markers_draw_like_line2d():
+    x = np.linspace(-5, 5, 21)
+    curves = np.stack([np.stack([x, x ** 2 + k], axis = -1) for k in range(3)])
+    colors = [(0.2, 0.4, 0.8), (0.8, 0.1, 0.1), (0.1, 0.6, 0.2)]
+    for marker in ['.', 'o', 's', 'x']:
+        def lines(ax):
+            for curve, color in zip(curves, colors):
+                ax.add_line(Line2D(curve[:, 0], curve[:, 1], color = color, marker = marker, linestyle = 'None'))
+        def collection(ax):
+            ax.add_line(Line2D(curves[:, :, 0].ravel(), curves[:, :, 1].ravel(), linestyle = 'None')) # same limits
+            ax.add_artist(tdv.CurveMarkers(curves, colors, marker))
+        np.testing.assert_array_equal(render(lines), render(collection))
@@ -0,0 +1,49 @@
+import shutil
+import numpy as np
+import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
+import TransistorDataVisualizer as tdv
+from conftest import IT7
+
+
+def make_bank(tmp_path) -> tdv.DataBank:
+    B = tdv.DataBank()
+    for i in range(3):
+        path = str(tmp_path / f"It7_{i}.csv")
+        shutil.copy(IT7, path)
+        B.append(tdv.DataSet(tdv.DataFile('It7', path)))
+    return B
+
+
+def remeasure_last_point(path: str):
+    with open(path, 'rb') as f:
+        data = f.read()
+    with open(path, 'wb') as f:
+        f.write(data[:data.rindex(b',')] + b', 1.0')
+
+
+def test_reload_changed_rereads_only_changed_files(tmp_path):
+    B = make_bank(tmp_path)
+    assert B.reload_changed() == []
+    stack = B.get_stack(-1)
+    arrays = [S.get_data(-1) for S in B.m_DataSets]
+    versions = [S.m_version for S in B.m_DataSets]
+
+    remeasure_last_point(B.m_DataSets[1].file_path)
+    assert B.reload_changed() == [1]
+    assert B.m_DataSets[0].get_data(-1) is arrays[0] and B.m_DataSets[2].get_data(-1) is arrays[2]
+    assert B.m_DataSets[1].get_data(-1) is not arrays[1] and B.m_DataSets[1].get_data(-1)[-1, -1] == 1.0
+    assert [S.m_version > v for S, v in zip(B.m_DataSets, versions)] == [False, True, False]
+    assert B.get_stack(-1) is not stack and B.get_stack(-1)[1, -1, -1] == 1.0
+    assert B.reload_changed() == []
+
+
+def test_watch_redraws_after_a_change(tmp_path):
+    B = make_bank(tmp_path)
+    remeasure_last_point(B.m_DataSets[0].file_path) # re-exported after the DataSets were read
+    fig = B.watch('2d', interval = 0.01, cycles = 1)
+    assert B.m_DataSets[0].get_data(-1)[-1, -1] == 1.0
+    assert not B.m_DataSets[0].has_changed()
+    segments = [segment for c in fig.axes[0].collections if isinstance(c, LineCollection) for segment in c.get_segments()]
+    assert any(segment[-1, 1] == 1.0 for segment in segments) # the figure was redrawn with the new data
+    plt.close(fig)
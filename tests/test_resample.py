@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+import TransistorDataVisualizer as tdv
+
+DF = tdv.DataFile('It7', 'synthetic.csv')
+
+
+def make_set(xs, ys, z = None, regular: bool = True) -> tdv.DataSet:
+    """An Id-Vds DataSet on the grid of the 1D x (Vds) and y (Vtgs) values, with random Id if z isn't given.
+    regular=False gives it intervals that don't match its values, so it's resampled as an irregular grid."""
+    xs, ys = np.asarray(xs, dtype = float), np.asarray(ys, dtype = float)
+    x, y = np.meshgrid(xs, ys)
+    if z is None:
+        z = np.random.default_rng(len(xs) * len(ys)).normal(size = x.shape)
+    interval = lambda v: {'start': float(v[0]), 'stop': float(v[-1]), 'step': float(v[1] - v[0]) if len(v) > 1 else 0.0,
+                          'count': len(v) if regular else len(v) + 1}
+    meta = {'headers': ['Vds', 'Vtgs', 'Id'], 'interval_names': ['Vds', 'Vtgs'], 'title': 'Id-Vds var const Vtgs',
+            'sweep_type': None, 'dim1_count': len(xs), 'dim2_count': len(ys),
+            'intervals_info': {'Vds': interval(xs), 'Vtgs': interval(ys)}}
+    arrays = {'data_0': x, 'data_1': y, 'data_2': z, 'interval_0': xs, 'interval_1': ys}
+    return tdv.DataSet(DF, state = (meta, arrays))
+
+
+def interp_reference(Source: tdv.DataSet, Target: tdv.DataSet) -> np.ndarray:
+    """Source's Id on Target's grid by np.interp along x, then along y, NaN outside Source's range"""
+    sx, sy, z = Source.get_data(0)[0, :], Source.get_data(1)[:, 0], Source.get_data(-1)
+    tx, ty = Target.get_data(0)[0, :], Target.get_data(1)[:, 0]
+    ox, oy = np.argsort(sx), np.argsort(sy)
+    zx = np.array([np.interp(tx, sx[ox], row[ox]) for row in z])
+    out = np.array([np.interp(ty, sy[oy], col[oy]) for col in zx.T]).T
+    out[(ty < sy.min()) | (ty > sy.max()), :] = np.nan
+    out[:, (tx < sx.min()) | (tx > sx.max())] = np.nan
+    return out
+
+
+X, Y = np.linspace(-5, 5, 11), np.linspace(-2, 2, 5)
+
+CASES = {
+    'identical': (make_set(X, Y), make_set(X, Y)),
+    'coarser source': (make_set(X, Y), make_set(np.linspace(-5, 5, 41), np.linspace(-2, 2, 9))),
+    'descending step': (make_set(X[::-1], Y[::-1]), make_set(np.linspace(-5, 5, 23), np.linspace(-2, 2, 7))),
+    'outside the range': (make_set(X, Y), make_set(np.linspace(-7, 7, 29), np.linspace(-3, 3, 13))),
+    'irregular source': (make_set([-5, -4, -2, 0, 1, 5], [-2, -1.5, 0, 2], regular = False),
+                         make_set(np.linspace(-6, 6, 25), np.linspace(-2, 2, 9))),
+    'irregular descending': (make_set([5, 1, 0, -2, -4, -5], [2, 0, -1.5, -2], regular = False),
+                             make_set(np.linspace(-6, 6, 25), np.linspace(-2, 2, 9))),
+}
+
+
+@pytest.mark.parametrize('case', CASES)
+def test_linear_matches_np_interp(case):
+    Source, Target = CASES[case]
+    out = tdv.GridResampler().resample(Source, -1, Target)
+    expected = interp_reference(Source, Target)
+    assert out.shape == Target.get_data(-1).shape
+    np.testing.assert_array_equal(np.isnan(out), np.isnan(expected))
+    np.testing.assert_allclose(out, expected, rtol = 1e-12, atol = 1e-12, equal_nan = True)
+    if case == 'identical':
+        np.testing.assert_array_equal(out, Source.get_data(-1))
+    if case == 'outside the range':
+        assert np.isnan(out).any() and not np.isnan(out).all()
+
+
+def test_weights_are_cached_per_grid_pair():
+    Source, Target = CASES['coarser source']
+    R = tdv.GridResampler()
+    for S in [Target, make_set(Target.get_data(0)[0, :], Target.get_data(1)[:, 0])]:
+        R.resample(Source, -1, S)
+    assert (R.hits, R.misses) == (1, 1)
@@ -0,0 +1,58 @@
+import numpy as np
+import matplotlib.pyplot as plt
+from matplotlib.lines import Line2D
+from matplotlib.collections import LineCollection, PolyCollection
+import TransistorDataVisualizer as tdv
+import TransistorDataAggregation as agg
+from conftest import IT7, IB7
+
+
+def test_session_markers_are_updated_in_place():
+    B = tdv.DataBank.from_files([tdv.DataFile('It7', IT7), tdv.DataFile('Ib7', IB7)], workers = 1, override = True)
+    P = B.session('2d')
+    markers = [a for a in P.ax.get_children() if isinstance(a, tdv.CurveMarkers)]
+    assert len(markers) == 2
+    assert not [a for a in P.ax.get_children() if isinstance(a, Line2D) and a.get_marker() not in [None, 'None']]
+
+    B.set_domain('x', [0, 5])
+    P.update()
+    assert [a for a in P.ax.get_children() if isinstance(a, tdv.CurveMarkers)] == markers
+    assert markers[0].m_curves.shape == (11, 51, 2)
+    assert np.all(markers[0].m_curves[:, :, 0] >= 0)
+    P.close()
+
+
+def test_session_draws_bands():
+    Sets = [tdv.DataSet(tdv.DataFile('It7', IT7)) for _ in range(3)]
+    for i, S in enumerate(Sets):
+        S.m_datadict[S.get_data_name(-1)] = S.get_data(-1) * (1 + 0.1 * i)
+    B = agg.aggregate_bank(Sets)
+    P = B.session('2d')
+    band, = [a for a in P.ax.get_children() if isinstance(a, PolyCollection)]
+    assert len(band.get_paths()) == 11
+
+    B.set_domain('y', [0, 2])
+    P.update()
+    assert [a for a in P.ax.get_children() if isinstance(a, PolyCollection)] == [band]
+    assert len(band.get_paths()) == 3
+    P.close()
+
+
+def test_domain_slider_sets_domain_and_redraws():
+    B = tdv.DataBank(tdv.DataSet(tdv.DataFile('It7', IT7)))
+    P = B.interactive('2d', show = False)
+    assert set(P.m_sliders) == {'x', 'y'}
+    lines = [a for a in P.ax.get_children() if isinstance(a, LineCollection)][0]
+    assert len(lines.get_segments()) == 11
+
+    y = B.m_DataSets[0].get_data(1)[:, 0]
+    P.m_sliders['y'].set_val((y[2], y[6]))
+    assert B.domain['y'] == (y[2], y[6])
+    assert [a for a in P.ax.get_children() if isinstance(a, LineCollection)] == [lines] # updated in place
+    assert len(lines.get_segments()) == 5
+
+    x = B.m_DataSets[0].get_data(0)[0, :]
+    P.m_sliders['x'].set_val((x[10], x[20]))
+    assert B.domain['x'] == (x[10], x[20])
+    assert {len(segment) for segment in lines.get_segments()} == {11}
+    P.close()
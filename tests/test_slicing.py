@@ -0,0 +1,47 @@
+import numpy as np
+import matplotlib.pyplot as plt
+import TransistorDataVisualizer as tdv
+from conftest import IT7, IB7
+
+
+def test_slicing_cache_keeps_one_domain_per_axis():
+    S = tdv.DataSet(tdv.DataFile('It7', IT7))
+    x, y = S.get_data(0)[0, :], S.get_data(1)[:, 0]
+    for b in x[1:]: # a slider dragging the upper x bound
+        assert S.get_slicing('x', [x[0], b]) == S.get_index_range('x', [x[0], b])
+    S.get_slicing('y', [y.min(), y.max()])
+    domain_keys = [key for key in S.m_slicing_cache if key[0] == 'domain']
+    assert sorted(domain_keys) == [('domain', 'x'), ('domain', 'y')]
+
+    misses = S.slicing_misses
+    assert S.get_slicing(0, [x[0], x[-1]]) == (0, len(x))
+    assert S.get_slicing('x', [x[0], x[-1]]) == (0, len(x))
+    assert S.slicing_misses == misses and S.slicing_hits >= 1
+
+
+def test_div_plot_uses_the_slicing_cache():
+    B = tdv.DataBank.from_files([tdv.DataFile('It7', IT7), tdv.DataFile('Ib7', IB7)], workers = 1, override = True)
+    DivSet = B.m_DataSets[0]
+    B.set_domain('x', [1, 4])
+    B.set_domain('y', [-1, 1])
+    fig = plt.figure()
+    ax = fig.add_subplot(projection = '3d')
+    B.quick_div_plot3d(DivSet, -1, ax = ax)
+    stats = B.slice_cache_stats()
+    for _ in range(3):
+        B.quick_div_plot3d(DivSet, -1, ax = ax)
+    assert B.slice_cache_stats()['hits'] == stats['hits'] + 3 * 2 * len(B.m_DataSets)
+    assert B.slice_cache_stats()['misses'] == stats['misses']
+
+    # the same points as dropping the zeros and then restricting to the domain
+    S = B.m_DataSets[1]
+    keep_rows, keep_cols = B.get_keep_masks(DivSet, -1, Target = S)
+    x, y, z, zdiv = B.apply_keep_masks([S.get_data(0), S.get_data(1), S.get_data(-1), DivSet.get_data(-1)],
+                                       keep_rows, keep_cols)
+    cols = np.flatnonzero((x[0, :] >= 1) & (x[0, :] <= 4))
+    rows = np.flatnonzero((y[:, 0] >= -1) & (y[:, 0] <= 1))
+    expected = (z / zdiv)[np.ix_(rows, cols)]
+    assert expected.size
+    drawn = ax.collections[-1]._segments3d # the rows of the last DataSet's wireframe
+    np.testing.assert_allclose(np.array([segment[:, 2] for segment in drawn[:len(rows)]]), expected)
+    plt.close(fig)
@@ -0,0 +1,52 @@
+import shutil
+import numpy as np
+import TransistorDataVisualizer as tdv
+import TransistorDataAggregation as agg
+from conftest import IT7
+
+
+def make_bank(tmp_path) -> tdv.DataBank:
+    B = tdv.DataBank()
+    for i in range(3):
+        path = str(tmp_path / f"It7_{i}.csv")
+        shutil.copy(IT7, path)
+        B.append(tdv.DataSet(tdv.DataFile('It7', path)))
+    return B
+
+
+def test_unchanged_stack_is_reused(tmp_path):
+    B = make_bank(tmp_path)
+    assert B.get_stack(-1) is B.get_stack(-1)
+
+
+def test_stack_follows_member_changes(tmp_path):
+    B = make_bank(tmp_path)
+    S = B.m_DataSets[1]
+    Id = S.get_data(2)
+    B.get_stack(2)
+    S.add_column('Id', 2 * Id) # replaces the measured column
+    np.testing.assert_array_equal(B.get_stack(2)[1], 2 * Id)
+
+    B.get_stack(2)
+    S.set_dtype_policy(tdv.DtypePolicy())
+    assert S.get_data(2).dtype == np.float32
+    np.testing.assert_array_equal(B.get_stack(2)[1], S.get_data(2)) # the rounded values, not the float64 ones
+
+    with open(S.file_path, 'rb') as f:
+        data = f.read()
+    with open(S.file_path, 'wb') as f: # the last Id point was remeasured
+        f.write(data[:data.rindex(b',')] + b', 1.0')
+    S.reload()
+    assert B.get_stack(2)[1, -1, -1] == 1.0
+    assert B.get_stack(2)[0, -1, -1] != 1.0
+
+
+def test_stack_follows_repeat_means(tmp_path):
+    Sets = make_bank(tmp_path).m_DataSets
+    for i, S in enumerate(Sets):
+        S.m_datadict['Id'] = S.get_data(2) * (i + 1)
+    group = agg.RepeatGroup(Sets[:2])
+    B = tdv.DataBank(group.get_dataset())
+    np.testing.assert_allclose(B.get_stack(2)[0], 1.5 * Sets[0].get_data(2))
+    group.add(Sets[2])
+    np.testing.assert_allclose(B.get_stack(2)[0], 2 * Sets[0].get_data(2))
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+import TransistorDataVisualizer as tdv
+from conftest import IT7, IB7, RT7
+
+
+@pytest.mark.parametrize('name, path', [('It7', IT7), ('Ib7', IB7), ('Rt7', RT7)])
+def test_stream_finished_export(name, path):
+    # the bundled csvs are shipped as easyEXPERT writes them, without a newline after the last row
+    with open(path, 'rb') as f:
+        assert not f.read().endswith(b'\n')
+    streamed = tdv.File(tdv.DataFile(name, path), streaming = True)
+    parsed = tdv.File(tdv.DataFile(name, path))
+    assert streamed.m_complete
+    assert streamed.m_stream_rows == parsed.m_dim1_count * parsed.m_dim2_count
+    assert streamed.m_incomplete_sweeps == []
+    for i in range(len(parsed.get_headers())):
+        np.testing.assert_array_equal(streamed.get_data(i), parsed.get_data(i))
+
+
+def test_stream_holds_back_partial_row(tmp_path):
+    with open(IT7, 'rb') as f:
+        data = f.read()
+    last = data.rindex(b'DataValue')
+    path = str(tmp_path / 'It7.csv')
+    with open(path, 'wb') as f:
+        f.write(data[:last] + b'DataValue, 5') # the Id column of the last row isn't written yet
+    F = tdv.File(tdv.DataFile('It7', path), streaming = True)
+    assert not F.m_complete
+    assert np.isnan(F.get_data(-1)[-1, -1])
+
+    with open(path, 'wb') as f:
+        f.write(data)
+    assert F.refresh() == 1
+    assert F.m_complete
+    np.testing.assert_array_equal(F.get_data(-1), tdv.File(tdv.DataFile('It7', path)).get_data(-1))
+
+
+def test_stream_rereads_row_cut_in_a_number(tmp_path):
+    with open(IT7, 'rb') as f:
+        data = f.read()
+    second_last = data.rindex(b'DataValue', 0, data.rindex(b'DataValue'))
+    end = data.index(b'\n', second_last)
+    path = str(tmp_path / 'It7.csv')
+    with open(path, 'wb') as f:
+        f.write(data[:end-4]) # every column is there, but the last number is only half written
+    F = tdv.File(tdv.DataFile('It7', path), streaming = True)
+    rows = F.m_stream_rows
+    assert F.refresh() == 0 # nothing new, the row is read again without changing the data
+
+    with open(path, 'wb') as f:
+        f.write(data)
+    assert F.refresh() == 1
+    assert F.m_complete
+    np.testing.assert_array_equal(F.get_data(-1), tdv.File(tdv.DataFile('It7', path)).get_data(-1))
+    assert F.m_stream_rows == rows + 1
@@ -0,0 +1,38 @@
+import shutil
+import pytest
+import TransistorDataVisualizer as tdv
+import TransistorDataTable as tdt
+from conftest import IT7, mixed_bank, check_round_trip
+
+EXTENSIONS = ['.parquet', '.arrow', '.h5']
+
+
+def needs(extension: str):
+    pytest.importorskip('h5py' if extension == '.h5' else 'pyarrow')
+
+
+@pytest.mark.parametrize('extension', EXTENSIONS)
+def test_mixed_bank_round_trip(tmp_path, extension):
+    needs(extension)
+    B = mixed_bank()
+    assert len({tuple(S.get_headers()) for S in B.m_DataSets}) > 1 # the columns differ between the DataSets
+    path = str(tmp_path / f"mixed{extension}")
+    tdt.export_table([B, mixed_bank()], path, chunk_rows = 1000)
+    Banks = tdt.import_banks(path, override = True)
+    assert len(Banks) == 2
+    for Copy in Banks:
+        check_round_trip(B.m_DataSets, Copy.m_DataSets)
+    check_round_trip([B.m_DataSets[1], B.m_DataSets[3]], tdt.import_datasets(path, [1, 3]))
+
+
+@pytest.mark.parametrize('extension', EXTENSIONS)
+def test_datafiles_round_trip(tmp_path, extension):
+    needs(extension)
+    DFs = []
+    for i in range(3):
+        path = str(tmp_path / f"It7_{i}.csv")
+        shutil.copy(IT7, path)
+        DFs.append(tdv.DataFile('It7', path, i))
+    path = str(tmp_path / f"bank{extension}")
+    assert tdt.export_table(DFs, path) == 3 * 1111
+    check_round_trip([tdv.DataSet(DF) for DF in DFs], tdt.import_datasets(path))
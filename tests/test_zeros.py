@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+import TransistorDataVisualizer as tdv
+from conftest import IT7
+
+
+def old_drop_zeros(arrays, tolerance = -1):
+    """drop_zeros() before the keep masks, as the reference"""
+    drop_arr = arrays[0].copy()
+    if tolerance == -1:
+        tolerance = np.min(np.absolute(drop_arr)) + np.var(drop_arr)
+    drop_arr[np.absolute(drop_arr) <= tolerance] = 0
+    zero_rows = [i for i in range(drop_arr.shape[0]) if not drop_arr[i,:].any()]
+    zero_cols = [i for i in range(drop_arr.shape[1]) if not drop_arr[:,i].any()]
+    for i in range(len(arrays)):
+        arrays[i] = np.delete(arrays[i], zero_rows, axis=0)
+        arrays[i] = np.delete(arrays[i], zero_cols, axis=1)
+    return arrays
+
+
+def zero_edged_set() -> tdv.DataSet:
+    """It7 with its first row and last two columns zeroed, and a zero inside that must not be dropped"""
+    S = tdv.DataSet(tdv.DataFile('It7', IT7))
+    z = S.get_data(-1).copy()
+    z[0, :], z[:, -2:], z[5, 3] = 0, 0, 0
+    S.add_column('Idz', z)
+    return S
+
+
+@pytest.mark.parametrize('tolerance', [-1, 0, 1e-4])
+def test_keep_masks_match_drop_zeros(tolerance):
+    DivSet = zero_edged_set()
+    B = tdv.DataBank()
+    for S in [DivSet, tdv.DataSet(tdv.DataFile('It7', IT7))]:
+        B.append(S)
+        arrays = [DivSet.get_data(-1), S.get_data(0), S.get_data(1), S.get_data(-1)]
+        keep_rows, keep_cols = B.get_keep_masks(DivSet, -1, tolerance, Target = S)
+        for new, old in zip(B.apply_keep_masks(arrays, keep_rows, keep_cols), old_drop_zeros(list(arrays), tolerance)):
+            np.testing.assert_array_equal(new, old)
+        for new, old in zip(B.drop_zeros(list(arrays), tolerance), old_drop_zeros(list(arrays), tolerance)):
+            np.testing.assert_array_equal(new, old)
+    assert not keep_rows[0] and not keep_cols[-1] and keep_rows[5] and keep_cols[3]
+
+
+def test_masked_drop_zeros_keeps_the_shape():
+    S = zero_edged_set()
+    B = tdv.DataBank(S)
+    arrays = [S.get_data(-1), S.get_data(0)]
+    masked = B.drop_zeros(list(arrays), masked = True)
+    dropped = old_drop_zeros(list(arrays))
+    for m, a, d in zip(masked, arrays, dropped):
+        assert isinstance(m, np.ma.MaskedArray) and m.shape == a.shape
+        assert np.shares_memory(m.data, a) # no copy of the data
+        np.testing.assert_array_equal(m.compressed(), d.ravel())
+
+
+def test_keep_masks_are_dropped_when_the_divisor_changes():
+    DivSet = zero_edged_set()
+    B = tdv.DataBank(DivSet)
+    keep_rows, keep_cols = B.get_keep_masks(DivSet, -1)
+    assert any(key[0] == 'keep' for key in DivSet.m_slicing_cache)
+
+    z = DivSet.get_data(-1).copy()
+    z[1, :] = 0
+    DivSet.add_column('Idz', z) # the same header, new data
+    assert not any(key[0] in ['keep', 'tolerance'] for key in DivSet.m_slicing_cache)
+    keep_rows, keep_cols = B.get_keep_masks(DivSet, -1)
+    assert not keep_rows[0] and not keep_rows[1]